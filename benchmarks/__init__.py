@@ -0,0 +1 @@
+"""Package contains a set of benchmarks for `pypan` project scaffolding."""
@@ -0,0 +1,323 @@
+"""Benchmarks project scaffolding stages against a stored baseline.
+
+Every case runs in a fresh interpreter, so peak memory of one case does not
+leak into another. File and syscall counts are collected with audit hooks.
+
+    python -m benchmarks.scaffold --tmpfs
+    python -m benchmarks.scaffold --save-baseline
+    python -m benchmarks.scaffold --threshold seconds=0.5
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, IO, List, Optional, Sequence
+from pypans.file import Template
+from pypans.project import Project, User
+
+Metrics = Dict[str, float]
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE: str = os.path.join(ROOT, "benchmarks", "baseline.json")
+TEMPLATES: str = os.path.join(ROOT, "pypans", "template")
+TMPFS: str = "/dev/shm"
+COUNTS: Sequence[int] = (1, 10, 100)
+THRESHOLDS: Dict[str, float] = {
+    "seconds": 0.25,
+    "files": 0.0,
+    "syscalls": 0.0,
+    "rss_kib": 0.2,
+}
+TOLERANCES: Dict[str, float] = {"seconds": 0.002, "rss_kib": 1024}
+_USER: User = User("John Udot", "john.udot@gmail.com")
+
+
+def _projects(directory: str, count: int) -> List[Project]:
+    """Returns projects to scaffold into a directory."""
+    return [
+        Project(f"bomber{index}", _USER, os.path.join(directory, f"{index}"))
+        for index in range(count)
+    ]
+
+
+def _build_package(directory: str, count: int) -> None:
+    """Stages application packages."""
+    for project in _projects(directory, count):
+        project.build_package()
+
+
+def _build_tests(directory: str, count: int) -> None:
+    """Stages tests packages."""
+    for project in _projects(directory, count):
+        project.build_tests()
+
+
+def _build_meta(directory: str, count: int) -> None:
+    """Stages meta files."""
+    for project in _projects(directory, count):
+        project.build_meta()
+
+
+def _end_to_end(directory: str, count: int) -> None:
+    """Stages and writes complete projects."""
+    for project in _projects(directory, count):
+        project.build_package()
+        project.build_tests()
+        project.build_meta()
+        project.commit()
+
+
+def _files_from(directory: str, count: int) -> None:
+    """Copies raw template files without rendering."""
+    for index in range(count):
+        target: str = os.path.join(directory, f"{index}")
+        os.makedirs(target)
+        Template.files_from(TEMPLATES, target)
+
+
+STAGES: Dict[str, Callable[[str, int], None]] = {
+    "build_package": _build_package,
+    "build_tests": _build_tests,
+    "build_meta": _build_meta,
+    "end_to_end": _end_to_end,
+    "files_from": _files_from,
+}
+
+
+class _Counter:
+    """Represents audit hook counting opened files and filesystem calls."""
+
+    def __init__(self) -> None:
+        self.files: int = 0
+        self.syscalls: int = 0
+
+    def __call__(self, event: str, arguments: Any) -> None:  # noqa: U100
+        """Counts an audit event."""
+        if event == "open":
+            self.files += 1
+            self.syscalls += 1
+        elif event.startswith(("os.", "shutil.")):
+            self.syscalls += 1
+
+
+def measure(stage: str, count: int, directory: str) -> Metrics:
+    """Runs a stage once in current process and returns its metrics.
+
+    Audit hooks can not be removed, so it is meant to run in a child process.
+
+    Args:
+        stage (str): stage name
+        count (int): number of projects
+        directory (str): directory to scaffold projects into
+    """
+    counter: _Counter = _Counter()
+    if hasattr(sys, "addaudithook"):
+        sys.addaudithook(counter)
+    start: float = time.perf_counter()
+    STAGES[stage](directory, count)
+    seconds: float = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "files": counter.files,
+        "syscalls": counter.syscalls,
+        "rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run(
+    stages: Sequence[str],
+    counts: Sequence[int],
+    directory: Optional[str] = None,
+    repeat: int = 1,
+) -> Dict[str, Metrics]:
+    """Runs every stage for every number of projects in child processes.
+
+    Best metrics out of all repeats are kept.
+
+    Args:
+        stages (Sequence[str]): stage names
+        counts (Sequence[int]): numbers of projects
+        directory (str): directory for temporary projects
+        repeat (int): number of runs of each case
+    """
+    results: Dict[str, Metrics] = {}
+    for stage in stages:
+        for count in counts:
+            runs: List[Metrics] = []
+            for _ in range(repeat):
+                workspace: str = tempfile.mkdtemp(
+                    prefix="pypan-bench-", dir=directory
+                )
+                try:
+                    runs.append(
+                        json.loads(
+                            subprocess.run(
+                                (
+                                    sys.executable,
+                                    "-m",
+                                    "benchmarks.scaffold",
+                                    "--case",
+                                    stage,
+                                    "--count",
+                                    str(count),
+                                    "--directory",
+                                    workspace,
+                                ),
+                                cwd=ROOT,
+                                check=True,
+                                stdout=subprocess.PIPE,
+                                universal_newlines=True,
+                            ).stdout
+                        )
+                    )
+                finally:
+                    shutil.rmtree(workspace, ignore_errors=True)
+            results[f"{stage}/{count}"] = {
+                metric: min(metrics[metric] for metrics in runs)
+                for metric in runs[0]
+            }
+    return results
+
+
+def compare(
+    results: Dict[str, Metrics],
+    baseline: Dict[str, Metrics],
+    thresholds: Dict[str, float],
+) -> List[str]:
+    """Returns regressions of results over a baseline.
+
+    Differences within absolute tolerances are ignored as noise.
+
+    Args:
+        results (Dict[str, Metrics]): current metrics by case
+        baseline (Dict[str, Metrics]): baseline metrics by case
+        thresholds (Dict[str, float]): allowed relative growth by metric
+    """
+    regressions: List[str] = []
+    for case, metrics in results.items():
+        for metric, limit in thresholds.items():
+            base: Optional[float] = baseline.get(case, {}).get(metric)
+            if base is not None and metrics[metric] > max(
+                base * (1 + limit), base + TOLERANCES.get(metric, 0)
+            ):
+                regressions.append(
+                    f"{case} {metric}: {metrics[metric]:g} > {base:g} "
+                    f"(+{limit:.0%} allowed)"
+                )
+    return regressions
+
+
+def _threshold(value: str) -> Dict[str, float]:
+    """Parses `metric=ratio` threshold."""
+    metric, _, ratio = value.partition("=")
+    if metric not in THRESHOLDS:
+        raise argparse.ArgumentTypeError(
+            f"Unknown '{metric}' metric, please use {list(THRESHOLDS)}"
+        )
+    return {metric: float(ratio)}
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Returns benchmarks command line parser."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog="python -m benchmarks.scaffold", description=__doc__
+    )
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--projects", nargs="+", type=int, default=COUNTS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--directory", help="temporary projects location")
+    parser.add_argument(
+        "--tmpfs", action="store_true", help=f"scaffold into {TMPFS}"
+    )
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--threshold",
+        type=_threshold,
+        action="append",
+        default=[],
+        help="allowed relative growth, e.g `seconds=0.25`",
+    )
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--count", type=int, help=argparse.SUPPRESS)
+    return parser
+
+
+def _save(options: argparse.Namespace, results: Dict[str, Metrics]) -> None:
+    """Writes results to an output file and shows them.
+
+    Args:
+        options (argparse.Namespace): parsed command line arguments
+        results (Dict[str, Metrics]): metrics by case
+    """
+    with open(options.output, "w") as output:  # type: IO[str]
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "tmpfs": options.tmpfs,
+                "results": results,
+            },
+            output,
+            indent=2,
+            sort_keys=True,
+        )
+    for case, metrics in results.items():
+        sys.stdout.write(
+            f"{case:<20}{metrics['seconds']:>10.4f}s{metrics['files']:>8.0f} "
+            f"files{metrics['syscalls']:>8.0f} calls"
+            f"{metrics['rss_kib']:>10.0f} KiB\n"
+        )
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> int:
+    """Runs benchmarks and returns exit code.
+
+    Args:
+        arguments (Sequence[str]): command line arguments
+    """
+    options: argparse.Namespace = _parser().parse_args(arguments)
+    if options.case:
+        metrics: Metrics = measure(
+            options.case, options.count, options.directory
+        )
+        sys.stdout.write(f"{json.dumps(metrics)}\n")
+        return 0
+    results: Dict[str, Metrics] = run(
+        options.stages,
+        options.projects,
+        TMPFS if options.tmpfs else options.directory,
+        options.repeat,
+    )
+    _save(options, results)
+    if options.save_baseline:
+        with open(options.baseline, "w") as baseline:  # type: IO[str]
+            json.dump(results, baseline, indent=2, sort_keys=True)
+        sys.stdout.write(f"Baseline is saved to {options.baseline}\n")
+        return 0
+    if not os.path.isfile(options.baseline):
+        sys.stdout.write(
+            f"No baseline at {options.baseline}, nothing to compare\n"
+        )
+        return 0
+    with open(options.baseline) as baseline:
+        thresholds: Dict[str, float] = dict(THRESHOLDS)
+        for threshold in options.threshold:  # type: Dict[str, float]
+            thresholds.update(threshold)
+        regressions: List[str] = compare(
+            results, json.load(baseline), thresholds
+        )
+    for regression in regressions:
+        sys.stdout.write(f"Regression {regression}\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Contains interfaces for streaming projects into archives.
+
+Archives are deterministic: entries are sorted, and timestamps, owners and
+`gzip` header fields are fixed, so identical projects produce byte
+identical archives. Entries are written one by one into a stream that does
+not need to be seekable, e.g `stdout`.
+"""
+import gzip
+import io
+import os
+import tarfile
+import zipfile
+from enum import Enum
+from typing import Any, IO, Iterator, Optional, Set, Tuple, cast
+from pypans.stage import Staged, StagedTree
+from pypans.stream import StreamedFile
+
+_EPOCH: int = 315532800
+_DATE: Tuple[int, int, int, int, int, int] = (1980, 1, 1, 0, 0, 0)
+_UNIX: int = 3
+
+
+class ArchiveFormat(Enum):
+    """Represents archive format."""
+
+    TAR_GZ: str = "tar.gz"
+    TAR: str = "tar"
+    ZIP: str = "zip"
+
+    @classmethod
+    def from_path(cls, path: str) -> "ArchiveFormat":
+        """Returns format by archive extension, `tar.gz` by default.
+
+        Args:
+            path (str): archive path
+        """
+        for archive_format in cls:  # type: ArchiveFormat
+            if path.endswith(f".{archive_format.value}"):
+                return archive_format
+        return cls.TAR_GZ
+
+    def __str__(self) -> Any:
+        """Returns value of a format."""
+        return self.value
+
+
+class _Chunks(io.RawIOBase):
+    """Represents readable stream of content chunks."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        super().__init__()
+        self._chunks: Iterator[bytes] = chunks
+        self._buffer: bytes = b""
+
+    def readable(self) -> bool:
+        """Checks if a stream is readable."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Reads next bytes into a buffer and returns their number."""
+        if not self._buffer:
+            self._buffer = next(self._chunks, b"")
+        size: int = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def _chunks(content: Staged) -> Iterator[bytes]:
+    """Yields content chunks, streamed files are substituted on the fly."""
+    if isinstance(content, StreamedFile):
+        yield from content.chunks()
+    else:
+        yield bytes(content)
+
+
+class ArchiveWriter:
+    """Represents deterministic archive writer.
+
+    Only one file is kept in memory at a time, streamed files are read
+    in chunks twice, to find their size first.
+    """
+
+    def __init__(
+        self, stream: IO[bytes], archive_format: ArchiveFormat
+    ) -> None:
+        self._directories: Set[str] = set()
+        self._gzip: Optional[gzip.GzipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        self._zip: Optional[zipfile.ZipFile] = None
+        if archive_format is ArchiveFormat.ZIP:
+            self._zip = zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED)
+            return
+        if archive_format is ArchiveFormat.TAR_GZ:
+            self._gzip = gzip.GzipFile(
+                filename="", mode="wb", fileobj=stream, mtime=0
+            )
+        self._tar = tarfile.open(
+            fileobj=cast(IO[bytes], self._gzip) if self._gzip else stream,
+            mode="w|",
+            format=tarfile.PAX_FORMAT,
+        )
+
+    def add(self, path: str, content: Staged, mode: int = 0o644) -> None:
+        """Adds a file and its missing parent directories.
+
+        Args:
+            path (str): archive member path
+            content (Staged): file content or a streamed file
+            mode (int): file permissions
+        """
+        name: str = path.replace(os.sep, "/")
+        parents: str = ""
+        for part in name.split("/")[:-1]:  # type: str
+            parents = f"{parents}{part}/"
+            if parents not in self._directories:
+                self._directories.add(parents)
+                self._add_directory(parents)
+        size: int = (
+            sum(map(len, content.chunks()))
+            if isinstance(content, StreamedFile)
+            else len(content)
+        )
+        if self._zip:
+            info: zipfile.ZipInfo = zipfile.ZipInfo(name, _DATE)
+            info.create_system = _UNIX
+            info.external_attr = (0o100000 | mode) << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.file_size = size
+            with self._zip.open(info, "w") as member:  # type: IO[bytes]
+                for chunk in _chunks(content):
+                    member.write(chunk)
+        elif self._tar:
+            self._tar.addfile(
+                self._tar_info(name, tarfile.REGTYPE, mode, size),
+                cast(IO[bytes], io.BufferedReader(_Chunks(_chunks(content)))),
+            )
+
+    def add_tree(self, tree: StagedTree, prefix: str = "") -> None:
+        """Adds all staged files in sorted order.
+
+        Args:
+            tree (StagedTree): project tree
+            prefix (str): directory to put files into
+        """
+        for path in tree:  # type: str
+            self.add(
+                os.path.join(prefix, path), tree.read(path), tree.mode(path)
+            )
+
+    def close(self) -> None:
+        """Finishes an archive, an underlying stream is left open."""
+        if self._zip:
+            self._zip.close()
+        if self._tar:
+            self._tar.close()
+        if self._gzip:
+            self._gzip.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        """Returns an archive writer."""
+        return self
+
+    def __exit__(self, *_: Any) -> None:  # noqa: U101
+        """Finishes an archive."""
+        self.close()
+
+    def _add_directory(self, name: str) -> None:
+        """Adds a directory entry."""
+        if self._zip:
+            info: zipfile.ZipInfo = zipfile.ZipInfo(name, _DATE)
+            info.create_system = _UNIX
+            info.external_attr = (0o40755 << 16) | 0x10
+            self._zip.writestr(info, b"")
+        elif self._tar:
+            self._tar.addfile(
+                self._tar_info(name.rstrip("/"), tarfile.DIRTYPE, 0o755, 0)
+            )
+
+    @staticmethod
+    def _tar_info(
+        name: str, kind: bytes, mode: int, size: int
+    ) -> tarfile.TarInfo:
+        """Returns `tar` header with fixed time and owners."""
+        info: tarfile.TarInfo = tarfile.TarInfo(name)
+        info.type = kind
+        info.mode = mode
+        info.size = size
+        info.mtime = _EPOCH
+        info.uid = info.gid = 0
+        info.uname = info.gname = ""
+        return info
@@ -0,0 +1,117 @@
+"""Contains interfaces for sharing static files between projects."""
+import errno
+import fcntl
+import hashlib
+import os
+import shutil
+import tempfile
+from enum import Enum
+from typing import Any, Optional
+from pypans.cache import cache_dir
+from pypans.stream import write_all
+
+_FICLONE: int = 0x40049409
+_WRITABLE: int = 0o222
+
+
+class Materialization(Enum):
+    """Represents a way asset is placed into a project."""
+
+    REFLINK: str = "reflink"
+    HARDLINK: str = "hardlink"
+    COPY: str = "copy"
+
+    def __str__(self) -> Any:
+        """Returns value of a materialization."""
+        return self.value
+
+
+class AssetStore:
+    """Represents local content-addressed store of static files.
+
+    Assets are keyed by `sha256` of their content and file mode, so
+    projects can share a single copy of every static template. Stored
+    files are read-only, as hardlinked project files share them.
+    """
+
+    def __init__(self, root: Optional[str] = None) -> None:
+        self._root: str = root or cache_dir("assets")
+
+    def path(self, digest: str, mode: int = 0o644) -> str:
+        """Returns location of an asset in a store.
+
+        Args:
+            digest (str): `sha256` of asset content
+            mode (int): file permissions
+        """
+        return os.path.join(self._root, digest[:2], f"{digest[2:]}-{mode:o}")
+
+    def put(self, content: Any, digest: str = "", mode: int = 0o644) -> str:
+        """Stores content unless it is already present and returns its hash.
+
+        Args:
+            content (bytes-like): asset content
+            digest (str): known `sha256` of a content
+            mode (int): file permissions
+        """
+        digest = digest or hashlib.sha256(content).hexdigest()
+        path: str = self.path(digest, mode)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+            try:
+                write_all(descriptor, content)
+                os.fchmod(descriptor, mode & ~_WRITABLE)
+            finally:
+                os.close(descriptor)
+            os.replace(temporary, path)
+        return digest
+
+    def materialize(
+        self, digest: str, target: str, mode: int = 0o644
+    ) -> Materialization:
+        """Places stored asset into target path.
+
+        Reflink is tried first, then hardlink, and content is copied when
+        neither is supported, e.g. across devices. Reflinks and copies are
+        independent files and get a requested mode, while hardlinks stay
+        read-only, so editing them in place can not corrupt a store.
+
+        Args:
+            digest (str): `sha256` of asset content
+            target (str): destination path
+            mode (int): file permissions
+        """
+        source: str = self.path(digest, mode)
+        if _reflink(source, target):
+            os.chmod(target, mode)
+            return Materialization.REFLINK
+        try:
+            os.link(source, target)
+        except OSError as error:
+            if error.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+        else:
+            return Materialization.HARDLINK
+        shutil.copyfile(source, target)
+        os.chmod(target, mode)
+        return Materialization.COPY
+
+
+def _reflink(source: str, target: str) -> bool:
+    """Clones a file with copy-on-write semantics if filesystem supports it.
+
+    Args:
+        source (str): path to source file
+        target (str): path to cloned file
+    """
+    with open(source, "rb") as origin, open(target, "wb") as clone:
+        try:
+            fcntl.ioctl(clone.fileno(), _FICLONE, origin.fileno())
+        except OSError:
+            cloned: bool = False
+        else:
+            cloned = True
+    if not cloned:
+        os.unlink(target)
+    return cloned
@@ -0,0 +1,244 @@
+"""Contains interfaces for scaffolding many projects at once."""
+import functools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    IO,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from pypans import trace
+from pypans.archive import ArchiveFormat, ArchiveWriter
+from pypans.monorepo import Monorepo
+from pypans.project import Project, User
+from pypans.stages import (
+    ProjectSetup,
+    ScaffoldOptions,
+    StageResult,
+    scaffold,
+)
+
+
+@dataclass(frozen=True)
+class ProjectSpec:
+    """Represents a specification of a single project to scaffold."""
+
+    name: str
+    user: str
+    email: str
+    root: str
+    venv: bool = False
+    git: str = ""
+    install: bool = False
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any], root: str = ".") -> "ProjectSpec":
+        """Creates project specification out of manifest entry.
+
+        Args:
+            spec (dict): manifest entry
+            root (str): directory where projects are created by default
+        """
+        return cls(
+            name=spec["name"],
+            user=spec["user"],
+            email=spec["email"],
+            root=spec.get("root", os.path.join(root, spec["name"])),
+            venv=bool(spec.get("venv", False)),
+            git=spec.get("git", ""),
+            install=bool(spec.get("install", False)),
+        )
+
+
+@dataclass(frozen=True)
+class BuildResult:
+    """Represents an outcome of a single project scaffold."""
+
+    name: str
+    root: str
+    seconds: float
+    error: str = ""
+    events: Tuple[Dict[str, Any], ...] = ()
+
+    @property
+    def passed(self) -> bool:
+        """Checks if a project is built successfully."""
+        return not self.error
+
+
+def read_manifest(path: str) -> Tuple[ProjectSpec, ...]:
+    """Reads project specifications from `json` or `yaml` manifest.
+
+    Manifest is either a list of projects or a mapping with `projects`
+    list and an optional `root` directory to create projects in.
+
+    Args:
+        path (str): path to a manifest file
+    """
+    with open(path) as file:  # type: IO[str]
+        if path.endswith((".yml", ".yaml")):
+            try:
+                import yaml  # pylint:disable=import-outside-toplevel
+            except ImportError as error:
+                raise ValueError(
+                    "'pyyaml' is required to read yaml manifests!"
+                ) from error
+            content: Any = yaml.safe_load(file)
+        else:
+            content = json.load(file)
+    if isinstance(content, list):
+        content = {"projects": content}
+    root: str = content.get("root", ".")
+    return tuple(
+        ProjectSpec.from_dict(spec, root) for spec in content["projects"]
+    )
+
+
+def _project(
+    spec: ProjectSpec,
+    options: ScaffoldOptions,
+    monorepo: Optional[Monorepo] = None,
+) -> Project:
+    """Returns a project of a specification."""
+    return Project(
+        spec.name,
+        User(spec.user, spec.email),
+        spec.root,
+        options.project_options(monorepo),
+    )
+
+
+def _scaffold(spec: ProjectSpec, options: ScaffoldOptions) -> str:
+    """Scaffolds a project and returns errors of its failed stages."""
+    results: Dict[str, StageResult] = scaffold(
+        _project(spec, options, options.workspace()),
+        root=spec.root,
+        user=User(spec.user, spec.email),
+        setup=ProjectSetup(
+            spec.venv, spec.git, spec.install, git=bool(spec.git)
+        ),
+        options=options,
+    ).run()
+    return "; ".join(
+        f"{result.name}: {result.output.strip()}"
+        for result in results.values()
+        if not result.passed
+    )
+
+
+def build(
+    spec: ProjectSpec, options: ScaffoldOptions = ScaffoldOptions()
+) -> BuildResult:
+    """Builds a project from its specification without any prompts.
+
+    Packages of a monorepo are put under its root by their names. A project
+    that can not be built is reported as failed instead of raising, so other
+    projects of a batch are still built.
+
+    Args:
+        spec (ProjectSpec): project specification
+        options (ScaffoldOptions): optional scaffold features
+    """
+    start: float = time.perf_counter()
+    try:
+        monorepo: Optional[Monorepo] = options.workspace()
+        if monorepo:
+            spec = replace(spec, root=monorepo.member(spec.name))
+        error: str = _scaffold(spec, options)
+    except Exception as exception:  # pylint:disable=broad-except
+        error = repr(exception)
+    return BuildResult(spec.name, spec.root, time.perf_counter() - start, error)
+
+
+def _traced_build(
+    spec: ProjectSpec, options: ScaffoldOptions, origin: float
+) -> BuildResult:
+    """Builds a project in a worker returning its trace events."""
+    tracer: trace.Tracer = trace.enable(origin)
+    try:
+        result: BuildResult = build(spec, options)
+    finally:
+        trace.disable()
+    return replace(result, events=tuple(tracer.events()))
+
+
+def build_all(
+    specs: Sequence[ProjectSpec],
+    workers: Optional[int] = None,
+    options: ScaffoldOptions = ScaffoldOptions(),
+) -> Iterator[BuildResult]:
+    """Builds projects concurrently yielding results as they complete.
+
+    If tracing is on, workers trace their builds and events are merged
+    into a tracer of current process.
+
+    Args:
+        specs (Sequence[ProjectSpec]): project specifications
+        workers (int): number of worker processes, CPU count by default
+        options (ScaffoldOptions): optional scaffold features
+    """
+    tracer: Optional[trace.Tracer] = trace.current()
+    task: Callable[[ProjectSpec, ScaffoldOptions], BuildResult] = build
+    if tracer:
+        task = functools.partial(_traced_build, origin=tracer.origin)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for future in as_completed(
+            [pool.submit(task, spec, options) for spec in specs]
+        ):
+            result: BuildResult = future.result()
+            if tracer:
+                tracer.extend(result.events)
+            yield result
+
+
+def archive_all(
+    specs: Sequence[ProjectSpec],
+    stream: IO[bytes],
+    archive_format: ArchiveFormat,
+    options: ScaffoldOptions = ScaffoldOptions(),
+) -> None:
+    """Streams projects into a single archive without writing them to disk.
+
+    Every project is put under its name directory. Venv, `git` and
+    requirements installation stages need a project on disk, so they are
+    skipped. Projects are archived standalone, as a monorepo root is on disk.
+
+    Args:
+        specs (Sequence[ProjectSpec]): project specifications
+        stream (IO[bytes]): binary stream to write an archive into
+        archive_format (ArchiveFormat): archive format
+        options (ScaffoldOptions): optional scaffold features
+    """
+    with ArchiveWriter(stream, archive_format) as writer:
+        for spec in sorted(specs, key=lambda spec: spec.name):
+            project: Project = _project(spec, options)
+            project.build()
+            project.archive(writer, spec.name)
+
+
+def summary(results: Sequence[BuildResult], seconds: float) -> List[str]:
+    """Returns human readable lines of a batch outcome.
+
+    Args:
+        results (Sequence[BuildResult]): project results
+        seconds (float): total wall-clock time
+    """
+    lines: List[str] = [
+        f"{'ok' if result.passed else 'failed'} {result.name} "
+        f"({result.seconds:.3f}s) {result.error or result.root}"
+        for result in sorted(results, key=lambda result: result.name)
+    ]
+    lines.append(
+        f"{sum(result.passed for result in results)}/{len(results)} projects "
+        f"built in {seconds:.3f}s"
+    )
+    return lines
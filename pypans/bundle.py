@@ -0,0 +1,182 @@
+"""Contains interfaces for packing templates into a single indexed bundle.
+
+Bundle layout is a magic header, a length-prefixed `json` table of contents
+and concatenated file contents. Offsets in a table of contents are relative
+to the first byte after it.
+"""
+import hashlib
+import json
+import mmap
+import os
+import pkgutil
+import struct
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    IO,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+from pypans.file import Template
+from pypans.placeholder import has_placeholders
+
+BUNDLE: str = "templates.bundle"
+_MAGIC: bytes = b"PYPANB01"
+_HEADER: struct.Struct = struct.Struct(f">{len(_MAGIC)}sI")
+
+
+@dataclass(frozen=True)
+class Entry:
+    """Represents table of contents record of a bundled file."""
+
+    name: str
+    offset: int
+    size: int
+    sha256: str
+    placeholders: bool
+    mode: int
+
+
+def pack(directory: str, templates: Iterable[Template] = Template) -> bytes:
+    """Returns bundle made of template files from a directory.
+
+    Args:
+        directory (str): directory with template files
+        templates (Iterable[Template]): templates to pack
+    """
+    files: Dict[str, Tuple[bytes, int]] = {}
+    for template in templates:  # type: Template
+        path: str = os.path.join(directory, template.value)
+        with open(path, "rb") as file:  # type: IO[bytes]
+            files[template.value] = (
+                file.read(),
+                0o755 if os.access(path, os.X_OK) else 0o644,
+            )
+    return pack_files(files, templates)
+
+
+def pack_files(
+    files: Mapping[str, Tuple[bytes, int]],
+    templates: Iterable[Template] = Template,
+) -> bytes:
+    """Returns bundle made of template contents and modes by file names.
+
+    Args:
+        files (Mapping[str, Tuple[bytes, int]]): contents and modes
+        templates (Iterable[Template]): templates to pack
+    """
+    entries: List[Entry] = []
+    blobs: List[bytes] = []
+    offset: int = 0
+    for template in templates:  # type: Template
+        content, mode = files[template.value]
+        try:
+            dynamic: bool = has_placeholders(content.decode("utf-8"), template)
+        except UnicodeDecodeError:
+            dynamic = False
+        entries.append(
+            Entry(
+                name=template.value,
+                offset=offset,
+                size=len(content),
+                sha256=hashlib.sha256(content).hexdigest(),
+                placeholders=dynamic,
+                mode=0o755 if mode & 0o111 else 0o644,
+            )
+        )
+        blobs.append(content)
+        offset += len(content)
+    toc: bytes = json.dumps(
+        [asdict(entry) for entry in entries],
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return b"".join([_HEADER.pack(_MAGIC, len(toc)), toc, *blobs])
+
+
+class Bundle:
+    """Represents memory-mapped template bundle."""
+
+    def __init__(self, buffer: Any) -> None:
+        magic, size = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError("Given file is not a `pypan` template bundle!")
+        header: int = _HEADER.size
+        start: int = header + size
+        self._view: memoryview = memoryview(buffer)
+        table: memoryview = self._view[header:start]
+        self._entries: Dict[str, Entry] = {
+            record["name"]: Entry(**record)
+            for record in json.loads(bytes(table))
+        }
+        self._start: int = start
+
+    @classmethod
+    def from_file(cls, path: str) -> "Bundle":
+        """Memory-maps bundle from a file.
+
+        Args:
+            path (str): path to a bundle file
+        """
+        with open(path, "rb") as file:  # type: IO[bytes]
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def load(cls) -> "Bundle":
+        """Memory-maps bundle shipped within `pypans` package once.
+
+        A bundle is read into memory if a package is not installed as
+        plain files, e.g. from a zip archive.
+        """
+        path: str = os.path.join(os.path.dirname(__file__), BUNDLE)
+        if os.path.isfile(path):
+            return cls.from_file(path)
+        content: Optional[bytes] = pkgutil.get_data(__package__, BUNDLE)
+        if content is None:
+            raise ValueError(f"'{BUNDLE}' is not shipped within a package!")
+        return cls(content)
+
+    def __iter__(self) -> Iterator[Entry]:
+        """Returns bundled entries."""
+        return iter(self._entries.values())
+
+    def __contains__(self, name: object) -> bool:
+        """Checks if a file is bundled."""
+        return name in self._entries
+
+    def entry(self, name: str) -> Entry:
+        """Returns table of contents record of a bundled file.
+
+        Args:
+            name (str): file name
+        """
+        return self._entries[name]
+
+    def read(self, name: str) -> memoryview:
+        """Returns zero-copy slice of bundled file content.
+
+        Args:
+            name (str): file name
+        """
+        entry: Entry = self._entries[name]
+        start: int = self._start + entry.offset
+        end: int = start + entry.size
+        return self._view[start:end]
+
+    def static(self) -> Tuple[Entry, ...]:
+        """Returns entries that do not need any substitution."""
+        return tuple(entry for entry in self if not entry.placeholders)
+
+
+if __name__ == "__main__":
+    with open(
+        os.path.join(os.path.dirname(__file__), BUNDLE), "wb"
+    ) as bundle:  # type: IO[bytes]
+        bundle.write(pack(os.path.join(os.path.dirname(__file__), "template")))
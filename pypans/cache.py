@@ -0,0 +1,87 @@
+"""Contains interfaces for locating `pypan` cache directories."""
+import fcntl
+import os
+from typing import Any, Callable, Dict
+
+
+def cache_dir(*parts: str) -> str:
+    """Returns cache directory, creating it when missing.
+
+    `PYPAN_CACHE_DIR` environment variable takes precedence over
+    `XDG_CACHE_HOME` and `~/.cache` locations.
+
+    Args:
+        parts (str): nested cache directory names
+    """
+    home: str = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    path: str = os.path.join(
+        os.environ.get("PYPAN_CACHE_DIR") or os.path.join(home, "pypan"), *parts
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class FileLock:
+    """Represents advisory file lock shared between processes."""
+
+    def __init__(self, path: str, shared: bool = False) -> None:
+        self._path: str = path
+        self._shared: bool = shared
+        self._descriptor: int = -1
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Acquires a lock and returns whether it is held.
+
+        Args:
+            blocking (bool): wait until a lock is released by others
+        """
+        self._descriptor = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        operation: int = fcntl.LOCK_SH if self._shared else fcntl.LOCK_EX
+        try:
+            fcntl.flock(
+                self._descriptor, operation | (0 if blocking else fcntl.LOCK_NB)
+            )
+        except BlockingIOError:
+            self.release()
+            return False
+        return True
+
+    def release(self) -> None:
+        """Releases a lock."""
+        if self._descriptor >= 0:
+            os.close(self._descriptor)
+            self._descriptor = -1
+
+    def __enter__(self) -> "FileLock":
+        """Acquires a lock waiting for it if needed."""
+        self.acquire()
+        return self
+
+    def __exit__(self, *_: Any) -> None:  # noqa: U101
+        """Releases a lock."""
+        self.release()
+
+
+def evict(
+    entries: Dict[str, int], limit: int, remove: Callable[[str], bool]
+) -> int:
+    """Removes least recently used entries until their size fits a limit.
+
+    Args:
+        entries (Dict[str, int]): entry sizes ordered from oldest to newest
+        limit (int): maximum total size in bytes
+        remove (Callable): removes an entry and returns whether it is removed
+
+    Returns number of removed entries.
+    """
+    total: int = sum(entries.values())
+    removed: int = 0
+    for entry, size in entries.items():
+        if total <= limit:
+            break
+        if remove(entry):
+            total -= size
+            removed += 1
+    return removed
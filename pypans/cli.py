@@ -0,0 +1,701 @@
+"""Contains interfaces for package tools executor.
+
+Only `click` and `termcolor` are imported eagerly, project builders are
+imported once a command that needs them is run.
+"""
+import sys
+import time
+from dataclasses import dataclass, fields, replace
+from enum import Enum
+from typing import Any, Dict, IO, List, Optional, TYPE_CHECKING, Tuple
+import click
+from termcolor import colored
+from punish.style import AbstractStyle
+from pypans import __version__
+from pypans.line import Line
+
+if TYPE_CHECKING:  # pragma: no cover
+    import subprocess
+    from pypans.batch import BuildResult
+    from pypans.monorepo import Monorepo
+    from pypans.project import User
+    from pypans.render import RenderReport
+    from pypans.stages import ScaffoldOptions, StageResult
+    from pypans.update import UpdateReport
+
+
+class _Emoji(Enum):
+    """The class represents `emoji` item."""
+
+    SIREN: str = "🚨"
+    PAN: str = "🥘"
+    SNAKE: str = "🐍"
+
+    def __str__(self) -> str:
+        """Returns emoji value."""
+        return self.value
+
+
+class _Output(AbstractStyle):
+    """A command line output."""
+
+    def __init__(self, color: str) -> None:
+        self._color: str = color
+
+    def write(self, string: str) -> int:
+        """Writes data into colored output.
+
+        Args:
+            string (str): given string.
+
+        Returns number of characters to write.
+        """
+        return sys.stdout.write(f"{colored(string, self._color)}{Line.NEW}")
+
+
+class _Environment(AbstractStyle):
+    """Representation of project environment.
+
+    Answers are collected first, then all chosen stages are run
+    concurrently while a project is being rendered.
+    """
+
+    def __init__(
+        self, name: str, user: "User", options: "ScaffoldOptions"
+    ) -> None:
+        # pylint:disable=import-outside-toplevel
+        from pypans.project import Project
+        from pypans.stages import ProjectSetup
+
+        self._user = user
+        monorepo: Optional["Monorepo"] = options.workspace()
+        self._root: str = monorepo.member(name) if monorepo else "."
+        self._project: Project = Project(
+            name, user, self._root, options.project_options(monorepo)
+        )
+        self._options: "ScaffoldOptions" = options
+        self._setup: ProjectSetup = ProjectSetup()
+        self.__red_out: _Output = _Output(color="red")
+        self.__green_out: _Output = _Output(color="green")
+
+    def setup_project(self) -> None:
+        """Builds given project with all chosen stages."""
+        # pylint:disable=import-outside-toplevel
+        from pypans.stages import scaffold
+
+        results: Dict[str, "StageResult"] = scaffold(
+            self._project,
+            root=self._root,
+            user=self._user,
+            setup=self._setup,
+            options=self._options,
+        ).run()
+        for result in results.values():  # type: StageResult
+            if result.passed:
+                self.__green_out.write(
+                    f">>> `{result.name}` stage is done in "
+                    f"{result.seconds:.2f}s"
+                )
+            else:
+                self.__red_out.write(
+                    f">>> {_Emoji.SIREN} `{result.name}` stage is failed with "
+                    f"{result.returncode} code:{Line.NEW}{result.output}"
+                )
+        if self._setup.install:
+            _report_wheelhouse(self._options, self._root)
+        report: "RenderReport" = self._project.report()
+        if report:
+            self.__red_out.write(
+                string=(
+                    f">>> {_Emoji.SIREN} Unmatched template placeholders: "
+                    f"unknown {sorted(report.unknown)}, unused "
+                    f"{sorted(map(str, report.unused))} {_Emoji.SIREN}"
+                )
+            )
+
+    def setup_venv(self) -> None:
+        """Asks whether to build python virtual environment."""
+        venv: str = input(
+            colored(
+                f">>> Would you like to setup python venv for `{self._project.name}` "
+                "project? (yes/no): ",
+                color="green",
+            )
+        )
+        if venv == "yes":
+            self._setup = replace(self._setup, venv=True)
+        else:
+            self.__red_out.write(
+                string=(
+                    f">>> {_Emoji.SIREN} Setup with venv is skipped for "
+                    f"`{self._project.name}` project {_Emoji.SIREN}"
+                )
+            )
+
+    def setup_git(self) -> None:
+        """Asks whether to set up git for a project."""
+        git: str = input(
+            colored(
+                f">>> Would you like to setup git for `{self._project.name}` project? (yes/no): ",
+                color="green",
+            )
+        )
+        if git == "yes":
+            self._setup = replace(
+                self._setup,
+                git=True,
+                remote=input(
+                    colored(
+                        ">>> Please enter github repo (e.g git@github:user/project.git): ",
+                        color="green",
+                    )
+                ),
+            )
+        else:
+            self.__red_out.write(
+                string=(
+                    f">>> {_Emoji.SIREN} Setup with git is skipped for "
+                    f"`{self._project.name}` project {_Emoji.SIREN}"
+                )
+            )
+
+    def install_requirements(self) -> None:
+        """Asks whether to install project requirements."""
+        install: str = input(
+            colored(
+                f">>> Would you like to install dependencies for "
+                f"`{self._project.name}` project? (yes/no): ",
+                color="green",
+            )
+        )
+        if install == "yes":
+            self._setup = replace(self._setup, install=True)
+        else:
+            self.__red_out.write(
+                string=(
+                    f">>> {_Emoji.SIREN} Dependencies installation is skipped"
+                    f" for `{self._project.name}` project {_Emoji.SIREN}"
+                )
+            )
+
+
+def _build_environment(options: "ScaffoldOptions") -> None:
+    """Builds fully-fledged environment.
+
+    Args:
+        options (ScaffoldOptions): optional scaffold features
+    """
+    # pylint:disable=import-outside-toplevel
+    from pypans.project import User
+
+    green_output: _Output = _Output(color="green")
+    green_output.write(
+        string=f">>> {_Emoji.PAN} Welcome to `pypan` python project "
+        f"builder utility {_Emoji.PAN}",
+    )
+    green_output.write(string=">>>")
+    name: str = input(
+        colored(">>> Please name your application (e.g bomber): ", "green")
+    )
+    environment: _Environment = _Environment(
+        name=name,
+        user=User(
+            name=input(
+                colored(
+                    ">>> Please enter your username (e.g John Udot): ", "green"
+                )
+            ),
+            email=input(
+                colored(
+                    ">>> Please enter your email (e.g user@gmail.com): ",
+                    "green",
+                )
+            ),
+        ),
+        options=options,
+    )
+    environment.setup_venv()
+    if not options.monorepo:
+        environment.setup_git()
+    environment.install_requirements()
+    environment.setup_project()
+    green_output.write(string=">>>")
+    _Output(color="magenta").write(
+        string=(
+            f">>>  {_Emoji.SNAKE} Successfully created fresh "
+            f"`{name}` python project  {_Emoji.SNAKE}"
+        )
+    )
+
+
+def _report_wheelhouse(options: "ScaffoldOptions", *roots: str) -> None:
+    """Reports which requirements of scaffolded projects are in a wheelhouse.
+
+    Args:
+        options (ScaffoldOptions): optional scaffold features
+        roots (str): project root directories
+    """
+    # pylint:disable=import-outside-toplevel
+    from pypans.wheelhouse import Wheelhouse, project_requirements
+
+    house: Optional[Wheelhouse] = options.wheelhouse()
+    if house:
+        _Output(color="green").write(
+            f">>> Wheelhouse {house.directory}: "
+            f"{house.report(project_requirements(*roots))}"
+        )
+
+
+def _build_batch(
+    manifest: str, workers: Optional[int], options: "ScaffoldOptions"
+) -> None:
+    """Builds all projects from a manifest without any prompts.
+
+    Args:
+        manifest (str): path to `json` or `yaml` manifest
+        workers (int): number of worker processes
+        options (ScaffoldOptions): optional scaffold features
+    """
+    # pylint:disable=import-outside-toplevel
+    from pypans.batch import build_all, read_manifest, summary
+
+    start: float = time.perf_counter()
+    results: List["BuildResult"] = list(
+        build_all(read_manifest(manifest), workers, options)
+    )
+    _report_wheelhouse(options, *(result.root for result in results))
+    for line in summary(results, time.perf_counter() - start):
+        _Output(color="green" if line.startswith("ok") else "red").write(line)
+    if not all(result.passed for result in results):
+        sys.exit(1)
+
+
+def _build_archive(
+    target: str,
+    archive_format: Optional[str],
+    batch: Optional[str],
+    options: "ScaffoldOptions",
+) -> None:
+    """Streams projects into an archive without touching a working directory.
+
+    Projects are taken from a manifest, otherwise a single project is asked
+    for with prompts written into `stderr`.
+
+    Args:
+        target (str): archive path, `-` for `stdout`
+        archive_format (str): archive format, guessed by target if missing
+        batch (str): path to `json` or `yaml` manifest
+        options (ScaffoldOptions): optional scaffold features
+    """
+    # pylint:disable=import-outside-toplevel
+    from pypans.archive import ArchiveFormat
+    from pypans.batch import ProjectSpec, archive_all, read_manifest
+
+    if batch:
+        specs: Tuple[ProjectSpec, ...] = read_manifest(batch)
+    else:
+        name: str = click.prompt(
+            colored(">>> Please name your application (e.g bomber)", "green"),
+            err=True,
+        )
+        specs = (
+            ProjectSpec(
+                name=name,
+                user=click.prompt(
+                    colored(">>> Please enter your username", "green"),
+                    err=True,
+                ),
+                email=click.prompt(
+                    colored(">>> Please enter your email", "green"), err=True
+                ),
+                root=name,
+            ),
+        )
+    chosen: ArchiveFormat = (
+        ArchiveFormat(archive_format)
+        if archive_format
+        else ArchiveFormat.from_path(target)
+    )
+    if target == "-":
+        archive_all(specs, sys.stdout.buffer, chosen, options)
+        sys.stdout.buffer.flush()
+        return None
+    with open(target, "wb") as stream:  # type: IO[bytes]
+        archive_all(specs, stream, chosen, options)
+    return None
+
+
+def _trace_into(path: str) -> None:
+    """Traces current command and writes a trace once it is finished.
+
+    Args:
+        path (str): path to a trace file
+    """
+    # pylint:disable=import-outside-toplevel
+    from pypans import trace
+
+    tracer: trace.Tracer = trace.enable()
+
+    def export() -> None:
+        tracer.export(path)
+        _Output(color="magenta").write(f">>> Trace is written to {path}")
+        for line in tracer.summary():
+            _Output(color="magenta").write(f">>> {line}")
+
+    click.get_current_context().call_on_close(export)
+
+
+@dataclass(frozen=True)
+class _Command:
+    """Represents what a main command is asked to do.
+
+    Remaining main command options are scaffold options.
+    """
+
+    start: bool
+    batch: Optional[str]
+    workers: Optional[int]
+    output_archive: Optional[str]
+    archive_format: Optional[str]
+    trace: Optional[str]
+    version: bool
+
+
+def _scaffold_options(
+    service: Optional[str], **options: Any
+) -> "ScaffoldOptions":
+    """Returns scaffold options making sure a pack and templates exist.
+
+    Args:
+        service (str): kind of web service, none if missing
+        options (Any): other scaffold options
+    """
+    # pylint:disable=import-outside-toplevel
+    from pypans.source import load
+    from pypans.stages import ScaffoldOptions
+
+    scaffold: ScaffoldOptions = ScaffoldOptions(
+        service=service or "", **options
+    )
+    if scaffold.pack:
+        try:
+            scaffold.template_pack()
+        except ValueError as error:
+            raise click.BadParameter(str(error), param_hint="--pack")
+    if scaffold.source:
+        try:
+            load(str(scaffold.template_source()))
+        except ValueError as error:
+            raise click.BadParameter(str(error), param_hint="--source")
+    return scaffold
+
+
+def _run(command: _Command, options: "ScaffoldOptions") -> None:
+    """Runs a main command.
+
+    Args:
+        command (_Command): main command
+        options (ScaffoldOptions): optional scaffold features
+    """
+    if command.output_archive:
+        return _build_archive(
+            command.output_archive,
+            command.archive_format,
+            command.batch,
+            options,
+        )
+    if command.start:
+        return _build_environment(options)
+    if command.batch:
+        return _build_batch(command.batch, command.workers, options)
+    if command.version:
+        return click.echo(f'Version {__version__}')
+    return click.echo(click.get_current_context().get_help())
+
+
+@click.group(invoke_without_command=True)
+@click.option(
+    "--start",
+    show_default=True,
+    is_flag=True,
+    help=f"""
+
+    Starts python project composer:{Line.NEW}
+      >>> Configure project packaging for `python`{Line.NEW}
+      >>> Configure testing environment with `pytest`{Line.NEW}
+      >>> Configure static code analysis and CI tools{Line.NEW}
+      >>> Configure readme and changelog{Line.NEW}
+      >>> Configure project requirements{Line.NEW}
+      >>> Configure `git` (optional){Line.NEW}
+      >>> Install python dependencies (optional){Line.NEW}
+    """,
+)
+@click.option(
+    "--batch",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Build projects listed in `json` or `yaml` manifest without prompts.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of parallel workers for `--batch` (CPU count by default).",
+)
+@click.option(
+    "--link-assets",
+    is_flag=True,
+    default=False,
+    help=(
+        "Link static files from a shared content-addressed cache. "
+        "Hardlinked files are read-only, copy them before editing."
+    ),
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    default=False,
+    help="Install requirements only from a local wheelhouse.",
+)
+@click.option(
+    "--cache-venv",
+    is_flag=True,
+    default=False,
+    help="Clone python venv with installed requirements from a local cache.",
+)
+@click.option(
+    "--render-cache",
+    is_flag=True,
+    default=False,
+    help="Serve rendered templates from a shared on-disk cache.",
+)
+@click.option(
+    "--pack",
+    default="",
+    help="Build project with an installed template pack (see `pypan packs`).",
+)
+@click.option(
+    "--source",
+    default="",
+    help="Build project with templates from a directory or `<git url>@<rev>`.",
+)
+@click.option(
+    "--profile",
+    type=click.Choice(("default", "perf")),
+    default="default",
+    help="Generate tooling profile, `perf` adds benchmarks and profiling.",
+)
+@click.option(
+    "--service",
+    type=click.Choice(("wsgi", "asgi")),
+    default=None,
+    help="Generate tuned `gunicorn` service with an app and a load test.",
+)
+@click.option(
+    "--monorepo",
+    type=click.Path(file_okay=False),
+    default="",
+    help="Add packages under a root sharing configs, venv and analysers.",
+)
+@click.option(
+    "--output-archive",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    default=None,
+    help="Stream project into an archive (`-` for stdout) instead of a root.",
+)
+@click.option(
+    "--archive-format",
+    type=click.Choice(("tar.gz", "tar", "zip")),
+    default=None,
+    help="Archive format (by `--output-archive` extension, `tar.gz` for `-`).",
+)
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False, writable=True),
+    envvar="PYPAN_TRACE",
+    default=None,
+    help="Write Chrome trace of all stages into a `json` file.",
+)
+@click.option(
+    "--version", "-v", is_flag=True, default=False, help="Display tool version."
+)
+def _easypan(**arguments: Any) -> None:
+    """Runs `pypan` command line utility.
+
+    Program allows to interactively compose
+    python project template from the scratch.
+    """
+    command: _Command = _Command(
+        **{field.name: arguments.pop(field.name) for field in fields(_Command)}
+    )
+    if command.trace:
+        _trace_into(command.trace)
+    if click.get_current_context().invoked_subcommand:
+        return None
+    return _run(command, _scaffold_options(**arguments))
+
+
+@_easypan.group()
+def wheelhouse() -> None:
+    """Manages local wheelhouse used by `--offline` installs."""
+
+
+@wheelhouse.command()
+@click.option(
+    "--directory",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Wheelhouse location (pypan cache directory by default).",
+)
+def build(directory: Optional[str]) -> None:
+    """Builds wheels for all template requirements."""
+    # pylint:disable=import-outside-toplevel
+    from pypans.wheelhouse import Wheelhouse, template_requirements
+
+    house: Wheelhouse = Wheelhouse(directory)
+    _Output(color="green").write(f">>> Building wheelhouse {house.directory}")
+    result: "subprocess.CompletedProcess[str]" = house.build()
+    if result.returncode:
+        _Output(color="red").write(result.stdout)
+        sys.exit(result.returncode)
+    _Output(color="green").write(
+        f">>> Wheelhouse is ready: {house.report(template_requirements())}"
+    )
+
+
+@_easypan.command(name="cache")
+@click.option(
+    "--clear", is_flag=True, default=False, help="Remove all cached renders."
+)
+def render_cache_stats(clear: bool) -> None:
+    """Shows render cache usage."""
+    # pylint:disable=import-outside-toplevel
+    from pypans.rendercache import RenderCache
+
+    cache: RenderCache = RenderCache()
+    if clear:
+        cache.clear()
+    _Output(color="green").write(f">>> Render cache: {cache.stats()}")
+
+
+@_easypan.command(name="packs")
+def list_packs() -> None:
+    """Lists installed template packs."""
+    # pylint:disable=import-outside-toplevel
+    from pypans.packs import PackIndex
+
+    for pack in PackIndex().packs().values():
+        _Output(color="green").write(
+            f">>> {pack.name:<16} {pack.distribution} {pack.version}"
+        )
+
+
+@_easypan.command(name="update")
+@click.argument(
+    "roots", nargs=-1, type=click.Path(exists=True, file_okay=False)
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Only report files that would be written.",
+)
+def update_projects(roots: Tuple[str, ...], dry_run: bool) -> None:
+    """Re-renders generated projects with current templates.
+
+    Only files whose output changed are written, and files modified
+    since generation are skipped.
+    """
+    # pylint:disable=import-outside-toplevel
+    from pypans.update import update
+
+    failed: bool = False
+    for root in roots or (".",):
+        try:
+            report: "UpdateReport" = update(root, dry_run)
+        except ValueError as error:
+            _Output(color="red").write(f">>> {_Emoji.SIREN} {error}")
+            failed = True
+            continue
+        _Output(color="green").write(
+            f">>> `{root}`: {len(report.updated)} updated, "
+            f"{len(report.added)} added, {report.unchanged} unchanged"
+        )
+        for path in report.updated + report.added:
+            _Output(color="green").write(f">>>   {path}")
+        for path in report.modified:
+            _Output(color="red").write(
+                f">>>   {path} is modified locally, skipped"
+            )
+    if failed:
+        sys.exit(1)
+
+
+@_easypan.command(name="serve")
+@click.option(
+    "--socket",
+    "path",
+    type=click.Path(dir_okay=False),
+    required=True,
+    help="Unix socket to listen on.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of requests handled concurrently.",
+)
+def serve(path: str, workers: Optional[int]) -> None:
+    """Serves scaffold requests with templates kept in memory."""
+    # pylint:disable=import-outside-toplevel
+    from pypans.daemon import ScaffoldServer
+
+    try:
+        server: ScaffoldServer = ScaffoldServer(path, workers)
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--socket")
+    _Output(color="green").write(f">>> Serving scaffold requests on {path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@_easypan.command(name="request")
+@click.argument("payload", default="-")
+@click.option(
+    "--socket",
+    "path",
+    type=click.Path(exists=True, dir_okay=False),
+    required=True,
+    help="Unix socket of a `pypan serve` daemon.",
+)
+@click.option(
+    "--output",
+    type=click.File("wb"),
+    default="-",
+    help="Archive destination of `archive` requests (stdout by default).",
+)
+def send_request(payload: str, path: str, output: IO[bytes]) -> None:
+    """Sends `json` request (or `-` to read it from stdin) to a daemon.
+
+    Relative project roots are resolved against current directory.
+    """
+    # pylint:disable=import-outside-toplevel
+    import json
+    import os
+    from pypans.daemon import request
+
+    content: Dict[str, Any] = json.loads(
+        sys.stdin.read() if payload == "-" else payload
+    )
+    if "name" in content:
+        content["root"] = os.path.abspath(content.get("root", content["name"]))
+    archive: bool = content.get("command") == "archive"
+    response: Dict[str, Any] = request(
+        path, content, output if archive else None
+    )
+    click.echo(json.dumps(response), err=archive)
+    if not response.get("ok"):
+        sys.exit(1)
@@ -0,0 +1,266 @@
+"""Contains interfaces for serving scaffold requests over a local socket.
+
+A daemon keeps templates loaded and compiled, so requests skip interpreter
+startup and imports. Every connection carries one `json` request line and
+gets one `json` response line back:
+
+    {"command": "scaffold", "name": "bomber", "user": "John Udot",
+     "email": "j@u.com", "root": "/srv/bomber", "options": {"pack": "cli"}}
+    {"command": "archive", "name": "bomber", ..., "format": "tar.gz"}
+    {"command": "health"}
+    {"command": "stats"}
+
+Archive response line carries archive `size` and is followed by archive
+bytes until a connection is closed. Request fields besides `command`,
+`options` and `format` follow batch manifest entries. Clients may only
+choose a template pack, profile and service, other options are set when
+a daemon is started.
+"""
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, replace
+from typing import Any, Dict, FrozenSet, IO, List, Optional, TYPE_CHECKING
+from pypans.archive import ArchiveFormat
+from pypans.batch import BuildResult, ProjectSpec, archive_all, build
+from pypans.packs import PackIndex
+from pypans.project import preload
+from pypans.stages import ScaffoldOptions
+from pypans.stream import CHUNK
+
+if TYPE_CHECKING:  # pragma: no cover
+    from typing import Deque
+
+_WINDOW: int = 1024
+_SPOOL: int = 16 * 1024**2
+_CLIENT_OPTIONS: FrozenSet[str] = frozenset(("pack", "profile", "service"))
+
+
+class ServerStats:
+    """Represents thread-safe counters and latencies of served requests.
+
+    Percentiles are computed over a window of most recent requests.
+    """
+
+    def __init__(self, window: int = _WINDOW) -> None:
+        self._lock: threading.Lock = threading.Lock()
+        self._latencies: "Deque[float]" = deque(maxlen=window)
+        self._started: float = time.monotonic()
+        self._served: int = 0
+        self._failed: int = 0
+
+    def record(self, seconds: float, passed: bool) -> None:
+        """Records a served request.
+
+        Args:
+            seconds (float): request latency
+            passed (bool): whether a request succeeded
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+            self._served += 1
+            self._failed += not passed
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns served requests and latency percentiles in milliseconds."""
+        with self._lock:
+            latencies: List[float] = sorted(self._latencies)
+            served, failed = self._served, self._failed
+        return {
+            "served": served,
+            "failed": failed,
+            "uptime": round(time.monotonic() - self._started, 3),
+            "latency": {
+                f"p{percent}": round(_percentile(latencies, percent) * 1000, 3)
+                for percent in (50, 90, 99)
+            },
+        }
+
+
+def _options(
+    defaults: ScaffoldOptions, overrides: Dict[str, Any]
+) -> ScaffoldOptions:
+    """Returns daemon options with options chosen by a client.
+
+    Args:
+        defaults (ScaffoldOptions): options a daemon is started with
+        overrides (dict): options of a request
+    """
+    rejected: List[str] = sorted(set(overrides) - _CLIENT_OPTIONS)
+    if rejected:
+        raise ValueError(f"Options {rejected} can not be set by a client")
+    return replace(defaults, **overrides)
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    """Returns nearest-rank percentile of sorted values, `0` if empty."""
+    if not values:
+        return 0.0
+    return values[max(0, -(-len(values) * percent // 100) - 1)]
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Represents handler of a single request connection."""
+
+    server: "ScaffoldServer"
+
+    def handle(self) -> None:
+        """Reads a request and writes its response.
+
+        Only scaffold and archive requests are counted in stats, a request
+        is counted before its response is written. Archives are built into
+        a spool first, so a failed build is reported instead of a truncated
+        stream.
+        """
+        start: float = time.perf_counter()
+        try:
+            payload: Dict[str, Any] = json.loads(self.rfile.readline())
+            command: str = payload.pop("command", "scaffold")
+            if command == "health":
+                return self._reply({"ok": True, "status": "serving"})
+            if command == "stats":
+                return self._reply({"ok": True, **self.server.stats.snapshot()})
+            options: ScaffoldOptions = _options(
+                self.server.options, payload.pop("options", {})
+            )
+            archive_format: ArchiveFormat = ArchiveFormat(
+                payload.pop("format", str(ArchiveFormat.TAR_GZ))
+            )
+            spec: ProjectSpec = ProjectSpec.from_dict(payload)
+            if command == "archive":
+                return self._archive(spec, archive_format, options, start)
+            if command != "scaffold":
+                raise ValueError(f"Unknown '{command}' command")
+            result: BuildResult = build(spec, options)
+            response: Dict[str, Any] = {"ok": result.passed, **asdict(result)}
+        except Exception as error:  # pylint:disable=broad-except
+            response = {"ok": False, "error": f"{error!r}"}
+        self.server.stats.record(time.perf_counter() - start, response["ok"])
+        return self._reply(response)
+
+    def _archive(
+        self,
+        spec: ProjectSpec,
+        archive_format: ArchiveFormat,
+        options: ScaffoldOptions,
+        start: float,
+    ) -> None:
+        """Writes a status line followed by archive bytes."""
+        with tempfile.SpooledTemporaryFile(_SPOOL) as spool:  # type: IO[bytes]
+            try:
+                archive_all((spec,), spool, archive_format, options)
+            except Exception as error:  # pylint:disable=broad-except
+                self.server.stats.record(time.perf_counter() - start, False)
+                return self._reply({"ok": False, "error": f"{error!r}"})
+            self.server.stats.record(time.perf_counter() - start, True)
+            self._reply({"ok": True, "size": spool.tell()})
+            spool.seek(0)
+            for chunk in iter(lambda: spool.read(CHUNK), b""):
+                self.wfile.write(chunk)
+        return None
+
+    def _reply(self, response: Dict[str, Any]) -> None:
+        """Writes a response line."""
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class ScaffoldServer(socketserver.UnixStreamServer):
+    """Represents scaffold daemon listening on a unix socket.
+
+    Connections are handled by a bounded pool of worker threads, further
+    ones wait in a queue.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        workers: Optional[int] = None,
+        options: ScaffoldOptions = ScaffoldOptions(),
+    ) -> None:
+        _claim(path)
+        super().__init__(path, _Handler)
+        self.options: ScaffoldOptions = options
+        self.stats: ServerStats = ServerStats()
+        self._pool: ThreadPoolExecutor = ThreadPoolExecutor(
+            workers or min(32, (os.cpu_count() or 1) + 4)
+        )
+        preload()
+        PackIndex().packs()
+
+    def process_request(  # pylint:disable=redefined-outer-name
+        self, request: Any, client_address: Any
+    ) -> None:
+        """Hands a connection over to a worker thread."""
+        self._pool.submit(self._process, request, client_address)
+
+    def server_close(self) -> None:
+        """Stops listening, waits for workers and removes a socket."""
+        super().server_close()
+        self._pool.shutdown(wait=True)
+        if os.path.exists(self.server_address):  # type: ignore
+            os.remove(self.server_address)  # type: ignore
+
+    def _process(self, connection: Any, client_address: Any) -> None:
+        """Handles a connection in a worker thread."""
+        try:
+            self.finish_request(connection, client_address)
+        except Exception:  # pylint:disable=broad-except
+            self.handle_error(connection, client_address)
+        finally:
+            _shutdown(connection)
+
+
+def _shutdown(connection: socket.socket) -> None:
+    """Closes a served connection, as `TCPServer.shutdown_request` does."""
+    try:
+        connection.shutdown(socket.SHUT_WR)
+    except OSError:
+        pass
+    connection.close()
+
+
+def _claim(path: str) -> None:
+    """Removes a stale socket left by a dead daemon.
+
+    Args:
+        path (str): socket path
+    """
+    if not os.path.exists(path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.remove(path)
+        else:
+            raise ValueError(f"'{path}' is already served by a daemon!")
+
+
+def request(
+    path: str, payload: Dict[str, Any], output: Optional[IO[bytes]] = None
+) -> Dict[str, Any]:
+    """Sends a request to a daemon and returns its response.
+
+    Archive bytes are copied into an output stream.
+
+    Args:
+        path (str): socket path
+        payload (Dict[str, Any]): request
+        output (IO[bytes]): stream to write archive into
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with client.makefile("rb") as stream:  # type: IO[bytes]
+            response: Dict[str, Any] = json.loads(stream.readline())
+            if output is not None and response.get("ok"):
+                for chunk in iter(lambda: stream.read(CHUNK), b""):
+                    output.write(chunk)
+    return response
@@ -1,8 +1,10 @@
 """Contains interfaces for managing files."""
 import os
 import shutil
+import tempfile
 from enum import Enum
 from typing import Any, IO
+from pypans.stream import substitute
 
 
 def write_to_file(path: str, content: str, mode: str = "a") -> None:
@@ -12,13 +14,22 @@ def write_to_file(path: str, content: str, mode: str = "a") -> None:
 
 
 def replace_content(path: str, from_replace: str, to_replace: str) -> None:
-    """Replaces file content."""
-    with open(path) as file:  # type: IO[str]
-        write_to_file(
-            path,
-            content=file.read().replace(from_replace, to_replace),
-            mode="w",
-        )
+    """Replaces file content chunk by chunk in a single pass."""
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path) or ".")
+    try:
+        with open(path, "rb") as source, os.fdopen(
+            descriptor, "wb"
+        ) as target:  # type: IO[bytes], IO[bytes]
+            for chunk in substitute(
+                source,
+                {from_replace.encode("utf-8"): to_replace.encode("utf-8")},
+            ):
+                target.write(chunk)
+        shutil.copymode(path, temporary)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
 
 
 class Template(Enum):
@@ -32,6 +43,7 @@ class Template(Enum):
     TRAVIS: str = ".travis.yml"
     PYTEST: str = "pytest.ini"
     ANALYSER: str = "analyse-source-code.sh"
+    RUNNER: str = "analyse-source-code.py"
     ICON: str = "icon.png"
     GITIGNORE: str = ".gitignore"
     AUTHORS: str = "AUTHORS.md"
@@ -47,11 +59,12 @@ class Template(Enum):
     SETUP: str = "setup.py"
 
     @classmethod
-    def files_from(cls, from_path: str = "./") -> None:
-        """Creates template files from given path."""
+    def files_from(cls, from_path: str = "./", to_path: str = "./") -> None:
+        """Creates template files from given path in a target location."""
         for template in cls:  # type: Template
             shutil.copyfile(
-                os.path.join(from_path, template.value), template.value
+                os.path.join(from_path, template.value),
+                os.path.join(to_path, template.value),
             )
 
     def __str__(self) -> Any:
@@ -0,0 +1,20 @@
+"""Contains interfaces for composing text lines."""
+from enum import Enum
+
+
+class Line(Enum):
+    """Represents string line."""
+
+    NEW: str = "\n"
+
+    def by_(self, times: int) -> str:
+        """Multiplies line by given number.
+
+        Args:
+            times (int): a multiplier number
+        """
+        return self.value * times
+
+    def __str__(self) -> str:
+        """Returns line value."""
+        return self.value
@@ -0,0 +1,197 @@
+"""Contains interfaces for pinning requirements from installed distributions."""
+import glob
+import os
+import re
+import warnings
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    IO,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Set,
+    Tuple,
+)
+from pypans.file import Template
+from pypans.wheelhouse import normalize
+
+try:
+    from importlib import metadata
+except ImportError:  # pragma: no cover
+    import importlib_metadata as metadata  # type: ignore
+
+try:
+    from packaging.markers import InvalidMarker, Marker
+except ImportError:  # pragma: no cover
+    Marker = None  # type: ignore
+
+_REQUIREMENT: Pattern[str] = re.compile(
+    r"^\s*(?P<name>[A-Za-z0-9][A-Za-z0-9._-]*)\s*"
+    r"(?:\[(?P<extras>[^\]]*)\])?[^;]*(?:;(?P<marker>.*))?$"
+)
+_EXTRA: Pattern[str] = re.compile(r"""extra\s*==\s*['"]([^'"]+)['"]""")
+_Requirement = Tuple[str, FrozenSet[str], str]
+
+
+def _parse(requirement: str) -> Optional[_Requirement]:
+    """Returns canonical name, extras and marker of a requirement.
+
+    Args:
+        requirement (str): requirement specifier
+    """
+    match: Any = _REQUIREMENT.match(requirement.split("#")[0])
+    if not match:
+        return None
+    return (
+        normalize(match.group("name")),
+        frozenset(
+            normalize(extra)
+            for extra in (match.group("extras") or "").split(",")
+            if extra.strip()
+        ),
+        (match.group("marker") or "").strip(),
+    )
+
+
+def _applies(marker: str, extras: FrozenSet[str]) -> bool:
+    """Checks if a marker matches current interpreter and requested extras.
+
+    Args:
+        marker (str): environment marker
+        extras (FrozenSet[str]): extras requested for a parent distribution
+    """
+    if not marker:
+        return True
+    if Marker is None:
+        needed: List[str] = _EXTRA.findall(marker)
+        return not needed or any(normalize(extra) in extras for extra in needed)
+    try:
+        parsed: Any = Marker(marker)
+    except InvalidMarker:
+        return False
+    return any(parsed.evaluate({"extra": extra}) for extra in extras or {""})
+
+
+def site_packages(venv: str) -> List[str]:
+    """Returns `site-packages` directories of a virtual environment.
+
+    Args:
+        venv (str): virtual environment location
+    """
+    return sorted(
+        [
+            *glob.glob(os.path.join(venv, "lib", "python*", "site-packages")),
+            *glob.glob(os.path.join(venv, "Lib", "site-packages")),
+        ]
+    )
+
+
+class Locker:
+    """Represents resolver of installed requirements into exact pins.
+
+    Dependencies are walked through `Requires-Dist` records of installed
+    distributions, so no `pip` process is needed to produce a lock.
+    """
+
+    def __init__(self, paths: Optional[Sequence[str]] = None) -> None:
+        self._distributions: Dict[str, Any] = {}
+        for distribution in (
+            metadata.distributions(path=list(paths))
+            if paths is not None
+            else metadata.distributions()
+        ):
+            name: str = normalize(distribution.metadata["Name"] or "")
+            self._distributions.setdefault(name, distribution)
+
+    def closure(self, requirements: Iterable[str]) -> Dict[str, str]:
+        """Returns pinned versions of requirements and their dependencies.
+
+        Requirements that are not installed are skipped, see `unresolved()`.
+
+        Args:
+            requirements (Iterable[str]): requirement specifiers
+        """
+        pins: Dict[str, str] = {}
+        seen: Set[Tuple[str, FrozenSet[str]]] = set()
+        pending: List[_Requirement] = [
+            parsed for parsed in map(_parse, requirements) if parsed
+        ]
+        while pending:
+            name, extras, _ = pending.pop()
+            if (name, extras) in seen or name not in self._distributions:
+                continue
+            seen.add((name, extras))
+            distribution: Any = self._distributions[name]
+            pins[distribution.metadata["Name"]] = distribution.version
+            for requirement in distribution.requires or ():
+                parsed: Optional[_Requirement] = _parse(requirement)
+                if parsed and _applies(parsed[2], extras):
+                    pending.append(parsed)
+        return pins
+
+    def unresolved(self, requirements: Iterable[str]) -> List[str]:
+        """Returns requirement lines that can not be pinned.
+
+        These are requirements that are not installed, as well as options
+        and URLs that are not plain specifiers. Comments are dropped.
+
+        Args:
+            requirements (Iterable[str]): requirement specifiers
+        """
+        lines: List[str] = []
+        for requirement in requirements:
+            line: str = requirement.split("#")[0].strip()
+            parsed: Optional[_Requirement] = _parse(line) if line else None
+            if line and (not parsed or parsed[0] not in self._distributions):
+                lines.append(line)
+        return lines
+
+    def lock(self, requirements: Iterable[str]) -> List[str]:
+        """Returns sorted pinned requirement lines.
+
+        Unresolved requirement lines are kept verbatim after the pins.
+
+        Args:
+            requirements (Iterable[str]): requirement specifiers
+        """
+        lines: List[str] = list(requirements)
+        return [
+            *(
+                f"{name}=={version}"
+                for name, version in sorted(
+                    self.closure(lines).items(),
+                    key=lambda pin: normalize(pin[0]),
+                )
+            ),
+            *self.unresolved(lines),
+        ]
+
+
+def lock_requirements(root: str, venv: Optional[str] = None) -> None:
+    """Overwrites project requirements with pins of installed versions.
+
+    Missing requirements files are skipped, e.g in monorepo roots.
+    Requirements that are not installed are kept as is with a warning.
+
+    Args:
+        root (str): project root directory
+        venv (str): virtual environment, current interpreter by default
+    """
+    locker: Locker = Locker(site_packages(venv) if venv else None)
+    for template in (Template.REQUIREMENTS, Template.DEV_REQUIREMENTS):
+        path: str = os.path.join(root, template.value)
+        if not os.path.isfile(path):
+            continue
+        with open(path) as file:  # type: IO[str]
+            requirements: List[str] = file.read().splitlines()
+        unresolved: List[str] = locker.unresolved(requirements)
+        if unresolved:
+            warnings.warn(f"{path}: requirements are not pinned {unresolved}")
+        lines: List[str] = locker.lock(requirements)
+        os.unlink(path)  # a file may be linked to a shared asset
+        with open(path, "w") as file:
+            file.write("".join(f"{line}\n" for line in lines))
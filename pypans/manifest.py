@@ -0,0 +1,126 @@
+"""Contains interfaces for recording hashes of generated project files."""
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, IO, Optional
+from pypans.render import Placeholder, Variables
+from pypans.stage import Content, Staged
+from pypans.stream import CHUNK, StreamedFile
+
+MANIFEST: str = ".pypan-manifest.json"
+
+
+def sha256(content: Staged) -> str:
+    """Returns `sha256` of a file content.
+
+    Args:
+        content (Staged): file content or a streamed file
+    """
+    if isinstance(content, StreamedFile):
+        return content.sha256()
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_sha256(path: str) -> Optional[str]:
+    """Returns `sha256` of a file on disk, `None` if it does not exist.
+
+    Args:
+        path (str): path to a file
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as file:  # type: IO[bytes]
+            for chunk in iter(lambda: file.read(CHUNK), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class FileRecord:
+    """Represents hashes of a generated file.
+
+    Template hash is empty for files generated by python code rather than
+    rendered from a bundled template.
+    """
+
+    template: str
+    output: str
+
+
+@dataclass(frozen=True)
+class Manifest:  # pylint:disable=too-many-instance-attributes
+    """Represents hashes of all generated files and variables used."""
+
+    version: str
+    variables: Dict[str, str]
+    files: Dict[str, FileRecord]
+    pack: str = ""
+    source: str = ""
+    profile: str = "default"
+    service: str = ""
+    monorepo: bool = False
+
+    @classmethod
+    def loads(cls, content: Content) -> "Manifest":
+        """Parses manifest from `json` content.
+
+        Args:
+            content (Content): manifest content
+        """
+        data: Dict[str, Any] = json.loads(bytes(content))
+        return cls(
+            version=data["version"],
+            variables=data["variables"],
+            files={
+                path: FileRecord(**record)
+                for path, record in data["files"].items()
+            },
+            pack=data.get("pack", ""),
+            source=data.get("source", ""),
+            profile=data.get("profile", "default"),
+            service=data.get("service", ""),
+            monorepo=data.get("monorepo", False),
+        )
+
+    @classmethod
+    def read(cls, root: str) -> "Manifest":
+        """Reads manifest of a generated project.
+
+        Args:
+            root (str): project root directory
+        """
+        path: str = os.path.join(root, MANIFEST)
+        if not os.path.isfile(path):
+            raise ValueError(f"'{root}' is not generated by `pypan`!")
+        with open(path, "rb") as file:  # type: IO[bytes]
+            return cls.loads(file.read())
+
+    def dumps(self) -> str:
+        """Returns stable `json` representation of a manifest."""
+        content: str = json.dumps(
+            {
+                "version": self.version,
+                "variables": self.variables,
+                "pack": self.pack,
+                "source": self.source,
+                "profile": self.profile,
+                "service": self.service,
+                "monorepo": self.monorepo,
+                "files": {
+                    path: asdict(record) for path, record in self.files.items()
+                },
+            },
+            indent=2,
+            sort_keys=True,
+        )
+        return content + "\n"
+
+    def placeholders(self) -> Variables:
+        """Returns recorded variables keyed by placeholders."""
+        return {
+            Placeholder(placeholder): value
+            for placeholder, value in self.variables.items()
+        }
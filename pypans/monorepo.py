@@ -0,0 +1,222 @@
+"""Contains interfaces for scaffolding packages into a shared monorepo.
+
+A monorepo root keeps a single copy of toolchain configs, analysers, dev
+requirements and python venv, while every package gets its own directory
+with packaging files, sources and tests:
+
+    root/
+        .pylintrc .flake8 .pydocstyle mypy.ini pyproject.toml ...
+        analyse-source-code.sh analyse-source-code.py
+        requirements-dev.txt monorepo.txt venv/
+        bomber/
+            setup.py requirements.txt pytest.ini bomber/ tests/ ...
+
+Member packages are listed in `monorepo.txt`, so analysers of a root check
+all of them in a single pass.
+"""
+import hashlib
+import os
+import subprocess
+import sys
+from typing import IO, List, Optional, Sequence, Set, Tuple
+from pypans.cache import FileLock, cache_dir
+from pypans.file import Template
+from pypans.lock import lock_requirements
+from pypans.stage import Staged, StagedTree
+from pypans.stream import StreamedFile
+from pypans.venvcache import VenvCache
+from pypans.wheelhouse import Wheelhouse, requirement_names
+
+MEMBERS: str = "monorepo.txt"
+SHARED: Tuple[Template, ...] = (
+    Template.FLAKE,
+    Template.PYDOC,
+    Template.PYLINT,
+    Template.MYPY,
+    Template.BLACK,
+    Template.TRAVIS,
+    Template.GITIGNORE,
+    Template.ANALYSER,
+    Template.RUNNER,
+    Template.DEV_REQUIREMENTS,
+)
+
+
+def _lines(content: Staged) -> List[str]:
+    """Returns lines of a staged file content."""
+    return (
+        (
+            b"".join(content.chunks())
+            if isinstance(content, StreamedFile)
+            else bytes(content)
+        )
+        .decode("utf-8")
+        .splitlines()
+    )
+
+
+def _requirement(line: str) -> str:
+    """Returns project name of a requirement line, or a line itself."""
+    names: List[str] = requirement_names((line,))
+    return names[0] if names else line.strip()
+
+
+def _merge(lines: List[str], extra: List[str]) -> List[str]:
+    """Returns requirement lines followed by missing extra requirements.
+
+    Requirements are compared by normalized project names, so a package
+    does not add `pytest` into a root that already pins `pytest==x`.
+    """
+    known: Set[str] = set(map(_requirement, lines))
+    merged: List[str] = list(lines)
+    for line in extra:
+        if _requirement(line) not in known:
+            known.add(_requirement(line))
+            merged.append(line)
+    return merged
+
+
+class Monorepo:
+    """Represents a root shared by many packages.
+
+    Shared files and venv are changed under a lock, so packages can be
+    added concurrently, e.g by batch workers.
+    """
+
+    def __init__(self, root: str) -> None:
+        self._root: str = root
+
+    @property
+    def root(self) -> str:
+        """Returns monorepo root directory."""
+        return self._root
+
+    @property
+    def venv(self) -> str:
+        """Returns shared python venv directory."""
+        return os.path.join(self._root, "venv")
+
+    def member(self, name: str) -> str:
+        """Returns root directory of a package.
+
+        Args:
+            name (str): package name
+        """
+        return os.path.join(self._root, name)
+
+    def packages(self) -> Tuple[str, ...]:
+        """Returns names of member packages."""
+        try:
+            with open(
+                os.path.join(self._root, MEMBERS)
+            ) as members:  # type: IO[str]
+                return tuple(members.read().split())
+        except FileNotFoundError:
+            return ()
+
+    def adopt(self, name: str, shared: StagedTree) -> None:
+        """Adds a package into a monorepo with its shared files.
+
+        Shared files already written into a root are kept as they are, only
+        missing dev requirements of a package are appended to them.
+
+        Args:
+            name (str): package name
+            shared (StagedTree): shared files of a package
+        """
+        with self._lock():
+            tree: StagedTree = StagedTree()
+            for path in shared:  # type: str
+                target: str = os.path.join(self._root, path)
+                if path == str(Template.DEV_REQUIREMENTS) and os.path.exists(
+                    target
+                ):
+                    with open(target, "rb") as file:  # type: IO[bytes]
+                        lines: List[str] = _merge(
+                            _lines(file.read()), _lines(shared.read(path))
+                        )
+                    tree.add(
+                        path,
+                        "".join(f"{line}\n" for line in lines),
+                        shared.mode(path),
+                    )
+                elif not os.path.exists(target):
+                    tree.add(path, shared.read(path), shared.mode(path))
+            tree.add(
+                MEMBERS,
+                "".join(
+                    f"{package}\n"
+                    for package in sorted({*self.packages(), name})
+                ),
+            )
+            tree.commit(self._root)
+
+    def create_venv(
+        self, clone: bool = False, wheelhouse: Optional[Wheelhouse] = None
+    ) -> None:
+        """Creates shared venv unless it already exists.
+
+        Args:
+            clone (bool): clone venv with installed requirements from a cache
+            wheelhouse (Wheelhouse): install only from a local wheelhouse
+        """
+        with self._lock():
+            if os.path.exists(os.path.join(self.venv, "bin", "python")):
+                return
+            if clone:
+                VenvCache().clone(self.venv, wheelhouse)
+            else:
+                self._run(sys.executable, "-m", "venv", self.venv)
+
+    def install(
+        self, name: str, venv: bool = True, options: Sequence[str] = ()
+    ) -> None:
+        """Installs requirements of a package and shared dev requirements.
+
+        Args:
+            name (str): package name
+            venv (bool): install into shared venv, current one otherwise
+            options (Sequence[str]): extra `pip install` options
+        """
+        with self._lock():
+            self._run(
+                os.path.join(self.venv, "bin", "pip") if venv else "pip",
+                "install",
+                "-r",
+                os.path.join(self.member(name), str(Template.REQUIREMENTS)),
+                "-r",
+                os.path.join(self._root, str(Template.DEV_REQUIREMENTS)),
+                *options,
+            )
+
+    def lock(self, name: str, venv: bool = True) -> None:
+        """Pins requirements of a package and shared dev requirements.
+
+        Args:
+            name (str): package name
+            venv (bool): pin versions of shared venv, current one otherwise
+        """
+        with self._lock():
+            for root in (self.member(name), self._root):  # type: str
+                lock_requirements(root, self.venv if venv else None)
+
+    def _lock(self) -> FileLock:
+        """Returns lock of a monorepo kept out of its root."""
+        digest: str = hashlib.sha256(
+            os.path.abspath(self._root).encode("utf-8")
+        ).hexdigest()
+        return FileLock(
+            os.path.join(cache_dir("monorepos"), f"{digest[:32]}.lock")
+        )
+
+    @staticmethod
+    def _run(*command: str) -> None:
+        """Runs a command raising its output on failure."""
+        process: "subprocess.CompletedProcess[bytes]" = subprocess.run(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            check=False,
+        )
+        if process.returncode:
+            raise ValueError(process.stdout.decode("utf-8", "replace"))
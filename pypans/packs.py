@@ -0,0 +1,222 @@
+"""Contains interfaces for discovering and loading template packs.
+
+A pack is a python package registered under `pypans.packs` entry point
+group. It keeps a `pack.json` manifest next to its module, which maps
+project paths to pack files and lists placeholders pack files use:
+
+    {
+        "description": "Command line application",
+        "placeholders": ["<package>", "<username>"],
+        "files": {"<package>/cli.py": "cli.py"}
+    }
+
+Discovered packs are kept in an on-disk index that is rebuilt only when
+`sys.path` directories change, e.g a distribution is installed or removed.
+"""
+import hashlib
+import importlib
+import json
+import os
+import sys
+import tempfile
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, IO, List, Optional, Sequence
+from pypans import trace
+from pypans.cache import cache_dir
+from pypans.manifest import file_sha256
+from pypans.render import Placeholder, RenderPlan, Variables
+from pypans.stage import StagedTree
+from pypans.stream import StreamedFile
+
+try:
+    from importlib import metadata
+except ImportError:  # pragma: no cover
+    import importlib_metadata as metadata  # type: ignore
+
+GROUP: str = "pypans.packs"
+PACK: str = "pack.json"
+STREAMED: int = 1024**2
+
+
+@dataclass(frozen=True)
+class Pack:
+    """Represents a template pack registered by an installed distribution.
+
+    Pack contents are not read until a pack is staged.
+    """
+
+    name: str
+    module: str
+    distribution: str
+    version: str
+
+    def directory(self) -> str:
+        """Imports pack module and returns its directory."""
+        module: Any = importlib.import_module(self.module)
+        return os.path.dirname(os.path.abspath(module.__file__))
+
+    def manifest(self) -> Dict[str, Any]:
+        """Returns validated pack manifest."""
+        with open(
+            os.path.join(self.directory(), PACK)
+        ) as file:  # type: IO[str]
+            manifest: Dict[str, Any] = json.load(file)
+        known: List[str] = [str(placeholder) for placeholder in Placeholder]
+        unknown: List[str] = [
+            placeholder
+            for placeholder in manifest.get("placeholders", ())
+            if placeholder not in known
+        ]
+        if unknown:
+            raise ValueError(
+                f"'{self.name}' pack uses unknown {unknown} placeholders, "
+                f"please use {known}"
+            )
+        return manifest
+
+    def stage(self, tree: StagedTree, variables: Variables) -> Dict[str, str]:
+        """Renders pack files into a project tree.
+
+        Files larger than `STREAMED` bytes are substituted in chunks while
+        a tree is written. Returns `sha256` of pack sources by staged paths.
+        Targets that resolve outside of a project root are rejected.
+
+        Args:
+            tree (StagedTree): project tree
+            variables (Variables): placeholder values
+        """
+        directory: str = self.directory()
+        digests: Dict[str, str] = {}
+        replacements: Dict[bytes, bytes] = {
+            str(placeholder).encode("utf-8"): value.encode("utf-8")
+            for placeholder, value in variables.items()
+        }
+        for target, source in self.manifest()["files"].items():
+            path: str = os.path.join(directory, source)
+            mode: int = 0o755 if os.access(path, os.X_OK) else 0o644
+            staged: str = os.path.normpath(
+                RenderPlan.parse(target).render(variables)
+            )
+            if os.path.isabs(staged) or staged.split(os.sep)[0] == os.pardir:
+                raise ValueError(
+                    f"'{self.name}' pack target '{target}' is outside "
+                    f"of a project root"
+                )
+            if os.path.getsize(path) > STREAMED:
+                tree.add(staged, StreamedFile(path, replacements), mode)
+                digests[staged] = file_sha256(path) or ""
+                continue
+            with open(path, "rb") as file:  # type: IO[bytes]
+                content: bytes = file.read()
+            try:
+                rendered: bytes = (
+                    RenderPlan.parse(content.decode("utf-8"))
+                    .render(variables)
+                    .encode("utf-8")
+                )
+            except UnicodeDecodeError:
+                rendered = content
+            tree.add(staged, rendered, mode)
+            digests[staged] = hashlib.sha256(content).hexdigest()
+        return digests
+
+
+class PackIndex:
+    """Represents persistent index of template packs.
+
+    Index is keyed by `sys.path` entries, and is invalidated once their
+    modification times change.
+    """
+
+    def __init__(
+        self,
+        paths: Optional[Sequence[str]] = None,
+        directory: Optional[str] = None,
+    ) -> None:
+        self._paths: List[str] = list(sys.path if paths is None else paths)
+        self._location: str = os.path.join(
+            directory or cache_dir("packs"),
+            "index-{}.json".format(
+                hashlib.sha256(
+                    os.pathsep.join(self._paths).encode("utf-8")
+                ).hexdigest()[:16]
+            ),
+        )
+        self._packs: Optional[Dict[str, Pack]] = None
+
+    def fingerprint(self) -> str:
+        """Returns hash of modification times of `sys.path` directories."""
+        digest = hashlib.sha256()
+        for path in self._paths:
+            try:
+                digest.update(f"{path}:{os.stat(path).st_mtime_ns};".encode())
+            except OSError:
+                digest.update(f"{path}:;".encode())
+        return digest.hexdigest()
+
+    def packs(self) -> Dict[str, Pack]:
+        """Returns discovered packs by name."""
+        if self._packs is None:
+            fingerprint: str = self.fingerprint()
+            try:
+                with open(self._location) as file:  # type: IO[str]
+                    index: Dict[str, Any] = json.load(file)
+            except (OSError, ValueError):
+                index = {}
+            if index.get("fingerprint") == fingerprint:
+                self._packs = {
+                    name: Pack(**pack) for name, pack in index["packs"].items()
+                }
+            else:
+                self._packs = self._scan()
+                self._save(fingerprint, self._packs)
+        return self._packs
+
+    def get(self, name: str) -> Pack:
+        """Returns a pack by its name.
+
+        Args:
+            name (str): pack name
+        """
+        packs: Dict[str, Pack] = self.packs()
+        if name not in packs:
+            raise ValueError(
+                f"Unknown '{name}' template pack, please use {sorted(packs)}"
+            )
+        return packs[name]
+
+    def _scan(self) -> Dict[str, Pack]:
+        """Scans installed distributions for pack entry points."""
+        packs: Dict[str, Pack] = {}
+        with trace.span("scan_packs") as span:
+            for distribution in metadata.distributions(path=self._paths):
+                for entry in distribution.entry_points:  # type: Any
+                    if entry.group == GROUP:
+                        packs.setdefault(
+                            entry.name,
+                            Pack(
+                                name=entry.name,
+                                module=entry.value.split(":")[0].strip(),
+                                distribution=distribution.metadata["Name"],
+                                version=distribution.version,
+                            ),
+                        )
+            span["packs"] = len(packs)
+        return packs
+
+    def _save(self, fingerprint: str, packs: Dict[str, Pack]) -> None:
+        """Writes index atomically, so concurrent readers never see a part."""
+        descriptor, path = tempfile.mkstemp(
+            dir=os.path.dirname(self._location), suffix=".tmp"
+        )
+        with os.fdopen(descriptor, "w") as file:  # type: IO[str]
+            json.dump(
+                {
+                    "fingerprint": fingerprint,
+                    "packs": {
+                        name: asdict(pack) for name, pack in packs.items()
+                    },
+                },
+                file,
+            )
+        os.replace(path, self._location)
@@ -0,0 +1,59 @@
+"""Contains template placeholder slots shared by rendering and bundling."""
+from enum import Enum
+from typing import Any, Dict, Mapping, Optional
+from pypans.file import Template
+
+
+class Placeholder(Enum):
+    """Represents a template placeholder slot."""
+
+    PACKAGE: str = "<package>"
+    USERNAME: str = "<username>"
+    EMAIL: str = "<email>"
+    YEAR: str = "<year>"
+    DATE: str = "<date>"
+    VERSION: str = "<version>"
+
+    def __str__(self) -> Any:
+        """Returns value of a placeholder."""
+        return self.value
+
+
+# some templates are valid python modules, so they can not use `<...>` syntax
+_ALIASES: Dict[Template, Dict[str, Placeholder]] = {
+    Template.SETUP: {"tooling": Placeholder.PACKAGE}
+}
+
+
+def aliases(template: Template) -> Mapping[str, Placeholder]:
+    """Returns extra tokens bound to placeholder slots of a template.
+
+    Args:
+        template (Template): given template
+    """
+    return _ALIASES.get(template, {})
+
+
+def tokens(
+    extra: Optional[Mapping[str, Placeholder]] = None
+) -> Dict[str, Placeholder]:
+    """Returns placeholder slots by tokens that are substituted with them.
+
+    Args:
+        extra (Mapping[str, Placeholder]): extra tokens bound to slots
+    """
+    bound: Dict[str, Placeholder] = {
+        placeholder.value: placeholder for placeholder in Placeholder
+    }
+    bound.update(extra or {})
+    return bound
+
+
+def has_placeholders(content: str, template: Template) -> bool:
+    """Checks if a template has anything to substitute.
+
+    Args:
+        content (str): raw template content
+        template (Template): given template
+    """
+    return any(token in content for token in tokens(aliases(template)))
@@ -1,42 +1,115 @@
 """Contains interfaces for managing python project."""
 import os
-import site
 import sys
 from abc import abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
 from punish.style import AbstractStyle
-from pypans.file import Template, replace_content, write_to_file
+from pypans import __version__, trace
+from pypans.archive import ArchiveWriter
+from pypans.assets import AssetStore
+from pypans.bundle import Bundle
+from pypans.file import Template
+from pypans.line import Line
+from pypans.manifest import FileRecord, MANIFEST, Manifest, sha256
+from pypans.monorepo import Monorepo, SHARED
+from pypans.packs import Pack
+from pypans.render import (
+    Placeholder,
+    RenderReport,
+    TemplateRenderer,
+    Variables,
+)
+from pypans.rendercache import RenderCache
+from pypans.source import TemplateSource, load
+from pypans.stage import Content, Staged, StagedTree
+from pypans.stream import StreamedFile
+
+
+_renderer: TemplateRenderer = TemplateRenderer(Bundle.load())
+
+
+def preload() -> None:
+    """Compiles render plans of all bundled templates ahead of use."""
+    _renderer.report({})
+
+
+def _stage_static_files(
+    tree: StagedTree, renderer: TemplateRenderer = _renderer
+) -> None:
+    """Stages static template files into a project tree.
+
+    Args:
+        tree (StagedTree): project tree
+        renderer (TemplateRenderer): template renderer
+    """
+    for template in Template:  # type: Template
+        if renderer.is_static(template):
+            tree.add(
+                template.value,
+                renderer.render(template, variables={}),
+                renderer.mode(template),
+                renderer.digest(template),
+            )
+
+
+def _require(tree: StagedTree, path: str, *requirements: str) -> None:
+    """Adds missing requirements to a staged requirements file.
+
+    Args:
+        tree (StagedTree): project tree
+        path (str): requirements file path
+        requirements (str): requirements to add
+    """
+    staged: Staged = tree.read(path) if path in tree else b""
+    lines: List[str] = (
+        (
+            b"".join(staged.chunks())
+            if isinstance(staged, StreamedFile)
+            else bytes(staged)
+        )
+        .decode("utf-8")
+        .splitlines()
+    )
+    tree.add(
+        path,
+        "".join(
+            f"{line}{Line.NEW}"
+            for line in (
+                *lines,
+                *(
+                    requirement
+                    for requirement in requirements
+                    if requirement not in lines
+                ),
+            )
+        ),
+    )
 
 
-class Line(Enum):
-    """Represents string line."""
+class Profile(Enum):
+    """Represents a flavour of generated tooling."""
 
-    NEW: str = "\n"
+    DEFAULT: str = "default"
+    PERF: str = "perf"
 
-    def by_(self, times: int) -> str:
-        """Multiplies line by given number.
+    def __str__(self) -> Any:
+        """Returns value of a profile."""
+        return self.value
 
-        Args:
-            times (int): a multiplier number
-        """
-        return self.value * times
 
-    def __str__(self) -> str:
-        """Returns line value."""
-        return self.value
+class Service(Enum):
+    """Represents a kind of generated web service."""
 
+    NONE: str = ""
+    WSGI: str = "wsgi"
+    ASGI: str = "asgi"
 
-def _copy_site_files_here() -> None:
-    """Copies all files from site packaging into current root location."""
-    Template.files_from(
-        from_path=os.path.join(
-            site.getsitepackages()[0],  # pylint:disable=no-member
-            os.path.dirname(__file__),
-            "template",
-        )
-    )
+    def __str__(self) -> Any:
+        """Returns value of a service kind."""
+        return self.value
 
 
 class Package(AbstractStyle):
@@ -56,84 +129,93 @@ class User(AbstractStyle):
     email: str
 
 
+@dataclass(frozen=True)
+class ProjectCaches:
+    """Represents local stores shared by projects between scaffolds."""
+
+    assets: Optional[AssetStore] = None
+    renders: Optional[RenderCache] = None
+
+
+@dataclass(frozen=True)
+class ProjectOptions:
+    """Represents optional features of a project.
+
+    Variables are taken from a previous build of a project to re-render it,
+    otherwise they are made out of a project name and user.
+    """
+
+    caches: ProjectCaches = ProjectCaches()
+    pack: Optional[Pack] = None
+    source: Optional[TemplateSource] = None
+    profile: Profile = Profile.DEFAULT
+    service: Service = Service.NONE
+    monorepo: Optional[Monorepo] = None
+    variables: Optional[Variables] = None
+
+
+def _variables(name: str, user: User) -> Dict[Placeholder, str]:
+    """Returns placeholder values of a new project.
+
+    Args:
+        name (str): project name
+        user (User): project owner
+    """
+    return {
+        Placeholder.PACKAGE: name,
+        Placeholder.USERNAME: user.name,
+        Placeholder.EMAIL: user.email,
+        Placeholder.YEAR: str(datetime.now().year),
+        Placeholder.DATE: "{:%d.%m.%Y}".format(datetime.now()),
+        Placeholder.VERSION: ".".join(map(str, sys.version_info[:3])),
+    }
+
+
 class _Meta(AbstractStyle):
     """Represents meta content builder."""
 
-    def __init__(self, name: str, user: User) -> None:
-        self._name = name
-        self._user = user
+    def __init__(
+        self,
+        tree: StagedTree,
+        variables: Variables,
+        cache: Optional[RenderCache] = None,
+        renderer: TemplateRenderer = _renderer,
+    ) -> None:
+        self._name: str = variables[Placeholder.PACKAGE]
+        self._tree: StagedTree = tree
+        self._variables: Variables = variables
+        self._cache: Optional[RenderCache] = cache
+        self._renderer: TemplateRenderer = renderer
 
     def build_analyser(self) -> None:
-        """Builds analyser file."""
-        replace_content(
-            str(Template.ANALYSER),
-            from_replace="<package>",
-            to_replace=self._name,
-        )
-        os.system(command=f"chmod a+x {Template.ANALYSER}")
+        """Builds analyser script and its concurrent runner."""
+        self._render(Template.ANALYSER)
+        self._render(Template.RUNNER)
 
     def build_readme(self) -> None:
         """Builds readme file."""
-        replace_content(
-            str(Template.README),
-            from_replace="<package>",
-            to_replace=self._name,
-        )
-        replace_content(
-            str(Template.README),
-            from_replace="<username>",
-            to_replace=self._user.name,
-        )
-        replace_content(
-            str(Template.README),
-            from_replace="<email>",
-            to_replace=self._user.email,
-        )
+        self._render(Template.README)
 
     def build_license(self) -> None:
         """Builds license file."""
-        replace_content(
-            str(Template.LICENSE),
-            from_replace="<year>",
-            to_replace=str(datetime.now().year),
-        )
-        replace_content(
-            str(Template.LICENSE),
-            from_replace="<username>",
-            to_replace=self._user.name,
-        )
+        self._render(Template.LICENSE)
 
     def build_package(self) -> None:
         """Builds packaging files."""
-        replace_content(
-            str(Template.CHANGELOG),
-            from_replace="<date>",
-            to_replace="{:%d.%m.%Y}".format(datetime.now()),
-        )
-        replace_content(
-            str(Template.MANIFEST),
-            from_replace="<package>",
-            to_replace=self._name,
-        )
-        replace_content(
-            str(Template.PYPIRC),
-            from_replace="<username>",
-            to_replace=self._user.name.lower().replace(" ", "."),
-        )
-        replace_content(
-            str(Template.SETUP), from_replace="tooling", to_replace=self._name
-        )
-        replace_content(
-            str(Template.RUNTIME),
-            from_replace="<version>",
-            to_replace=".".join(map(str, sys.version_info[:3])),
+        self._render(Template.CHANGELOG)
+        self._render(Template.MANIFEST)
+        username: str = self._variables[Placeholder.USERNAME]
+        self._render(
+            Template.PYPIRC,
+            {
+                **self._variables,
+                Placeholder.USERNAME: username.lower().replace(" ", "."),
+            },
         )
-        replace_content(
-            str(Template.PROCFILE),
-            from_replace="<package>",
-            to_replace=self._name,
-        )
-        write_to_file(
+        self._render(Template.SETUP)
+        self._render(Template.RUNTIME)
+        self._render(Template.PROCFILE)
+        self._tree.add(
             path=f"{self._name}.py",
             content=f"# flake8: noqa{Line.NEW}"
             '"""Module contains entrypoint interfaces for '
@@ -143,39 +225,42 @@ class _Meta(AbstractStyle):
 
     def build_pytest(self) -> None:
         """Builds pytest file."""
-        replace_content(
-            str(Template.PYTEST),
-            from_replace="<package>",
-            to_replace=self._name,
-        )
+        self._render(Template.PYTEST)
 
     def build_authors(self) -> None:
         """Builds authors file."""
-        replace_content(
-            str(Template.AUTHORS),
-            from_replace="<username>",
-            to_replace=self._user.name,
-        )
-        replace_content(
-            str(Template.AUTHORS),
-            from_replace="<email>",
-            to_replace=self._user.email,
-        )
+        self._render(Template.AUTHORS)
+
+    def report(self) -> RenderReport:
+        """Returns unknown and unused template placeholders."""
+        return self._renderer.report(self._variables)
+
+    def _render(
+        self, template: Template, variables: Optional[Variables] = None
+    ) -> None:
+        """Renders a template into project tree."""
+        with trace.span(template.value, "render") as span:
+            content: Content = self._renderer.render(
+                template, variables or self._variables, self._cache
+            )
+            span["bytes"] = len(content)
+        self._tree.add(template.value, content, self._renderer.mode(template))
 
 
 class _Application(Package):
     """Represents application content builder."""
 
     def __init__(
-        self, name: str, user: User
+        self, name: str, user: User, tree: StagedTree, year: str
     ) -> None:  # pylint: disable=super-init-not-called
         self._name: str = name
         self._user: User = user
+        self._tree: StagedTree = tree
+        self._year: str = year
 
     def init(self) -> None:
         """Initializes an application content."""
-        os.mkdir(self._name)
-        write_to_file(
+        self._tree.add(
             path=os.path.join(self._name, "__init__.py"),
             content=(
                 '"""Package contains a set of '
@@ -185,7 +270,7 @@ class _Application(Package):
                 f' "{self._user.email}"'
                 f'{Line.NEW}__license__: str = "MIT"{Line.NEW}'
                 f'__copyright__: str = f"Copyright '
-                f'{datetime.now().year}, {{__author__}}"{Line.NEW}'
+                f'{self._year}, {{__author__}}"{Line.NEW}'
                 f'__version__: str = "0.0.0"{Line.NEW.by_(2)}'
                 f"__all__: tuple = (){Line.NEW.by_(2)}"
                 f"app = None{Line.NEW}"
@@ -194,7 +279,7 @@ class _Application(Package):
 
     def make_as_tool(self) -> None:
         """Creates executable file."""
-        write_to_file(
+        self._tree.add(
             path=os.path.join(self._name, "__main__.py"),
             content=(
                 '"""Represents executable entrypoint '
@@ -211,15 +296,15 @@ class _Tests(Package):
     """Represents tests content builder."""
 
     def __init__(
-        self, name: str
+        self, name: str, tree: StagedTree
     ) -> None:  # pylint: disable=super-init-not-called
         self._name: str = name
+        self._tree: StagedTree = tree
         self._tests: str = self.__class__.__name__.lower()[1:]
 
     def init(self) -> None:
         """Initializes tests content."""
-        os.mkdir(self._tests)
-        write_to_file(
+        self._tree.add(
             path=os.path.join(self._tests, "__init__.py"),
             content=f'"""Package contains a set of interfaces to test '
             f'`{self._name}` application."""{Line.NEW}',
@@ -227,7 +312,7 @@ class _Tests(Package):
 
     def make_helpers(self) -> None:
         """Creates tests helpers."""
-        write_to_file(
+        self._tree.add(
             path=os.path.join(self._tests, "markers.py"),
             content=(
                 f"# flake8: noqa{Line.NEW}"
@@ -235,7 +320,7 @@ class _Tests(Package):
                 f"unit: _pytest.mark.MarkDecorator = pytest.mark.unit{Line.NEW}"
             ),
         )
-        write_to_file(
+        self._tree.add(
             path=os.path.join(self._tests, "conftest.py"),
             content=(
                 f"# flake8: noqa{Line.NEW}"
@@ -244,7 +329,7 @@ class _Tests(Package):
                 f"SubRequest{Line.NEW}import pytest{Line.NEW}"
             ),
         )
-        write_to_file(
+        self._tree.add(
             path=os.path.join(self._tests, "test_sample.py"),
             content=f"# flake8: noqa{Line.NEW}"
             f"import pytest{Line.NEW}"
@@ -254,13 +339,336 @@ class _Tests(Package):
         )
 
 
+class _Benchmarks(Package):
+    """Represents benchmarks content builder."""
+
+    def __init__(
+        self, name: str, tree: StagedTree
+    ) -> None:  # pylint: disable=super-init-not-called
+        self._name: str = name
+        self._tree: StagedTree = tree
+        self._benchmarks: str = self.__class__.__name__.lower()[1:]
+
+    def init(self) -> None:
+        """Initializes benchmarks content."""
+        self._tree.add(
+            path=os.path.join(self._benchmarks, "__init__.py"),
+            content=f'"""Package contains a set of interfaces to benchmark '
+            f'`{self._name}` application."""{Line.NEW}',
+        )
+        self._tree.add(
+            path=os.path.join(self._benchmarks, "test_sample.py"),
+            content=(
+                f"# flake8: noqa{Line.NEW}"
+                f"import pytest{Line.NEW}"
+                f"from pytest_benchmark.fixture import "
+                f"BenchmarkFixture{Line.NEW.by_(2)}"
+                f'pytestmark = pytest.mark.benchmark(group="sample")'
+                f"{Line.NEW.by_(3)}"
+                f"def test_sort(benchmark: BenchmarkFixture) -> None:{Line.NEW}"
+                f"    assert benchmark(sorted, range(1000, 0, -1))[0] == 1"
+                f"{Line.NEW}"
+            ),
+        )
+
+    def make_helpers(self) -> None:
+        """Creates profiling fixture."""
+        self._tree.add(
+            path=os.path.join(self._benchmarks, "conftest.py"),
+            content=(
+                f"# flake8: noqa{Line.NEW}"
+                f"import cProfile{Line.NEW}import os{Line.NEW}"
+                f"import pstats{Line.NEW}import tracemalloc{Line.NEW}"
+                f"from typing import IO, Iterator{Line.NEW}"
+                f"from _pytest.config.argparsing import Parser{Line.NEW}"
+                f"from _pytest.fixtures import SubRequest{Line.NEW}"
+                f"import pytest{Line.NEW.by_(2)}"
+                f'_PROFILES: str = os.path.join(".benchmarks", "profiles")'
+                f"{Line.NEW.by_(3)}"
+                f"def pytest_addoption(parser: Parser) -> None:{Line.NEW}"
+                f"    parser.addoption({Line.NEW}"
+                f'        "--profile",{Line.NEW}'
+                f'        action="store_true",{Line.NEW}'
+                f"        default=False,{Line.NEW}"
+                f'        help="Dump hot spots of every benchmark.",{Line.NEW}'
+                f"    ){Line.NEW.by_(3)}"
+                f"@pytest.fixture(autouse=True){Line.NEW}"
+                f"def profile(request: SubRequest) -> Iterator[None]:{Line.NEW}"
+                f'    """Dumps `cProfile` and `tracemalloc` hot spots of a '
+                f'test."""{Line.NEW}'
+                f'    if not request.config.getoption("profile"):{Line.NEW}'
+                f"        yield{Line.NEW}"
+                f"        return{Line.NEW}"
+                f"    profiler: cProfile.Profile = cProfile.Profile(){Line.NEW}"
+                f"    tracemalloc.start(){Line.NEW}"
+                f"    profiler.enable(){Line.NEW}"
+                f"    yield{Line.NEW}"
+                f"    profiler.disable(){Line.NEW}"
+                f"    snapshot: tracemalloc.Snapshot = "
+                f"tracemalloc.take_snapshot(){Line.NEW}"
+                f"    tracemalloc.stop(){Line.NEW}"
+                f"    os.makedirs(_PROFILES, exist_ok=True){Line.NEW}"
+                f"    path: str = os.path.join("
+                f'_PROFILES, f"{{request.node.name}}.txt"){Line.NEW}'
+                f'    with open(path, "w") as file:  # type: IO[str]{Line.NEW}'
+                f"        stats: pstats.Stats = pstats.Stats(profiler, "
+                f"stream=file){Line.NEW}"
+                f'        stats.sort_stats("cumulative").print_stats(20)'
+                f"{Line.NEW}"
+                f'        for stat in snapshot.statistics("lineno")[:10]:'
+                f"{Line.NEW}"
+                f'            file.write(f"{{stat}}\\n"){Line.NEW}'
+            ),
+        )
+
+    def make_config(self) -> None:
+        """Creates benchmarks config."""
+        self._tree.add(
+            path=os.path.join(self._benchmarks, str(Template.PYTEST)),
+            content=(
+                f"[pytest]{Line.NEW}"
+                f"python_files=*.py{Line.NEW}"
+                f"python_functions=test_*{Line.NEW}"
+                f"addopts = -rxX{Line.NEW}"
+                f"          -p no:xdist{Line.NEW}"
+                f"          -p no:warnings{Line.NEW}"
+                f"          --no-cov{Line.NEW}"
+                f"          --benchmark-only{Line.NEW}"
+                f"          --benchmark-autosave{Line.NEW}"
+                f"          --benchmark-sort=mean{Line.NEW}"
+            ),
+        )
+
+    def tune_pytest(self) -> None:
+        """Runs tests in parallel and adds benchmark requirements."""
+        self._tree.add(
+            path=str(Template.PYTEST),
+            content=(
+                f"[pytest]{Line.NEW}"
+                f"testpaths = tests/{Line.NEW}"
+                f"python_files=*.py{Line.NEW}"
+                f"python_functions=test_*{Line.NEW}"
+                f"addopts = -rxX{Line.NEW}"
+                f"          --numprocesses=auto{Line.NEW}"
+                f"          --tb=short{Line.NEW}"
+                f"          --cov={self._name}{Line.NEW}"
+                f"          -p no:warnings{Line.NEW}"
+            ),
+        )
+        _require(
+            self._tree,
+            str(Template.DEV_REQUIREMENTS),
+            "pytest-benchmark",
+            "pytest-xdist",
+        )
+
+
+def _asgi_app() -> Tuple[str, str]:
+    """Returns typing imports and content of ASGI entrypoint."""
+    return (
+        "Any, Awaitable, Callable, Dict",
+        (
+            f"async def app({Line.NEW}"
+            f"    scope: Dict[str, Any],{Line.NEW}"
+            f"    receive: Callable[[], Awaitable[Dict[str, Any]]],"
+            f"{Line.NEW}"
+            f"    send: Callable[[Dict[str, Any]], Awaitable[None]],"
+            f"{Line.NEW}"
+            f") -> None:{Line.NEW}"
+            f'    """Responds to every request with plain `ok`."""'
+            f"{Line.NEW}"
+            f'    if scope["type"] == "lifespan":{Line.NEW}'
+            f"        while True:{Line.NEW}"
+            f"            message: Dict[str, Any] = await receive()"
+            f"{Line.NEW}"
+            f'            await send({{"type": f"{{message[\'type\']}}'
+            f'.complete"}}){Line.NEW}'
+            f'            if message["type"] == "lifespan.shutdown":'
+            f"{Line.NEW}"
+            f"                return{Line.NEW}"
+            f'    if scope["type"] != "http":{Line.NEW}'
+            f"        return{Line.NEW}"
+            f"    await send({Line.NEW}"
+            f"        {{{Line.NEW}"
+            f'            "type": "http.response.start",{Line.NEW}'
+            f'            "status": 200,{Line.NEW}'
+            f'            "headers": [{Line.NEW}'
+            f'                (b"content-type", b"text/plain"),{Line.NEW}'
+            f'                (b"content-length", b"2"),{Line.NEW}'
+            f"            ],{Line.NEW}"
+            f"        }}{Line.NEW}"
+            f"    ){Line.NEW}"
+            f'    await send({{"type": "http.response.body", '
+            f'"body": b"ok"}}){Line.NEW}'
+        ),
+    )
+
+
+def _wsgi_app() -> Tuple[str, str]:
+    """Returns typing imports and content of WSGI entrypoint."""
+    return (
+        "Any, Callable, Dict, Iterable",
+        (
+            f"def app({Line.NEW}"
+            f"    environ: Dict[str, Any], "
+            f"start_response: Callable[..., Any]{Line.NEW}"
+            f") -> Iterable[bytes]:{Line.NEW}"
+            f'    """Responds to every request with plain `ok`."""'
+            f"{Line.NEW}"
+            f"    start_response({Line.NEW}"
+            f'        "200 OK",{Line.NEW}'
+            f'        [("Content-Type", "text/plain"), '
+            f'("Content-Length", "2")],{Line.NEW}'
+            f"    ){Line.NEW}"
+            f'    return (b"ok",){Line.NEW}'
+        ),
+    )
+
+
+def _gunicorn_config(name: str, asgi: bool) -> str:
+    """Returns `gunicorn` config of a service.
+
+    Args:
+        name (str): service name
+        asgi (bool): whether a service is ASGI one
+    """
+    return (
+        f'"""Contains `gunicorn` settings of `{name}` '
+        f'service."""{Line.NEW}'
+        f"import multiprocessing{Line.NEW}import os{Line.NEW.by_(2)}"
+        f"_CORES: int = multiprocessing.cpu_count(){Line.NEW.by_(2)}"
+        f"bind: str = os.environ.get({Line.NEW}"
+        f'    "GUNICORN_BIND", f"0.0.0.0:'
+        f'{{os.environ.get(\'PORT\', 8000)}}"{Line.NEW}'
+        f"){Line.NEW}"
+        f'workers: int = int(os.environ.get("WEB_CONCURRENCY", '
+        f'{"_CORES" if asgi else "_CORES * 2 + 1"})){Line.NEW}'
+        f"threads: int = int(os.environ.get("
+        f'"GUNICORN_THREADS", {1 if asgi else 2})){Line.NEW}'
+        f"worker_class: str = os.environ.get({Line.NEW}"
+        f'    "GUNICORN_WORKER_CLASS", '
+        f'"{"uvicorn.workers.UvicornWorker" if asgi else "gthread"}"'
+        f"{Line.NEW}){Line.NEW}"
+        f'preload_app: bool = os.environ.get("GUNICORN_PRELOAD", '
+        f'"1") == "1"{Line.NEW}'
+        f'keepalive: int = int(os.environ.get("GUNICORN_KEEPALIVE", '
+        f"5)){Line.NEW}"
+        f"max_requests: int = int(os.environ.get("
+        f'"GUNICORN_MAX_REQUESTS", 10000)){Line.NEW}'
+        f"max_requests_jitter: int = max_requests // 10{Line.NEW}"
+        f'timeout: int = int(os.environ.get("GUNICORN_TIMEOUT", 30))'
+        f"{Line.NEW}"
+        f"graceful_timeout: int = timeout{Line.NEW}"
+        f'accesslog: str = "-"{Line.NEW}'
+    )
+
+
+class _Service(Package):
+    """Represents web service content builder."""
+
+    def __init__(
+        self, name: str, tree: StagedTree, kind: Service
+    ) -> None:  # pylint: disable=super-init-not-called
+        self._name: str = name
+        self._tree: StagedTree = tree
+        self._kind: Service = kind
+
+    def init(self) -> None:
+        """Initializes service entrypoint."""
+        imports, content = (
+            _asgi_app() if self._kind is Service.ASGI else _wsgi_app()
+        )
+        self._tree.add(
+            path=os.path.join(self._name, "app.py"),
+            content=(
+                f'"""Contains {str(self._kind).upper()} entrypoint of '
+                f'`{self._name}` service."""{Line.NEW}'
+                f"from typing import {imports}{Line.NEW.by_(3)}"
+                f"{content}"
+            ),
+        )
+
+    def make_config(self) -> None:
+        """Creates tuned `gunicorn` config and points `Procfile` to it.
+
+        Every setting can be overridden with an environment variable.
+        """
+        asgi: bool = self._kind is Service.ASGI
+        self._tree.add(
+            path="gunicorn.conf.py", content=_gunicorn_config(self._name, asgi)
+        )
+        self._tree.add(
+            path=str(Template.PROCFILE),
+            content=(
+                f"web: gunicorn --config gunicorn.conf.py "
+                f"{self._name}.app:app{Line.NEW}"
+            ),
+        )
+        _require(
+            self._tree,
+            str(Template.REQUIREMENTS),
+            "gunicorn",
+            *(("uvicorn",) if asgi else ()),
+        )
+
+    def make_load_test(self) -> None:
+        """Creates `locust` load test against a local service."""
+        self._tree.add(
+            path="locustfile.py",
+            content=(
+                f'"""Contains load test of `{self._name}` service.'
+                f"{Line.NEW.by_(2)}"
+                f"Please run a service and a test locally:{Line.NEW.by_(2)}"
+                f"    gunicorn --config gunicorn.conf.py {self._name}.app:app"
+                f"{Line.NEW}"
+                f"    locust --headless -u 100 -r 20 -t 1m "
+                f"-H http://localhost:8000{Line.NEW}"
+                f'"""{Line.NEW}'
+                f"from locust import HttpUser, constant, task"
+                f"{Line.NEW.by_(3)}"
+                f"class ServiceUser(HttpUser):{Line.NEW}"
+                f'    """Represents a client sending requests without '
+                f'pauses."""{Line.NEW.by_(2)}'
+                f"    wait_time = constant(0){Line.NEW.by_(2)}"
+                f"    @task{Line.NEW}"
+                f"    def index(self) -> None:{Line.NEW}"
+                f'        """Requests service root."""{Line.NEW}'
+                f'        self.client.get("/"){Line.NEW}'
+            ),
+        )
+        _require(self._tree, str(Template.DEV_REQUIREMENTS), "locust")
+
+
 class _Builder(AbstractStyle):
     """Represents project builder."""
 
-    def __init__(self, name: str, user: User) -> None:
-        self._app: _Application = _Application(name, user)
-        self._tests: _Tests = _Tests(name)
-        self._meta: _Meta = _Meta(name, user)
+    def __init__(
+        self,
+        user: User,
+        tree: StagedTree,
+        variables: Variables,
+        options: ProjectOptions,
+    ) -> None:
+        name: str = variables[Placeholder.PACKAGE]
+        self._renderer: TemplateRenderer = (
+            TemplateRenderer(load(str(options.source)))
+            if options.source
+            else _renderer
+        )
+        self._app: _Application = _Application(
+            name, user, tree, variables[Placeholder.YEAR]
+        )
+        self._tests: _Tests = _Tests(name, tree)
+        self._benchmarks: _Benchmarks = _Benchmarks(name, tree)
+        self._service: _Service = _Service(name, tree, options.service)
+        self._meta: _Meta = _Meta(
+            tree, variables, options.caches.renders, self._renderer
+        )
+
+    @property
+    def renderer(self) -> TemplateRenderer:
+        """Returns template renderer."""
+        return self._renderer
 
     @property
     def app(self) -> _Application:
@@ -272,6 +680,16 @@ class _Builder(AbstractStyle):
         """Returns tests builder."""
         return self._tests
 
+    @property
+    def benchmarks(self) -> _Benchmarks:
+        """Returns benchmarks builder."""
+        return self._benchmarks
+
+    @property
+    def service(self) -> _Service:
+        """Returns web service builder."""
+        return self._service
+
     @property
     def meta(self) -> _Meta:
         """Returns meta builder."""
@@ -281,25 +699,188 @@ class _Builder(AbstractStyle):
 class Project(AbstractStyle):
     """Represents a project."""
 
-    def __init__(self, name: str, user: User) -> None:
-        self._builder: _Builder = _Builder(name, user)
+    def __init__(
+        self,
+        name: str,
+        user: User,
+        root: str = ".",
+        options: ProjectOptions = ProjectOptions(),
+    ) -> None:
+        self._root: str = root
+        self._options: ProjectOptions = options
+        self._tree: StagedTree = StagedTree(options.caches.assets)
+        self._shared: StagedTree = StagedTree()
+        self._variables: Variables = options.variables or _variables(name, user)
+        self._sources: Dict[str, str] = {}
+        self._builder: _Builder = _Builder(
+            user, self._tree, self._variables, options
+        )
+
+    @property
+    def name(self) -> str:
+        """Returns project name."""
+        return self._variables[Placeholder.PACKAGE]
+
+    @property
+    def tree(self) -> StagedTree:
+        """Returns staged project files."""
+        return self._tree
+
+    def manifest(self) -> Manifest:
+        """Returns template and output hashes of staged project files."""
+        digests: Dict[str, str] = {
+            template.value: self._builder.renderer.digest(template)
+            for template in Template
+            if template.value in self._tree
+        }
+        digests.update(self._sources)
+        return Manifest(
+            version=__version__,
+            variables={
+                str(placeholder): value
+                for placeholder, value in self._variables.items()
+            },
+            files={
+                path: FileRecord(
+                    template=digests.get(path, ""),
+                    output=sha256(self._tree.read(path)),
+                )
+                for path in self._tree
+                if path != MANIFEST
+            },
+            pack=self._options.pack.name if self._options.pack else "",
+            source=str(self._options.source) if self._options.source else "",
+            profile=str(self._options.profile),
+            service=str(self._options.service),
+            monorepo=bool(self._options.monorepo),
+        )
 
     def build_package(self) -> None:
         """Builds an application package."""
-        self._builder.app.init()
-        self._builder.app.make_as_tool()
+        with trace.span("build_package") as span:
+            staged: int = len(self._tree)
+            self._builder.app.init()
+            self._builder.app.make_as_tool()
+            span["files"] = len(self._tree) - staged
 
     def build_tests(self) -> None:
         """Builds tests package."""
-        self._builder.tests.init()
-        self._builder.tests.make_helpers()
+        with trace.span("build_tests") as span:
+            staged: int = len(self._tree)
+            self._builder.tests.init()
+            self._builder.tests.make_helpers()
+            span["files"] = len(self._tree) - staged
 
     def build_meta(self) -> None:
         """Builds meta files."""
-        _copy_site_files_here()
-        self._builder.meta.build_analyser()
-        self._builder.meta.build_authors()
-        self._builder.meta.build_license()
-        self._builder.meta.build_package()
-        self._builder.meta.build_pytest()
-        self._builder.meta.build_readme()
+        with trace.span("build_meta") as span:
+            staged: int = len(self._tree)
+            with trace.span("static_files"):
+                _stage_static_files(self._tree, self._builder.renderer)
+            self._builder.meta.build_analyser()
+            self._builder.meta.build_authors()
+            self._builder.meta.build_license()
+            self._builder.meta.build_package()
+            self._builder.meta.build_pytest()
+            self._builder.meta.build_readme()
+            span["files"] = len(self._tree) - staged
+
+    def build_pack(self) -> None:
+        """Builds files of a template pack over default ones."""
+        if self._options.pack:
+            with trace.span("build_pack", pack=self._options.pack.name) as span:
+                self._sources.update(
+                    self._options.pack.stage(self._tree, self._variables)
+                )
+                span["files"] = len(self._sources)
+
+    def build_profile(self) -> None:
+        """Builds tooling of a chosen profile over default one."""
+        if self._options.profile is Profile.PERF:
+            with trace.span(
+                "build_profile", profile=str(self._options.profile)
+            ):
+                self._builder.benchmarks.init()
+                self._builder.benchmarks.make_helpers()
+                self._builder.benchmarks.make_config()
+                self._builder.benchmarks.tune_pytest()
+
+    def build_service(self) -> None:
+        """Builds tuned web service entrypoint, config and load test."""
+        if self._options.service is not Service.NONE:
+            with trace.span("build_service", kind=str(self._options.service)):
+                self._builder.service.init()
+                self._builder.service.make_config()
+                self._builder.service.make_load_test()
+
+    def build_monorepo(self) -> None:
+        """Moves files shared by monorepo packages out of a project tree.
+
+        Shared analyser runner checks every member of a monorepo, so it is
+        rendered without a package name.
+        """
+        if self._options.monorepo:
+            with trace.span("build_monorepo", root=self._options.monorepo.root):
+                for template in SHARED:  # type: Template
+                    if template.value in self._tree:
+                        self._shared.add(
+                            template.value,
+                            self._tree.read(template.value),
+                            self._tree.mode(template.value),
+                        )
+                        self._tree.remove(template.value)
+                self._shared.add(
+                    Template.RUNNER.value,
+                    self._builder.renderer.render(
+                        Template.RUNNER,
+                        {**self._variables, Placeholder.PACKAGE: ""},
+                    ),
+                    self._builder.renderer.mode(Template.RUNNER),
+                )
+
+    def build(self) -> None:
+        """Builds all project files."""
+        self.build_package()
+        self.build_tests()
+        self.build_meta()
+        self.build_pack()
+        self.build_profile()
+        self.build_service()
+        self.build_monorepo()
+
+    def commit(self) -> None:
+        """Writes staged project files and their manifest atomically.
+
+        Shared files of a monorepo package are added into its root first.
+        Render cache stats of a project are saved afterwards.
+        """
+        with trace.span("commit", root=self._root) as span:
+            if self._options.monorepo:
+                self._options.monorepo.adopt(self.name, self._shared)
+            self._tree.add(MANIFEST, self.manifest().dumps())
+            self._tree.commit(self._root)
+            span["files"] = len(self._tree)
+            if trace.enabled():
+                span["bytes"] = self._tree.size()
+        if self._options.caches.renders:
+            self._options.caches.renders.save_stats()
+
+    def archive(self, writer: ArchiveWriter, prefix: str = "") -> None:
+        """Writes staged project files and their manifest into an archive.
+
+        Nothing is written into a project root.
+
+        Args:
+            writer (ArchiveWriter): archive writer
+            prefix (str): archive directory to put project files into
+        """
+        with trace.span("archive", prefix=prefix) as span:
+            self._tree.add(MANIFEST, self.manifest().dumps())
+            writer.add_tree(self._tree, prefix)
+            span["files"] = len(self._tree)
+        if self._options.caches.renders:
+            self._options.caches.renders.save_stats()
+
+    def report(self) -> RenderReport:
+        """Returns unknown and unused template placeholders."""
+        return self._builder.meta.report()
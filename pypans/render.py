@@ -0,0 +1,192 @@
+"""Contains interfaces for rendering project templates."""
+import re
+from dataclasses import dataclass
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+)
+from pypans.bundle import Bundle
+from pypans.file import Template
+from pypans.placeholder import Placeholder, aliases, tokens
+from pypans.rendercache import RenderCache
+from pypans.stage import Content
+
+_UNKNOWN: Pattern[str] = re.compile(r"<[a-z][a-z_]*>")
+
+
+Variables = Mapping[Placeholder, str]
+_Segment = Tuple[str, Optional[Placeholder]]
+
+
+class RenderPlan:
+    """Represents a precompiled template made of literals and slots."""
+
+    def __init__(
+        self, segments: Tuple[_Segment, ...], unknown: FrozenSet[str]
+    ) -> None:
+        self._segments: Tuple[_Segment, ...] = segments
+        self._unknown: FrozenSet[str] = unknown
+
+    @classmethod
+    def parse(
+        cls, content: str, extra: Optional[Mapping[str, Placeholder]] = None
+    ) -> "RenderPlan":
+        """Parses template content into a render plan.
+
+        Args:
+            content (str): raw template content
+            extra (Mapping[str, Placeholder]): extra tokens bound to slots
+        """
+        bound: Dict[str, Placeholder] = tokens(extra)
+        pattern: Pattern[str] = re.compile(
+            "|".join(map(re.escape, sorted(bound, key=len, reverse=True)))
+        )
+        segments: List[_Segment] = []
+        position: int = 0
+        for match in pattern.finditer(content):
+            start, end = match.span()
+            segments.append((content[position:start], bound[match.group()]))
+            position = end
+        segments.append((content[position:], None))
+        return cls(
+            tuple(segments),
+            frozenset(_UNKNOWN.findall(content)) - set(bound),
+        )
+
+    @property
+    def placeholders(self) -> FrozenSet[Placeholder]:
+        """Returns placeholders used by a template."""
+        return frozenset(slot for _, slot in self._segments if slot)
+
+    @property
+    def unknown(self) -> FrozenSet[str]:
+        """Returns placeholder-like tokens that are not supported."""
+        return self._unknown
+
+    @property
+    def is_static(self) -> bool:
+        """Checks if a template has nothing to substitute."""
+        return not self.placeholders
+
+    def render(self, variables: Variables) -> str:
+        """Renders a template with given variables.
+
+        Args:
+            variables (Variables): placeholder values
+        """
+        return "".join(
+            f"{literal}{variables[slot]}" if slot else literal
+            for literal, slot in self._segments
+        )
+
+
+@dataclass(frozen=True)
+class RenderReport:
+    """Represents placeholders that could not be matched."""
+
+    unknown: FrozenSet[str]
+    unused: FrozenSet[Placeholder]
+
+    def __bool__(self) -> bool:
+        """Checks if a report contains any issue."""
+        return bool(self.unknown or self.unused)
+
+
+class TemplateRenderer:
+    """Represents renderer that compiles each template only once."""
+
+    def __init__(self, bundle: Bundle) -> None:
+        self._bundle: Bundle = bundle
+        self._plans: Dict[Template, RenderPlan] = {}
+
+    def plan(self, template: Template) -> RenderPlan:
+        """Returns compiled render plan of a template.
+
+        Args:
+            template (Template): given template
+        """
+        if template not in self._plans:
+            try:
+                plan: RenderPlan = RenderPlan.parse(
+                    str(self._bundle.read(template.value), "utf-8"),
+                    aliases(template),
+                )
+            except UnicodeDecodeError:
+                plan = RenderPlan((), frozenset())
+            self._plans[template] = plan
+        return self._plans[template]
+
+    def is_static(self, template: Template) -> bool:
+        """Checks if a template has nothing to substitute.
+
+        Args:
+            template (Template): given template
+        """
+        return not self._bundle.entry(template.value).placeholders
+
+    def mode(self, template: Template) -> int:
+        """Returns file permissions of a template.
+
+        Args:
+            template (Template): given template
+        """
+        return self._bundle.entry(template.value).mode
+
+    def digest(self, template: Template) -> str:
+        """Returns `sha256` of a template source.
+
+        Args:
+            template (Template): given template
+        """
+        return self._bundle.entry(template.value).sha256
+
+    def render(
+        self,
+        template: Template,
+        variables: Variables,
+        cache: Optional[RenderCache] = None,
+    ) -> Content:
+        """Returns rendered content of a template.
+
+        Static templates are served as zero-copy slices of a bundle, and
+        dynamic ones are looked up in a render cache if it is given.
+
+        Args:
+            template (Template): given template
+            variables (Variables): placeholder values
+            cache (RenderCache): cache of rendered templates
+        """
+        if self.is_static(template):
+            return self._bundle.read(template.value)
+        if cache is None:
+            return self.plan(template).render(variables).encode("utf-8")
+        key: str = cache.key(self.digest(template), variables)
+        content: Optional[bytes] = cache.get(key)
+        if content is None:
+            content = self.plan(template).render(variables).encode("utf-8")
+            cache.put(key, content)
+        return content
+
+    def report(
+        self, variables: Variables, templates: Iterable[Template] = Template
+    ) -> RenderReport:
+        """Returns unknown and unused placeholders of given templates.
+
+        Args:
+            variables (Variables): placeholder values
+            templates (Iterable[Template]): templates to inspect
+        """
+        unknown: Set[str] = set()
+        used: Set[Placeholder] = set()
+        for template in templates:  # type: Template
+            plan: RenderPlan = self.plan(template)
+            unknown.update(plan.unknown)
+            used.update(plan.placeholders)
+        return RenderReport(frozenset(unknown), frozenset(variables) - used)
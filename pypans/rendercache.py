@@ -0,0 +1,203 @@
+"""Contains interfaces for caching rendered templates between runs."""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import Any, IO, List, Mapping, Optional, Tuple
+from pypans.cache import FileLock, cache_dir, evict
+
+_LIMIT: int = 64 * 1024**2
+_LOCK: str = ".lock"
+_STATS: str = "stats.json"
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Represents usage of a render cache."""
+
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+    size: int = 0
+
+    def __str__(self) -> str:
+        """Returns human readable stats."""
+        return (
+            f"{self.hits} hits, {self.misses} misses, "
+            f"{self.entries} entries, {self.size / 1024:.1f} KiB"
+        )
+
+
+class RenderCache:
+    """Represents on-disk cache of rendered templates.
+
+    Entries are keyed by a template hash and all variables, including the
+    time-dependent ones, and are written atomically so parallel processes
+    can share a cache. Least recently used entries are evicted once a size
+    cap is hit.
+    """
+
+    def __init__(
+        self, directory: Optional[str] = None, limit: int = _LIMIT
+    ) -> None:
+        self._directory: str = directory or cache_dir("renders")
+        self._limit: int = limit
+        self._written: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def key(digest: str, variables: Mapping[Any, str]) -> str:
+        """Returns cache key of a rendered template.
+
+        Args:
+            digest (str): `sha256` of a template source
+            variables (Mapping): placeholder values
+        """
+        return hashlib.sha256(
+            json.dumps(
+                [
+                    digest,
+                    sorted(
+                        (str(name), value) for name, value in variables.items()
+                    ),
+                ],
+                separators=(",", ":"),
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns cached content, `None` on a miss.
+
+        Args:
+            key (str): cache key
+        """
+        path: str = self._path(key)
+        try:
+            with open(path, "rb") as file:  # type: IO[bytes]
+                content: bytes = file.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return content
+
+    def put(self, key: str, content: bytes) -> None:
+        """Stores rendered content.
+
+        Args:
+            key (str): cache key
+            content (bytes): rendered content
+        """
+        path: str = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(
+            dir=os.path.dirname(path), suffix=".tmp"
+        )
+        with os.fdopen(descriptor, "wb") as file:  # type: IO[bytes]
+            file.write(content)
+        os.replace(temporary, path)
+        self._written += len(content)
+        if self._written > self._limit // 8:
+            self._written = 0
+            self.evict()
+
+    def evict(self) -> int:
+        """Removes least recently used entries above a size cap.
+
+        Eviction is skipped while another process is evicting.
+        """
+        lock: FileLock = FileLock(os.path.join(self._directory, _LOCK))
+        if not lock.acquire(blocking=False):
+            return 0
+        try:
+            entries: List[Tuple[float, str, int]] = self._entries()
+            return evict(
+                {path: size for _, path, size in sorted(entries)},
+                self._limit,
+                _remove,
+            )
+        finally:
+            lock.release()
+
+    def save_stats(self) -> None:
+        """Adds hits and misses of current process to persistent stats."""
+        with FileLock(os.path.join(self._directory, _LOCK)):
+            stats: CacheStats = self._load_stats()
+            with open(
+                os.path.join(self._directory, _STATS), "w"
+            ) as file:  # type: IO[str]
+                json.dump(
+                    {
+                        "hits": stats.hits + self.hits,
+                        "misses": stats.misses + self.misses,
+                    },
+                    file,
+                )
+        self.hits = self.misses = 0
+
+    def stats(self) -> CacheStats:
+        """Returns persistent stats along with current cache size."""
+        entries: List[Tuple[float, str, int]] = self._entries()
+        stats: CacheStats = self._load_stats()
+        return CacheStats(
+            hits=stats.hits,
+            misses=stats.misses,
+            entries=len(entries),
+            size=sum(size for _, _, size in entries),
+        )
+
+    def clear(self) -> None:
+        """Removes all entries and stats."""
+        with FileLock(os.path.join(self._directory, _LOCK)):
+            for name in os.listdir(self._directory):
+                if name != _LOCK:
+                    path: str = os.path.join(self._directory, name)
+                    if os.path.isdir(path):
+                        shutil.rmtree(path, ignore_errors=True)
+                    else:
+                        os.remove(path)
+
+    def _path(self, key: str) -> str:
+        """Returns location of a cache entry."""
+        return os.path.join(self._directory, key[:2], key[2:])
+
+    def _entries(self) -> List[Tuple[float, str, int]]:
+        """Returns last use time, location and size of all entries."""
+        entries: List[Tuple[float, str, int]] = []
+        for shard in os.scandir(self._directory):
+            if shard.is_dir():
+                for entry in os.scandir(shard.path):
+                    if entry.name.endswith(".tmp"):
+                        continue
+                    try:
+                        stat: os.stat_result = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def _load_stats(self) -> CacheStats:
+        """Returns persistent hits and misses."""
+        try:
+            with open(
+                os.path.join(self._directory, _STATS)
+            ) as file:  # type: IO[str]
+                return CacheStats(**json.load(file))
+        except (OSError, ValueError):
+            return CacheStats()
+
+
+def _remove(path: str) -> bool:
+    """Removes a cache entry unless it is already removed by others."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
@@ -0,0 +1,246 @@
+"""Contains interfaces for writing `git` repositories without `git` itself.
+
+Loose objects of staged files, their trees and an initial commit are
+written right into `.git` along with `HEAD`, `config` and an index, so a
+scaffolded project is a clean `git` working tree without any subprocess.
+"""
+import hashlib
+import os
+import struct
+import time
+import zlib
+from typing import Dict, IO, Iterator, List, Tuple
+from pypans.stage import StagedTree
+from pypans.stream import CHUNK, StreamedFile
+
+_DIRECTORY: str = "40000"
+_LEVEL: int = 1
+_ENTRY: struct.Struct = struct.Struct(">10I20sH")
+_BRANCH: str = "master"
+_MESSAGE: str = "Initial commit"
+
+
+class _Node:
+    """Represents a directory of a tree being written."""
+
+    def __init__(self) -> None:
+        self.directories: Dict[str, "_Node"] = {}
+        self.files: Dict[str, str] = {}
+
+
+def _quote(value: str) -> str:
+    """Returns quoted `git` config value.
+
+    Args:
+        value (str): raw config value
+    """
+    escaped: str = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _timezone(timestamp: int) -> str:
+    """Returns local UTC offset as `git` formats it, e.g `+0200`.
+
+    Args:
+        timestamp (int): seconds since epoch
+    """
+    offset: int = time.localtime(timestamp).tm_gmtoff // 60
+    sign: str = "-" if offset < 0 else "+"
+    return f"{sign}{abs(offset) // 60:02d}{abs(offset) % 60:02d}"
+
+
+class Repository:
+    """Represents `git` repository of a project root."""
+
+    def __init__(self, root: str) -> None:
+        self._root: str = root
+        self._git: str = os.path.join(root, ".git")
+        self._blobs: Dict[str, str] = {}
+
+    def write_object(self, kind: str, content: bytes) -> str:
+        """Writes loose object unless it exists and returns its id.
+
+        Args:
+            kind (str): object type, e.g `blob`, `tree` or `commit`
+            content (bytes): object content
+        """
+        return self._write(kind, len(content), iter((content,)))
+
+    def write_tree(self, tree: StagedTree) -> str:
+        """Writes blobs and nested trees of staged files.
+
+        Streamed files are hashed from their written copies in chunks.
+        Returns id of a root tree.
+
+        Args:
+            tree (StagedTree): committed project tree
+        """
+        root: _Node = _Node()
+        for path in tree:  # type: str
+            content = tree.read(path)
+            if isinstance(content, StreamedFile):
+                location: str = os.path.join(self._root, path)
+                blob: str = self._write(
+                    "blob", os.path.getsize(location), _chunks(location)
+                )
+            else:
+                blob = self.write_object("blob", bytes(content))
+            self._blobs[path] = blob
+            node: _Node = root
+            *parents, name = path.split(os.sep)
+            for parent in parents:  # type: str
+                node = node.directories.setdefault(parent, _Node())
+            node.files[name] = f"{_mode(tree.mode(path)):o} {blob}"
+        return self._tree(root)
+
+    def commit(self, tree: str, name: str, email: str, message: str) -> str:
+        """Writes a root commit of a tree and returns its id.
+
+        Args:
+            tree (str): root tree id
+            name (str): author name
+            email (str): author email
+            message (str): commit message
+        """
+        timestamp: int = int(time.time())
+        signature: str = f"{name} <{email}> {timestamp} {_timezone(timestamp)}"
+        return self.write_object(
+            "commit",
+            (
+                f"tree {tree}\nauthor {signature}\n"
+                f"committer {signature}\n\n{message}\n"
+            ).encode("utf-8"),
+        )
+
+    def init(
+        self,
+        tree: StagedTree,
+        name: str,
+        email: str,
+        remote: str = "",
+    ) -> str:
+        """Initializes a repository with an initial commit of staged files.
+
+        Returns id of an initial commit.
+
+        Args:
+            tree (StagedTree): committed project tree
+            name (str): user name
+            email (str): user email
+            remote (str): `origin` remote url, skipped when empty
+        """
+        if os.path.exists(self._git):
+            raise ValueError(f"'{self._root}' is already a `git` repository!")
+        for directory in ("objects", "refs/heads", "refs/tags"):
+            os.makedirs(os.path.join(self._git, directory), exist_ok=True)
+        commit: str = self.commit(self.write_tree(tree), name, email, _MESSAGE)
+        self._text(f"refs/heads/{_BRANCH}", f"{commit}\n")
+        self._text("HEAD", f"ref: refs/heads/{_BRANCH}\n")
+        config: List[str] = [
+            "[core]",
+            "\trepositoryformatversion = 0",
+            "\tfilemode = true",
+            "\tbare = false",
+            "\tlogallrefupdates = true",
+            "[user]",
+            f"\tname = {_quote(name)}",
+            f"\temail = {_quote(email)}",
+        ]
+        if remote:
+            config += [
+                '[remote "origin"]',
+                f"\turl = {_quote(remote)}",
+                "\tfetch = +refs/heads/*:refs/remotes/origin/*",
+            ]
+        self._text("config", "\n".join(config) + "\n")
+        self._index(tree)
+        return commit
+
+    def _write(self, kind: str, size: int, chunks: Iterator[bytes]) -> str:
+        """Compresses and writes an object from its content chunks."""
+        digest = hashlib.sha1(f"{kind} {size}\0".encode())
+        compressor = zlib.compressobj(_LEVEL)
+        parts: List[bytes] = [compressor.compress(f"{kind} {size}\0".encode())]
+        for chunk in chunks:
+            digest.update(chunk)
+            parts.append(compressor.compress(chunk))
+        parts.append(compressor.flush())
+        sha: str = digest.hexdigest()
+        path: str = os.path.join(self._git, "objects", sha[:2], sha[2:])
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as file:  # type: IO[bytes]
+                file.write(b"".join(parts))
+            os.chmod(path, 0o444)
+        return sha
+
+    def _tree(self, node: _Node) -> str:
+        """Writes a tree and its subtrees and returns its id."""
+        entries: List[Tuple[str, bytes]] = []
+        for name, directory in node.directories.items():
+            sha: str = self._tree(directory)
+            entries.append(
+                (
+                    f"{name}/",
+                    f"{_DIRECTORY} {name}\0".encode() + bytes.fromhex(sha),
+                )
+            )
+        for name, record in node.files.items():
+            mode, sha = record.split()
+            entries.append(
+                (name, f"{mode} {name}\0".encode() + bytes.fromhex(sha))
+            )
+        return self.write_object(
+            "tree", b"".join(entry for _, entry in sorted(entries))
+        )
+
+    def _index(self, tree: StagedTree) -> None:
+        """Writes an index of files written into a working tree.
+
+        File stats are recorded, so `git status` does not re-hash them.
+        """
+        entries: List[bytes] = []
+        paths: List[Tuple[bytes, str]] = sorted(
+            (path.replace(os.sep, "/").encode("utf-8"), path) for path in tree
+        )
+        for name, path in paths:
+            stat: os.stat_result = os.stat(os.path.join(self._root, path))
+            entry: bytes = _ENTRY.pack(
+                int(stat.st_ctime) & 0xFFFFFFFF,
+                stat.st_ctime_ns % 10**9,
+                int(stat.st_mtime) & 0xFFFFFFFF,
+                stat.st_mtime_ns % 10**9,
+                stat.st_dev & 0xFFFFFFFF,
+                stat.st_ino & 0xFFFFFFFF,
+                _mode(tree.mode(path)),
+                stat.st_uid & 0xFFFFFFFF,
+                stat.st_gid & 0xFFFFFFFF,
+                stat.st_size & 0xFFFFFFFF,
+                bytes.fromhex(self._blobs[path]),
+                min(len(name), 0xFFF),
+            )
+            entry += name
+            entries.append(entry + b"\0" * (8 - len(entry) % 8))
+        content: bytes = b"".join(
+            [b"DIRC", struct.pack(">II", 2, len(entries)), *entries]
+        )
+        with open(
+            os.path.join(self._git, "index"), "wb"
+        ) as file:  # type: IO[bytes]
+            file.write(content + hashlib.sha1(content).digest())
+
+    def _text(self, path: str, content: str) -> None:
+        """Writes a text file inside of `.git` directory."""
+        with open(os.path.join(self._git, path), "w") as file:  # type: IO[str]
+            file.write(content)
+
+
+def _mode(mode: int) -> int:
+    """Returns `git` mode of a regular file."""
+    return 0o100755 if mode & 0o111 else 0o100644
+
+
+def _chunks(path: str) -> Iterator[bytes]:
+    """Yields file content chunk by chunk."""
+    with open(path, "rb") as file:  # type: IO[bytes]
+        yield from iter(lambda: file.read(CHUNK), b"")
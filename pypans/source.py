@@ -0,0 +1,311 @@
+"""Contains interfaces for loading templates from local or `git` sources.
+
+A source is either a local directory or a `git` repository at a revision:
+
+    ~/company/templates
+    /srv/git/templates.git@main
+    git@github.com:company/templates.git@v1.2
+
+Files of a `git` revision are kept in a content-addressed asset store, so
+revisions share unchanged files. A snapshot of a revision is keyed by its
+commit hash, thus repeat scaffolds from a known commit skip any fetch or
+checkout. Templates missing in a source are taken from `pypan` bundle.
+"""
+import functools
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, IO, List, Optional, Pattern, Set, Tuple
+from pypans import trace
+from pypans.assets import AssetStore
+from pypans.bundle import Bundle, pack_files
+from pypans.cache import FileLock, cache_dir
+from pypans.file import Template
+
+_COMMIT: Pattern[str] = re.compile(r"^[0-9a-f]{40}$")
+_FILES: Tuple[str, ...] = ("100644", "100755")
+
+
+def _git(*arguments: str, stdin: bytes = b"") -> bytes:
+    """Runs `git` command and returns its output.
+
+    Args:
+        arguments (str): `git` arguments
+        stdin (bytes): command input
+    """
+    try:
+        return subprocess.run(
+            ("git", *arguments),
+            input=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        ).stdout
+    except subprocess.CalledProcessError as error:
+        raise ValueError(
+            f"`git {arguments[0]}` failed: "
+            f"{error.stderr.decode('utf-8', 'replace').strip()}"
+        )
+
+
+class GitCache:
+    """Represents local cache of `git` template revisions.
+
+    Every repository is fetched into its own bare mirror. File contents are
+    stored by `sha256` in an asset store, and `git` blob ids are linked to
+    those hashes, so blobs already seen in other revisions are never read.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        assets: Optional[AssetStore] = None,
+    ) -> None:
+        self._directory: str = directory or cache_dir("sources")
+        self._assets: AssetStore = assets or AssetStore(
+            os.path.join(self._directory, "objects")
+        )
+
+    @staticmethod
+    def resolve(url: str, revision: str) -> str:
+        """Returns commit hash of a revision.
+
+        Full commit hashes are returned as is without contacting a remote.
+
+        Args:
+            url (str): repository location
+            revision (str): branch, tag or commit hash
+        """
+        if _COMMIT.match(revision):
+            return revision
+        refs: Dict[str, str] = {}
+        for line in _git("ls-remote", url, revision).decode().splitlines():
+            commit, ref = line.split("\t")
+            refs[ref] = commit
+        for ref, commit in sorted(refs.items(), key=_peeled_first):
+            return commit
+        raise ValueError(f"Unknown '{revision}' revision in '{url}'")
+
+    def snapshot(self, url: str, revision: str) -> Dict[str, Tuple[str, int]]:
+        """Returns `sha256` and mode of all files of a revision by path.
+
+        Args:
+            url (str): repository location
+            revision (str): branch, tag or commit hash
+        """
+        commit: str = self.resolve(url, revision)
+        path: str = os.path.join(self._directory, "snapshots", f"{commit}.json")
+        try:
+            with open(path) as file:  # type: IO[str]
+                return {
+                    name: (digest, mode)
+                    for name, (digest, mode) in json.load(file).items()
+                }
+        except (OSError, ValueError):
+            pass
+        with trace.span("fetch_source", url=url, commit=commit) as span:
+            files: Dict[str, Tuple[str, int]] = self._fetch(
+                url, revision, commit
+            )
+            span["files"] = len(files)
+        _write(path, json.dumps(files, sort_keys=True))
+        return files
+
+    def read(self, digest: str, mode: int) -> bytes:
+        """Returns content of a stored file.
+
+        Args:
+            digest (str): `sha256` of a content
+            mode (int): file permissions
+        """
+        with open(
+            self._assets.path(digest, mode), "rb"
+        ) as file:  # type: IO[bytes]
+            return file.read()
+
+    def _fetch(
+        self, url: str, revision: str, commit: str
+    ) -> Dict[str, Tuple[str, int]]:
+        """Fetches a commit into a mirror and stores its files."""
+        mirror: str = os.path.join(
+            self._directory,
+            "mirrors",
+            hashlib.sha256(url.encode("utf-8")).hexdigest()[:16],
+        )
+        os.makedirs(os.path.dirname(mirror), exist_ok=True)
+        with FileLock(f"{mirror}.lock"):
+            if not os.path.isdir(mirror):
+                _git("init", "--quiet", "--bare", mirror)
+            if not _has_commit(mirror, commit):
+                _git("-C", mirror, "fetch", "--quiet", url, revision)
+            if not _has_commit(mirror, commit):
+                raise ValueError(f"'{commit}' commit is not found in '{url}'")
+            blobs: Dict[str, Tuple[str, int]] = {}
+            for item in _git("-C", mirror, "ls-tree", "-r", "-z", commit).split(
+                b"\0"
+            ):
+                if item:
+                    meta, name = item.decode("utf-8").split("\t", 1)
+                    mode, kind, blob = meta.split()
+                    if kind == "blob" and mode in _FILES:
+                        blobs[name] = (
+                            blob,
+                            0o755 if mode == "100755" else 0o644,
+                        )
+            digests: Dict[Tuple[str, int], str] = self._store(
+                mirror, set(blobs.values())
+            )
+        return {name: (digests[blob], blob[1]) for name, blob in blobs.items()}
+
+    def _store(
+        self, mirror: str, blobs: Set[Tuple[str, int]]
+    ) -> Dict[Tuple[str, int], str]:
+        """Stores blobs not seen before and returns their `sha256`.
+
+        `git cat-file --batch` answers a blob it can not read with
+        `<blob> missing` (or `ambiguous`) header and no content.
+        """
+        links: str = os.path.join(self._directory, "blobs")
+        digests: Dict[Tuple[str, int], str] = {}
+        missing: List[Tuple[str, int]] = []
+        for blob, mode in sorted(blobs):
+            try:
+                with open(
+                    os.path.join(links, f"{blob}-{mode:o}")
+                ) as file:  # type: IO[str]
+                    digests[blob, mode] = file.read()
+            except FileNotFoundError:
+                missing.append((blob, mode))
+        if not missing:
+            return digests
+        output: bytes = _git(
+            "-C",
+            mirror,
+            "cat-file",
+            "--batch",
+            stdin="".join(f"{blob}\n" for blob, _ in missing).encode(),
+        )
+        position: int = 0
+        for blob, mode in missing:
+            end: int = output.index(b"\n", position)
+            header: List[str] = output[position:end].decode("utf-8").split()
+            if len(header) != 3:
+                raise ValueError(
+                    f"'{blob}' blob is {header[-1]} in '{mirror}' mirror"
+                )
+            size: int = int(header[2])
+            start: int = end + 1
+            stop: int = start + size
+            digests[blob, mode] = self._assets.put(
+                output[start:stop], mode=mode
+            )
+            position = stop + 1
+            _write(os.path.join(links, f"{blob}-{mode:o}"), digests[blob, mode])
+        return digests
+
+
+def _write(path: str, content: str) -> None:
+    """Writes a file atomically, so concurrent readers never see a part."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(path), suffix=".tmp"
+    )
+    with os.fdopen(descriptor, "w") as file:  # type: IO[str]
+        file.write(content)
+    os.replace(temporary, path)
+
+
+def _peeled_first(ref: Tuple[str, str]) -> Tuple[bool, str]:
+    """Orders peeled tags first, so annotated tags resolve to commits."""
+    return not ref[0].endswith("^{}"), ref[0]
+
+
+def _has_commit(mirror: str, commit: str) -> bool:
+    """Checks if a mirror has a commit."""
+    process: "subprocess.CompletedProcess[bytes]" = subprocess.run(
+        ("git", "-C", mirror, "cat-file", "-e", f"{commit}^{{commit}}"),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+    return process.returncode == 0
+
+
+@dataclass(frozen=True)
+class TemplateSource:
+    """Represents location of project templates.
+
+    Revision is empty for a local directory.
+    """
+
+    location: str
+    revision: str = ""
+
+    @classmethod
+    def parse(cls, spec: str) -> "TemplateSource":
+        """Parses a local directory or `<url>@<revision>` source.
+
+        Args:
+            spec (str): source specification
+        """
+        if os.path.isdir(spec):
+            return cls(os.path.abspath(spec))
+        location, _, revision = spec.rpartition("@")
+        if not location or not revision or ":" in revision:
+            raise ValueError(
+                f"'{spec}' is neither a directory nor `<url>@<revision>`"
+            )
+        return cls(location, revision)
+
+    def files(self) -> Dict[str, Tuple[bytes, int]]:
+        """Returns contents and modes of source template files."""
+        names: List[str] = [template.value for template in Template]
+        if not self.revision:
+            files: Dict[str, Tuple[bytes, int]] = {}
+            for name in names:
+                path: str = os.path.join(self.location, name)
+                if os.path.isfile(path):
+                    with open(path, "rb") as file:  # type: IO[bytes]
+                        files[name] = (
+                            file.read(),
+                            0o755 if os.access(path, os.X_OK) else 0o644,
+                        )
+            return files
+        cache: GitCache = GitCache()
+        return {
+            name: (cache.read(digest, mode), mode)
+            for name, (digest, mode) in cache.snapshot(
+                self.location, self.revision
+            ).items()
+            if name in names
+        }
+
+    def bundle(self) -> Bundle:
+        """Returns bundle of source templates over default ones."""
+        default: Bundle = Bundle.load()
+        files: Dict[str, Tuple[bytes, int]] = {
+            entry.name: (bytes(default.read(entry.name)), entry.mode)
+            for entry in default
+        }
+        files.update(self.files())
+        return Bundle(pack_files(files))
+
+    def __str__(self) -> str:
+        """Returns source specification."""
+        if self.revision:
+            return f"{self.location}@{self.revision}"
+        return self.location
+
+
+@functools.lru_cache(maxsize=None)
+def load(spec: str) -> Bundle:
+    """Returns template bundle of a source, once per process.
+
+    Args:
+        spec (str): source specification
+    """
+    return TemplateSource.parse(spec).bundle()
@@ -0,0 +1,177 @@
+"""Contains interfaces for staging project files before writing them."""
+import os
+import shutil
+import uuid
+from typing import Dict, Iterator, Optional, Set, Tuple, Union
+from pypans.assets import AssetStore
+from pypans.stream import StreamedFile, write_all
+
+Content = Union[bytes, memoryview]
+Staged = Union[Content, StreamedFile]
+
+_FLAGS: int = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+_STAGING: str = ".pypan-stage-"
+
+
+class StagedTree:
+    """Represents in-memory project tree that is committed file by file."""
+
+    def __init__(self, assets: Optional[AssetStore] = None) -> None:
+        self._assets: Optional[AssetStore] = assets
+        self._files: Dict[str, Tuple[Staged, int]] = {}
+        self._digests: Dict[str, str] = {}
+
+    def add(
+        self,
+        path: str,
+        content: Union[str, Staged],
+        mode: int = 0o644,
+        digest: str = "",
+    ) -> None:
+        """Stages a file, replacing previously staged content.
+
+        Streamed files are read and substituted only once they are written.
+
+        Args:
+            path (str): path relative to project root
+            content (str or Staged): file content or a streamed file
+            mode (int): file permissions
+            digest (str): `sha256` of a static content to link from assets
+        """
+        path = os.path.normpath(path)
+        self._files[path] = (
+            content.encode("utf-8") if isinstance(content, str) else content,
+            mode,
+        )
+        if digest:
+            self._digests[path] = digest
+        else:
+            self._digests.pop(path, None)
+
+    def read(self, path: str) -> Staged:
+        """Returns content of staged file.
+
+        Args:
+            path (str): path relative to project root
+        """
+        return self._files[os.path.normpath(path)][0]
+
+    def mode(self, path: str) -> int:
+        """Returns permissions of staged file.
+
+        Args:
+            path (str): path relative to project root
+        """
+        return self._files[os.path.normpath(path)][1]
+
+    def remove(self, path: str) -> None:
+        """Unstages a file.
+
+        Args:
+            path (str): path relative to project root
+        """
+        path = os.path.normpath(path)
+        del self._files[path]
+        self._digests.pop(path, None)
+
+    def __iter__(self) -> Iterator[str]:
+        """Returns staged paths in sorted order."""
+        return iter(sorted(self._files))
+
+    def __len__(self) -> int:
+        """Returns number of staged files."""
+        return len(self._files)
+
+    def size(self) -> int:
+        """Returns total size of staged contents in bytes."""
+        return sum(len(content) for content, _ in self._files.values())
+
+    def __contains__(self, path: object) -> bool:
+        """Checks if a path is staged."""
+        return isinstance(path, str) and os.path.normpath(path) in self._files
+
+    def write(self, directory: str) -> None:
+        """Writes all staged files into an existing directory.
+
+        Args:
+            directory (str): target directory
+        """
+        created: Set[str] = {directory}
+        for path in self:  # type: str
+            target: str = os.path.join(directory, path)
+            parent: str = os.path.dirname(target)
+            if parent not in created:
+                os.makedirs(parent, exist_ok=True)
+                created.add(parent)
+            content, mode = self._files[path]
+            if self._assets and path in self._digests:
+                self._assets.put(content, self._digests[path], mode)
+                self._assets.materialize(self._digests[path], target, mode)
+                continue
+            descriptor: int = os.open(target, _FLAGS, mode)
+            try:
+                if isinstance(content, StreamedFile):
+                    for chunk in content.chunks():
+                        write_all(descriptor, chunk)
+                else:
+                    write_all(descriptor, content)
+            finally:
+                os.close(descriptor)
+
+    def commit(self, root: str) -> None:
+        """Publishes staged files into a project root.
+
+        A new root is written into a sibling temporary directory and
+        published with a single atomic rename, so it either appears complete
+        or not at all. Files of an existing root are written into a
+        temporary directory inside it instead, so nothing is written outside
+        of it, and every staged entry is then moved over with an atomic
+        replace. A reader never sees a partially written file, but a failed
+        commit into an existing root may leave some files replaced. Reruns
+        overwrite files instead of appending to them.
+
+        Args:
+            root (str): project root directory
+        """
+        parent: str = os.path.dirname(os.path.abspath(root))
+        os.makedirs(parent, exist_ok=True)
+        exists: bool = os.path.isdir(root)
+        staging: str = _staging(root if exists else parent)
+        try:
+            self.write(staging)
+            if exists or not _publish(staging, root):
+                self._replace(staging, root)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _replace(self, staging: str, root: str) -> None:
+        """Moves staged files over files of an existing root one by one."""
+        created: Set[str] = {root}
+        for path in self:  # type: str
+            target: str = os.path.join(root, path)
+            parent: str = os.path.dirname(target)
+            if parent not in created:
+                os.makedirs(parent, exist_ok=True)
+                created.add(parent)
+            os.replace(os.path.join(staging, path), target)
+
+
+def _staging(directory: str) -> str:
+    """Creates temporary staging directory honouring `umask`."""
+    staging: str = os.path.join(directory, f"{_STAGING}{uuid.uuid4().hex}")
+    os.mkdir(staging)
+    return staging
+
+
+def _publish(staging: str, root: str) -> bool:
+    """Renames staging directory into a new root.
+
+    Returns `False` if a root was created concurrently in the meantime.
+    """
+    try:
+        os.rename(staging, root)
+    except OSError:
+        if not os.path.isdir(root):
+            raise
+        return False
+    return True
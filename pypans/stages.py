@@ -0,0 +1,430 @@
+"""Contains interfaces for running scaffold stages concurrently."""
+import asyncio
+import functools
+import os
+import subprocess
+import sys
+import time
+from asyncio.subprocess import Process
+from dataclasses import dataclass
+from typing import Callable, Dict, IO, List, Optional, Sequence, Tuple
+from pypans import trace
+from pypans.assets import AssetStore
+from pypans.file import Template
+from pypans.lock import lock_requirements
+from pypans.monorepo import Monorepo
+from pypans.packs import Pack, PackIndex
+from pypans.project import (
+    Profile,
+    Project,
+    ProjectCaches,
+    ProjectOptions,
+    Service,
+    User,
+)
+from pypans.rendercache import RenderCache
+from pypans.repository import Repository
+from pypans.source import TemplateSource
+from pypans.venvcache import VenvCache
+from pypans.wheelhouse import Wheelhouse
+
+
+@dataclass(frozen=True)
+class StageResult:
+    """Represents an outcome of a single stage."""
+
+    name: str
+    returncode: int
+    output: str
+    seconds: float
+
+    @property
+    def passed(self) -> bool:
+        """Checks if a stage is passed."""
+        return self.returncode == 0
+
+
+@dataclass(frozen=True)
+class _Stage:
+    """Represents a stage that is either a command or a python callable."""
+
+    name: str
+    command: Tuple[str, ...]
+    action: Optional[Callable[[], None]]
+    depends: Tuple[str, ...]
+
+
+class StageScheduler:
+    """Represents scheduler that runs stages as soon as dependencies pass.
+
+    Commands are launched as subprocesses and python callables are run in
+    a thread pool, so independent stages overlap with each other.
+    """
+
+    def __init__(self, cwd: str = ".") -> None:
+        self._cwd: str = cwd
+        self._stages: Dict[str, _Stage] = {}
+        self._results: Dict[str, StageResult] = {}
+
+    @property
+    def results(self) -> Dict[str, StageResult]:
+        """Returns results of already finished stages."""
+        return self._results
+
+    def command(
+        self, name: str, command: Sequence[str], depends: Sequence[str] = ()
+    ) -> None:
+        """Adds a subprocess stage.
+
+        Args:
+            name (str): stage name
+            command (Sequence[str]): program and its arguments
+            depends (Sequence[str]): names of stages to wait for
+        """
+        self._add(_Stage(name, tuple(command), None, tuple(depends)))
+
+    def action(
+        self,
+        name: str,
+        action: Callable[[], None],
+        depends: Sequence[str] = (),
+    ) -> None:
+        """Adds an in-process stage.
+
+        Args:
+            name (str): stage name
+            action (Callable): python callable to run
+            depends (Sequence[str]): names of stages to wait for
+        """
+        self._add(_Stage(name, (), action, tuple(depends)))
+
+    def run(self) -> Dict[str, StageResult]:
+        """Runs all stages and returns their results by name."""
+        loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self._run_all())
+        finally:
+            loop.close()
+
+    def _add(self, stage: _Stage) -> None:
+        """Adds a stage whose dependencies are already known."""
+        if stage.name in self._stages:
+            raise ValueError(f"'{stage.name}' stage is already added!")
+        unknown: List[str] = [
+            name for name in stage.depends if name not in self._stages
+        ]
+        if unknown:
+            raise ValueError(
+                f"'{stage.name}' stage depends on unknown {unknown} stages!"
+            )
+        self._stages[stage.name] = stage
+
+    async def _run_all(self) -> Dict[str, StageResult]:
+        """Runs all stages respecting their dependencies."""
+        tasks: Dict[str, "asyncio.Future[StageResult]"] = {}
+        for name, stage in self._stages.items():
+            tasks[name] = asyncio.ensure_future(
+                self._run(stage, [tasks[depend] for depend in stage.depends])
+            )
+        return dict(zip(tasks, await asyncio.gather(*tasks.values())))
+
+    async def _run(
+        self, stage: _Stage, depends: List["asyncio.Future[StageResult]"]
+    ) -> StageResult:
+        """Runs a stage once its dependencies are passed."""
+        result: StageResult = await self._execute(stage, depends)
+        self._results[stage.name] = result
+        return result
+
+    async def _execute(
+        self, stage: _Stage, depends: List["asyncio.Future[StageResult]"]
+    ) -> StageResult:
+        """Executes a stage command or callable.
+
+        Actions are traced in a worker thread, so spans of the work they do
+        are nested into them. Commands are traced on their own timelines.
+        """
+        failed: List[str] = [
+            result.name
+            for result in await asyncio.gather(*depends)
+            if not result.passed
+        ]
+        if failed:
+            return StageResult(
+                stage.name, -1, f"Skipped as {failed} stages failed", 0.0
+            )
+        start: float = time.perf_counter()
+        if stage.action:
+            try:
+                await asyncio.get_event_loop().run_in_executor(
+                    None, _traced, stage.name, stage.action
+                )
+            except Exception as error:  # pylint:disable=broad-except
+                return StageResult(
+                    stage.name, 1, repr(error), time.perf_counter() - start
+                )
+            return StageResult(stage.name, 0, "", time.perf_counter() - start)
+        try:
+            process: Process = await asyncio.create_subprocess_exec(
+                *stage.command,
+                cwd=self._cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+        except OSError as error:
+            return StageResult(
+                stage.name, 127, str(error), time.perf_counter() - start
+            )
+        output, _ = await process.communicate()
+        returncode: int = await process.wait()
+        seconds: float = time.perf_counter() - start
+        trace.record(
+            stage.name,
+            start,
+            "command",
+            lane=stage.name,
+            command=" ".join(stage.command),
+            returncode=returncode,
+            bytes=len(output),
+        )
+        return StageResult(
+            stage.name,
+            returncode,
+            output.decode("utf-8", "replace"),
+            seconds,
+        )
+
+
+def _traced(name: str, action: Callable[[], None]) -> None:
+    """Runs an action stage within a span."""
+    with trace.span(name, "action"):
+        action()
+
+
+@dataclass(frozen=True)
+class ScaffoldOptions:  # pylint:disable=too-many-instance-attributes
+    """Represents optional features shared by every scaffolded project."""
+
+    link_assets: bool = False
+    offline: bool = False
+    cache_venv: bool = False
+    pack: str = ""
+    render_cache: bool = False
+    source: str = ""
+    profile: str = str(Profile.DEFAULT)
+    service: str = str(Service.NONE)
+    monorepo: str = ""
+
+    def assets(self) -> Optional[AssetStore]:
+        """Returns shared asset store if static files are linked."""
+        return AssetStore() if self.link_assets else None
+
+    def wheelhouse(self) -> Optional[Wheelhouse]:
+        """Returns local wheelhouse if requirements are installed offline."""
+        return Wheelhouse() if self.offline else None
+
+    def renders(self) -> Optional[RenderCache]:
+        """Returns shared cache of rendered templates if it is enabled."""
+        return RenderCache() if self.render_cache else None
+
+    def template_pack(self) -> Optional[Pack]:
+        """Returns selected template pack."""
+        return PackIndex().get(self.pack) if self.pack else None
+
+    def template_source(self) -> Optional[TemplateSource]:
+        """Returns selected template source."""
+        return TemplateSource.parse(self.source) if self.source else None
+
+    def tooling(self) -> Profile:
+        """Returns selected tooling profile."""
+        return Profile(self.profile)
+
+    def web_service(self) -> Service:
+        """Returns selected kind of web service."""
+        return Service(self.service)
+
+    def workspace(self) -> Optional[Monorepo]:
+        """Returns monorepo to add projects into."""
+        return Monorepo(self.monorepo) if self.monorepo else None
+
+    def project_options(
+        self, monorepo: Optional[Monorepo] = None
+    ) -> ProjectOptions:
+        """Returns optional features of a scaffolded project.
+
+        Args:
+            monorepo (Monorepo): monorepo to add a project into
+        """
+        return ProjectOptions(
+            caches=ProjectCaches(self.assets(), self.renders()),
+            pack=self.template_pack(),
+            source=self.template_source(),
+            profile=self.tooling(),
+            service=self.web_service(),
+            monorepo=monorepo,
+        )
+
+
+@dataclass(frozen=True)
+class ProjectSetup:
+    """Represents optional setup stages of a scaffolded project.
+
+    A `git` repository is initialized when `git` is set, and `remote` only
+    configures its `origin`, so a repository may have no remote.
+    """
+
+    venv: bool = False
+    remote: str = ""
+    install: bool = False
+    git: bool = False
+
+
+def scaffold(
+    project: Project,
+    root: str,
+    user: User,
+    setup: ProjectSetup = ProjectSetup(),
+    options: ScaffoldOptions = ScaffoldOptions(),
+) -> StageScheduler:
+    """Returns scheduler with all stages needed to scaffold a project.
+
+    Plain venv creation does not depend on rendered files, so it runs
+    concurrently with project rendering. `git` repository with an initial
+    commit of rendered files is written in-process once they are committed.
+    A cached venv already has requirements installed, so it is cloned
+    instead of running `pip`. It is keyed on committed requirement files,
+    so it waits for a project. Packages of a monorepo share its venv.
+
+    Args:
+        project (Project): project to build
+        root (str): project root directory
+        user (User): project owner
+        setup (ProjectSetup): venv, `git` remote and requirements to set up
+        options (ScaffoldOptions): optional scaffold features
+    """
+    workspace: Optional[Monorepo] = options.workspace()
+    if workspace:
+        return _scaffold_member(project, workspace, setup, options)
+    return _scaffold_project(project, root, user, setup, options)
+
+
+def _build(project: Project) -> None:
+    """Builds and commits project files."""
+    project.build()
+    project.commit()
+
+
+def _scaffold_project(
+    project: Project,
+    root: str,
+    user: User,
+    setup: ProjectSetup,
+    options: ScaffoldOptions,
+) -> StageScheduler:
+    """Returns scheduler with stages building a standalone project."""
+    venv: str = os.path.join(root, "venv")
+    cached: bool = setup.venv and setup.install and options.cache_venv
+
+    def clone() -> None:
+        VenvCache().clone(venv, options.wheelhouse(), _requirement_files(root))
+
+    def repository() -> None:
+        Repository(root).init(project.tree, user.name, user.email, setup.remote)
+
+    def lock() -> None:
+        lock_requirements(root, venv if setup.venv else None)
+
+    if setup.venv or setup.git or setup.install:
+        os.makedirs(root, exist_ok=True)
+    scheduler: StageScheduler = StageScheduler(cwd=root)
+    scheduler.action("project", functools.partial(_build, project))
+    if cached:
+        scheduler.action("venv", clone, depends=("project",))
+    elif setup.venv:
+        scheduler.command("venv", (sys.executable, "-m", "venv", "venv"))
+    if setup.git:
+        scheduler.action("git", repository, depends=("project",))
+    if setup.install and not cached:
+        scheduler.command(
+            "install",
+            _install_command(setup.venv, options.wheelhouse()),
+            depends=("project", "venv") if setup.venv else ("project",),
+        )
+    if setup.install:
+        scheduler.action(
+            "lock",
+            lock,
+            depends=("project", "venv") if cached else ("install",),
+        )
+    return scheduler
+
+
+def _requirement_files(root: str) -> Dict[str, bytes]:
+    """Returns committed requirement files of a project by name."""
+    files: Dict[str, bytes] = {}
+    for template in (Template.REQUIREMENTS, Template.DEV_REQUIREMENTS):
+        path: str = os.path.join(root, str(template))
+        with open(path, "rb") as file:  # type: IO[bytes]
+            files[str(template)] = file.read()
+    return files
+
+
+def _install_command(
+    venv: bool, wheelhouse: Optional[Wheelhouse]
+) -> Tuple[str, ...]:
+    """Returns `pip` command installing project requirements."""
+    return (
+        os.path.join("venv", "bin", "pip") if venv else "pip",
+        "install",
+        "-r",
+        str(Template.REQUIREMENTS),
+        "-r",
+        str(Template.DEV_REQUIREMENTS),
+        *(wheelhouse.options() if wheelhouse else ()),
+    )
+
+
+def _scaffold_member(
+    project: Project,
+    workspace: Monorepo,
+    setup: ProjectSetup,
+    options: ScaffoldOptions,
+) -> StageScheduler:
+    """Returns scheduler with stages adding a package into a monorepo.
+
+    Shared venv is created only once and requirements of every package are
+    installed into it. `git` is left to a repository of a monorepo root.
+
+    Args:
+        project (Project): package to build
+        workspace (Monorepo): monorepo to add a package into
+        setup (ProjectSetup): use shared venv and install requirements
+        options (ScaffoldOptions): optional scaffold features
+    """
+    wheelhouse: Optional[Wheelhouse] = options.wheelhouse()
+
+    def create_venv() -> None:
+        workspace.create_venv(setup.install and options.cache_venv, wheelhouse)
+
+    def install_requirements() -> None:
+        workspace.install(
+            project.name,
+            setup.venv,
+            wheelhouse.options() if wheelhouse else (),
+        )
+
+    def lock() -> None:
+        workspace.lock(project.name, setup.venv)
+
+    scheduler: StageScheduler = StageScheduler(cwd=workspace.root)
+    scheduler.action("project", functools.partial(_build, project))
+    if setup.venv:
+        scheduler.action("venv", create_venv)
+    if setup.install:
+        scheduler.action(
+            "install",
+            install_requirements,
+            depends=("project", "venv") if setup.venv else ("project",),
+        )
+        scheduler.action("lock", lock, depends=("install",))
+    return scheduler
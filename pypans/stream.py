@@ -0,0 +1,114 @@
+"""Contains interfaces for substituting placeholders in streamed files.
+
+Files are processed in fixed-size chunks, so memory use does not depend on
+a file size. A tail that may hold the beginning of a placeholder is carried
+over into the next chunk.
+"""
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, IO, Iterator, List, Mapping, Pattern
+
+CHUNK: int = 64 * 1024
+_PROBE: int = 8 * 1024
+
+
+def is_binary(path: str) -> bool:
+    """Checks if a file looks binary, e.g has `NUL` bytes in its beginning.
+
+    Args:
+        path (str): path to a file
+    """
+    with open(path, "rb") as file:  # type: IO[bytes]
+        return b"\0" in file.read(_PROBE)
+
+
+def write_all(descriptor: int, content: Any) -> None:
+    """Writes whole content into a file descriptor.
+
+    `os.write` may write fewer bytes than given, so it is retried with
+    the rest of a content.
+
+    Args:
+        descriptor (int): file descriptor opened for writing
+        content (bytes-like): content to write
+    """
+    view: memoryview = memoryview(content)
+    while view:
+        written: int = os.write(descriptor, view)
+        view = view[written:]
+
+
+def substitute(
+    source: IO[bytes], replacements: Mapping[bytes, bytes], chunk: int = CHUNK
+) -> Iterator[bytes]:
+    """Yields chunks of a stream with all replacements applied in one pass.
+
+    Args:
+        source (IO[bytes]): binary stream to read
+        replacements (Mapping[bytes, bytes]): values by tokens
+        chunk (int): number of bytes to read at once
+    """
+    replacements = {
+        token: value for token, value in replacements.items() if token
+    }
+    if not replacements:
+        yield from iter(lambda: source.read(chunk), b"")
+        return
+    pattern: Pattern[bytes] = re.compile(
+        b"|".join(map(re.escape, sorted(replacements, key=len, reverse=True)))
+    )
+    keep: int = max(map(len, replacements)) - 1
+    carry: bytes = b""
+    while True:
+        data: bytes = source.read(chunk)
+        buffer: bytes = carry + data
+        boundary: int = len(buffer) - keep if data else len(buffer)
+        parts: List[bytes] = []
+        position: int = 0
+        for match in pattern.finditer(buffer):
+            start: int = match.start()
+            if start >= boundary:
+                break
+            parts.append(buffer[position:start])
+            parts.append(replacements[match.group()])
+            position = match.end()
+        cut: int = max(position, boundary)
+        parts.append(buffer[position:cut])
+        carry = buffer[cut:]
+        output: bytes = b"".join(parts)
+        if output:
+            yield output
+        if not data:
+            return
+
+
+@dataclass(frozen=True)
+class StreamedFile:
+    """Represents a file that is substituted while it is being written.
+
+    Binary files are passed through untouched.
+    """
+
+    path: str
+    replacements: Mapping[bytes, bytes]
+
+    def chunks(self) -> Iterator[bytes]:
+        """Yields substituted content chunk by chunk."""
+        replacements: Mapping[bytes, bytes] = (
+            {} if is_binary(self.path) else self.replacements
+        )
+        with open(self.path, "rb") as file:  # type: IO[bytes]
+            yield from substitute(file, replacements)
+
+    def sha256(self) -> str:
+        """Returns `sha256` of substituted content."""
+        digest = hashlib.sha256()
+        for chunk in self.chunks():
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def __len__(self) -> int:
+        """Returns size of a source file."""
+        return os.path.getsize(self.path)
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""Runs code analysers concurrently and reports a single combined result.
+
+Analysers are independent, so they run in a bounded pool of workers. Caches
+of `mypy`, `pytest` and python bytecode are kept between runs.
+
+File analysers keep results per file in `.analyse-cache/`, keyed by a file
+content hash, an analyser version and a hash of its configuration. Only
+changed files (and for `pylint` also modules importing them) are analysed
+again, diagnostics of unchanged files are replayed from a cache. Set
+`ANALYSE_CACHE=0` to analyse all files.
+
+A runner of a monorepo root analyses all packages listed in `monorepo.txt`
+at once, e.g with a single `mypy` run over all of them.
+"""
+import ast
+import functools
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Sequence, Set, Tuple
+
+PACKAGE: str = "<package>"
+MEMBERS: str = "monorepo.txt"
+WORKERS: int = int(os.environ.get("ANALYSE_WORKERS", os.cpu_count() or 1))
+CACHE: str = ".analyse-cache"
+CACHED: bool = os.environ.get("ANALYSE_CACHE", "1") != "0"
+SKIPPED: Set[str] = {"venv", "build", "dist"}
+
+
+def _packages() -> Tuple[str, ...]:
+    """Returns directories of analysed packages.
+
+    Every package of a monorepo is nested into a same named directory.
+    """
+    if PACKAGE:
+        return (PACKAGE,)
+    with open(MEMBERS) as members:
+        return tuple(
+            os.path.join(name, name) for name in members.read().split()
+        )
+
+
+PACKAGES: Tuple[str, ...] = _packages()
+ROOTS: Tuple[str, ...] = tuple(
+    os.path.dirname(package) or "." for package in PACKAGES
+)
+ENV: Dict[str, str] = (
+    dict(os.environ)
+    if PACKAGE
+    else {**os.environ, "MYPYPATH": os.pathsep.join(ROOTS)}
+)
+CHECKS: Dict[str, Tuple[str, ...]] = {
+    "black": ("black", "--check", *PACKAGES),
+    "mypy": (
+        "mypy",
+        "--incremental",
+        *(
+            option
+            for package in PACKAGES
+            for option in ("--package", os.path.basename(package))
+        ),
+    ),
+    "pylint": ("pylint", "--jobs=0", *PACKAGES),
+    "flake8": ("flake8", "./"),
+    "pydocstyle": ("pydocstyle", "--explain", "--count", *PACKAGES),
+    "interrogate": ("interrogate", "-vv", *PACKAGES),
+    "check-manifest": ("check-manifest", "-v", "./"),
+    "unittests": ("pytest",),
+}
+# packaging and tests of monorepo packages are checked in their own roots
+DIRECTORIES: Dict[str, Tuple[str, ...]] = (
+    {} if PACKAGE else {"check-manifest": ROOTS, "unittests": ROOTS}
+)
+FAILED_OUT: str = "\033[0;31m"
+PASSED_OUT: str = "\033[0;32m"
+NONE_OUT: str = "\033[0m"
+
+
+class FileCheck(NamedTuple):
+    """Represents analyser which reports diagnostics per file."""
+
+    command: Tuple[str, ...]
+    directories: Tuple[str, ...]
+    configs: Tuple[str, ...]
+    imports: bool
+
+
+FILE_CHECKS: Dict[str, FileCheck] = {
+    "black": FileCheck(
+        ("black", "--check"), PACKAGES, ("pyproject.toml",), False
+    ),
+    "pylint": FileCheck(
+        ("pylint", "--jobs=0", "--output-format=parseable", "--score=n"),
+        PACKAGES,
+        (".pylintrc",),
+        True,
+    ),
+    "flake8": FileCheck(("flake8",), ("./",), (".flake8",), False),
+    "pydocstyle": FileCheck(
+        ("pydocstyle", "--explain"), PACKAGES, (".pydocstyle",), False
+    ),
+}
+
+
+class Outcome(NamedTuple):
+    """Represents result of a single analyser."""
+
+    name: str
+    returncode: int
+    output: str
+    seconds: float
+
+
+def analyse(name: str) -> Outcome:
+    """Runs an analyser and captures its output.
+
+    Args:
+        name (str): analyser name
+    """
+    start: float = time.perf_counter()
+    if CACHED and name in FILE_CHECKS:
+        returncode, output = analyse_files(name)
+        return Outcome(name, returncode, output, time.perf_counter() - start)
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        results: List[Tuple[int, str]] = list(
+            pool.map(
+                functools.partial(execute, CHECKS[name]),
+                DIRECTORIES.get(name, (".",)),
+            )
+        )
+    return Outcome(
+        name,
+        max(returncode for returncode, _ in results),
+        "".join(output for _, output in results),
+        time.perf_counter() - start,
+    )
+
+
+def execute(command: Sequence[str], directory: str = ".") -> Tuple[int, str]:
+    """Runs a command and returns its exit code and output.
+
+    Args:
+        command (Sequence[str]): program and its arguments
+        directory (str): working directory
+    """
+    try:
+        process: "subprocess.CompletedProcess[str]" = subprocess.run(
+            command,
+            check=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            cwd=directory,
+            env=ENV,
+        )
+    except OSError as error:
+        return 127, str(error)
+    return process.returncode, process.stdout
+
+
+def analyse_files(name: str) -> Tuple[int, str]:
+    """Runs a file analyser over changed files and replays cached ones.
+
+    Files are analysed by a single analyser run and its diagnostics are
+    attributed to files by their paths. Results are not cached if a failed
+    run reports no file diagnostics, e.g. an analyser is misconfigured.
+
+    Args:
+        name (str): analyser name
+    """
+    check: FileCheck = FILE_CHECKS[name]
+    paths: List[str] = sources(*check.directories)
+    salt: str = _digest(
+        name, version(check.command[0]), *map(_read, check.configs)
+    )
+    keys: Dict[str, str] = {
+        path: cache_key(check, path, salt) for path in paths
+    }
+    cache: Dict[str, Dict[str, Any]] = _load(name)
+    stale: List[str] = [
+        path for path in paths if cache.get(path, {}).get("key") != keys[path]
+    ]
+    rest: str = ""
+    if stale:
+        code, report = execute((*check.command, *stale))
+        owned, rest = attribute(report, stale)
+        if code and not owned:
+            return code, report
+        for path in stale:  # type: str
+            cache[path] = {
+                "key": keys[path],
+                "returncode": code if path in owned else 0,
+                "output": owned.get(path, ""),
+            }
+        _save(name, {path: cache[path] for path in paths})
+    returncode: int = max(
+        (cache[path]["returncode"] for path in paths), default=0
+    )
+    output: str = "".join(cache[path]["output"] for path in paths)
+    return returncode, output + rest if returncode else output
+
+
+def sources(*directories: str) -> List[str]:
+    """Returns sorted python files of directories skipping hidden ones.
+
+    Args:
+        directories (str): directories to search files in
+    """
+    paths: List[str] = []
+    for root, nested, files in (
+        walked for directory in directories for walked in os.walk(directory)
+    ):
+        nested[:] = [
+            name
+            for name in nested
+            if not (name.startswith(".") or name in SKIPPED)
+        ]
+        paths.extend(
+            os.path.normpath(os.path.join(root, name))
+            for name in files
+            if name.endswith(".py")
+        )
+    return sorted(paths)
+
+
+def cache_key(check: FileCheck, path: str, salt: str) -> str:
+    """Returns cache key of a file for an analyser.
+
+    A key of an analyser following imports covers imported package modules.
+
+    Args:
+        check (FileCheck): file analyser
+        path (str): file path
+        salt (str): hash of an analyser version and configuration
+    """
+    if not check.imports:
+        return _digest(salt, _hash(path))
+    return _digest(salt, *(_hash(module) for module in dependencies(path)))
+
+
+@functools.lru_cache(maxsize=None)
+def dependencies(path: str) -> Tuple[str, ...]:
+    """Returns a file and package modules it imports, directly or not.
+
+    Args:
+        path (str): file path
+    """
+    found: Set[str] = set()
+    pending: List[str] = [path]
+    while pending:
+        current: str = pending.pop()
+        if current not in found:
+            found.add(current)
+            pending.extend(_imports(current))
+    return tuple(sorted(found))
+
+
+def attribute(output: str, paths: Sequence[str]) -> Tuple[Dict[str, str], str]:
+    """Splits analyser output into diagnostics of files and the rest.
+
+    A line belongs to a file which path it mentions, indented lines belong
+    to a file of a previous line.
+
+    Args:
+        output (str): analyser output
+        paths (Sequence[str]): analysed files
+    """
+    owners: Dict[str, str] = {path: path for path in paths}
+    owners.update({os.path.abspath(path): path for path in paths})
+    pattern = re.compile(
+        r"(?<![\w./-])({})(?![\w./-])".format(
+            "|".join(map(re.escape, sorted(owners, key=len, reverse=True)))
+        )
+    )
+    owned: Dict[str, str] = {}
+    rest: List[str] = []
+    owner: str = ""
+    for line in output.splitlines(keepends=True):
+        match = pattern.search(line)
+        if match:
+            owner = owners[match.group(1)]
+        elif not (owner and line[:1].isspace()):
+            owner = ""
+        if owner:
+            owned[owner] = owned.get(owner, "") + line
+        else:
+            rest.append(line)
+    return owned, "".join(rest)
+
+
+@functools.lru_cache(maxsize=None)
+def version(tool: str) -> str:
+    """Returns installed version of an analyser.
+
+    Args:
+        tool (str): analyser executable
+    """
+    try:
+        return subprocess.run(
+            (tool, "--version"),
+            check=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        ).stdout
+    except OSError:
+        return ""
+
+
+@functools.lru_cache(maxsize=None)
+def _modules() -> Dict[str, str]:
+    """Returns package module names mapped to their files."""
+    modules: Dict[str, str] = {}
+    for path in sources(*PACKAGES):  # type: str
+        parts: List[str] = _module(path)
+        if parts[-1] == "__init__":
+            parts.pop()
+        modules[".".join(parts)] = path
+    return modules
+
+
+def _module(path: str) -> List[str]:
+    """Returns dotted parts of a module path relative to its package root."""
+    for root in ROOTS:  # type: str
+        relative: str = os.path.relpath(path, root)
+        if not relative.startswith(os.pardir):
+            return os.path.splitext(relative)[0].split(os.sep)
+    return os.path.splitext(path)[0].split(os.sep)
+
+
+def _imports(path: str) -> List[str]:
+    """Returns package modules imported directly by a file."""
+    modules: Dict[str, str] = _modules()
+    module: List[str] = _module(path)
+    try:
+        tree: ast.AST = ast.parse(_read(path))
+    except (SyntaxError, ValueError):
+        return []
+    names: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base: str = ".".join(
+                module[: len(module) - node.level] + [node.module or ""]
+                if node.level
+                else [node.module or ""]
+            ).strip(".")
+            names.append(base)
+            names.extend(f"{base}.{alias.name}" for alias in node.names)
+    return [modules[name] for name in names if name in modules]
+
+
+@functools.lru_cache(maxsize=None)
+def _hash(path: str) -> str:
+    """Returns content hash of a file."""
+    return hashlib.sha256(_read(path)).hexdigest()
+
+
+def _digest(*parts: Any) -> str:
+    """Returns hash of given parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _read(path: str) -> bytes:
+    """Returns file content, empty if a file is missing."""
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except OSError:
+        return b""
+
+
+def _load(name: str) -> Dict[str, Dict[str, Any]]:
+    """Returns cached results of an analyser."""
+    try:
+        with open(os.path.join(CACHE, f"{name}.json")) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save(name: str, results: Dict[str, Dict[str, Any]]) -> None:
+    """Saves results of an analyser, a cache file is replaced atomically."""
+    os.makedirs(CACHE, exist_ok=True)
+    path: str = os.path.join(CACHE, f"{name}.json")
+    with open(f"{path}.{os.getpid()}", "w") as file:
+        json.dump(results, file, indent=1, sort_keys=True)
+    os.replace(f"{path}.{os.getpid()}", path)
+
+
+def show(line: str) -> None:
+    """Writes a line into standard output.
+
+    Args:
+        line (str): line to write
+    """
+    sys.stdout.write(f"{line}{os.linesep}")
+
+
+def main(names: Sequence[str]) -> int:
+    """Runs given analysers (all by default) and returns combined exit code.
+
+    Args:
+        names (Sequence[str]): analysers to run
+    """
+    unknown: List[str] = [name for name in names if name not in CHECKS]
+    if unknown:
+        show(f"Unknown analysers {unknown}, please use {list(CHECKS)}")
+        return 2
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        outcomes: List[Outcome] = list(pool.map(analyse, names or CHECKS))
+    for outcome in outcomes:
+        show(f"Start {outcome.name} analysis ...{os.linesep}{outcome.output}")
+    for outcome in outcomes:
+        show(
+            f"{PASSED_OUT if outcome.returncode == 0 else FAILED_OUT}"
+            f"{outcome.name:<16}{outcome.seconds:>8.2f}s "
+            f"{'passed' if outcome.returncode == 0 else 'failed'}{NONE_OUT}"
+        )
+    if any(outcome.returncode for outcome in outcomes):
+        show(
+            f"{FAILED_OUT}Code assessment is failed, please fix errors!"
+            f"{NONE_OUT}"
+        )
+        return 100
+    show(f"{PASSED_OUT}Congratulations, code assessment is passed!{NONE_OUT}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,247 @@
+"""Contains interfaces for tracing scaffold stages.
+
+Spans are exported as Chrome trace events, so a trace can be opened in
+`chrome://tracing` or Perfetto. Tracing is off by default, and a disabled
+span is a shared no-op context manager. Worker processes trace into their
+own tracers sharing an origin, and their events are merged by a parent.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import (
+    Any,
+    ContextManager,
+    DefaultDict,
+    Dict,
+    IO,
+    Iterable,
+    List,
+    Optional,
+)
+
+TRACE: str = "PYPAN_TRACE"
+_SINK: Dict[str, Any] = {}
+
+
+class _NullSpan:
+    """Represents span that records nothing."""
+
+    def __enter__(self) -> Dict[str, Any]:
+        """Returns a throwaway dictionary for span arguments."""
+        return _SINK
+
+    def __exit__(self, *_: Any) -> None:  # noqa: U101
+        """Does nothing."""
+
+
+_NULL: _NullSpan = _NullSpan()
+
+
+class Tracer:
+    """Represents thread-safe collector of complete trace events."""
+
+    def __init__(self, origin: Optional[float] = None) -> None:
+        self._origin: float = time.perf_counter() if origin is None else origin
+        self._events: List[Dict[str, Any]] = []
+        self._lanes: Dict[str, int] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def origin(self) -> float:
+        """Returns `time.perf_counter` value of trace start."""
+        return self._origin
+
+    def record(
+        self,
+        name: str,
+        start: float,
+        category: str = "stage",
+        lane: str = "",
+        **args: Any,
+    ) -> None:
+        """Records a span finished just now.
+
+        Args:
+            name (str): span name
+            start (float): `time.perf_counter` value when a span started
+            category (str): span category
+            lane (str): named timeline, current thread by default
+            args (Any): span arguments, e.g bytes written or files touched
+        """
+        event: Dict[str, Any] = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": (time.perf_counter() - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            if lane:
+                event["tid"] = self._lanes.setdefault(
+                    lane, len(self._lanes) + 1
+                )
+            self._events.append(event)
+
+    def span(self, name: str, category: str = "stage", **args: Any) -> "_Span":
+        """Returns context manager that records a span on exit.
+
+        Args:
+            name (str): span name
+            category (str): span category
+            args (Any): span arguments
+        """
+        return _Span(self, name, category, args)
+
+    def extend(self, events: Iterable[Dict[str, Any]]) -> None:
+        """Adds events recorded by another tracer with the same origin.
+
+        Args:
+            events (Iterable[dict]): Chrome trace events, e.g of a worker
+        """
+        with self._lock:
+            self._events.extend(events)
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Returns Chrome trace events including names of lanes."""
+        with self._lock:
+            return [
+                *self._events,
+                *(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": os.getpid(),
+                        "tid": tid,
+                        "args": {"name": lane},
+                    }
+                    for lane, tid in self._lanes.items()
+                ),
+            ]
+
+    def export(self, path: str) -> None:
+        """Writes Chrome trace events into a `json` file.
+
+        Args:
+            path (str): path to a trace file
+        """
+        with open(path, "w") as file:  # type: IO[str]
+            json.dump(
+                {"traceEvents": self.events(), "displayTimeUnit": "ms"}, file
+            )
+
+    def summary(self, top: int = 10) -> List[str]:
+        """Returns lines with the slowest spans aggregated by name.
+
+        Args:
+            top (int): number of spans to show
+        """
+        totals: DefaultDict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+        with self._lock:
+            for event in self._events:
+                if event["ph"] != "X":
+                    continue
+                total: List[float] = totals[f"{event['cat']}:{event['name']}"]
+                total[0] += event["dur"] / 1e3
+                total[1] += 1
+        return [
+            f"{milliseconds:>10.2f}ms {count:>5.0f}x  {name}"
+            for name, (milliseconds, count) in sorted(
+                totals.items(), key=lambda total: -total[1][0]
+            )[:top]
+        ]
+
+
+class _Span:
+    """Represents span that is being measured."""
+
+    __slots__ = ("_tracer", "_name", "_category", "_args", "_start")
+
+    def __init__(
+        self, tracer: Tracer, name: str, category: str, args: Dict[str, Any]
+    ) -> None:
+        self._tracer: Tracer = tracer
+        self._name: str = name
+        self._category: str = category
+        self._args: Dict[str, Any] = args
+        self._start: float = 0.0
+
+    def __enter__(self) -> Dict[str, Any]:
+        """Starts a span and returns its arguments to fill in."""
+        self._start = time.perf_counter()
+        return self._args
+
+    def __exit__(self, *_: Any) -> None:  # noqa: U101
+        """Records a span."""
+        self._tracer.record(
+            self._name, self._start, self._category, **self._args
+        )
+
+
+_tracer: Optional[Tracer] = None
+
+
+def enable(origin: Optional[float] = None) -> Tracer:
+    """Starts tracing in current process and returns a tracer.
+
+    Args:
+        origin (float): `time.perf_counter` value of a parent trace start
+    """
+    global _tracer  # pylint:disable=global-statement
+    _tracer = Tracer(origin)
+    return _tracer
+
+
+def disable() -> None:
+    """Stops tracing in current process."""
+    global _tracer  # pylint:disable=global-statement
+    _tracer = None
+
+
+def enabled() -> bool:
+    """Checks if tracing is on."""
+    return _tracer is not None
+
+
+def current() -> Optional[Tracer]:
+    """Returns active tracer of current process if tracing is on."""
+    return _tracer
+
+
+def span(
+    name: str, category: str = "stage", **args: Any
+) -> ContextManager[Dict[str, Any]]:
+    """Returns span of an active tracer, or a no-op span.
+
+    Args:
+        name (str): span name
+        category (str): span category
+        args (Any): span arguments
+    """
+    if _tracer is None:
+        return _NULL
+    return _tracer.span(name, category, **args)
+
+
+def record(
+    name: str,
+    start: float,
+    category: str = "stage",
+    lane: str = "",
+    **args: Any,
+) -> None:
+    """Records a span finished just now if tracing is on.
+
+    Args:
+        name (str): span name
+        start (float): `time.perf_counter` value when a span started
+        category (str): span category
+        lane (str): named timeline, current thread by default
+        args (Any): span arguments
+    """
+    if _tracer is not None:
+        _tracer.record(name, start, category, lane, **args)
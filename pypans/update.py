@@ -0,0 +1,203 @@
+"""Contains interfaces for updating generated projects with newer templates."""
+import os
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+from pypans import __version__
+from pypans.bundle import Bundle
+from pypans.manifest import (
+    FileRecord,
+    MANIFEST,
+    Manifest,
+    file_sha256,
+    sha256,
+)
+from pypans.monorepo import Monorepo, SHARED
+from pypans.packs import PackIndex
+from pypans.project import (
+    Profile,
+    Project,
+    ProjectOptions,
+    Service,
+    User,
+)
+from pypans.render import Placeholder, Variables
+from pypans.source import TemplateSource, load
+from pypans.stage import StagedTree
+
+
+class _Status(Enum):
+    """Represents state of a generated file against its fresh render."""
+
+    UNCHANGED: str = "unchanged"
+    ADDED: str = "added"
+    UPDATED: str = "updated"
+    MODIFIED: str = "modified"
+
+
+@dataclass(frozen=True)
+class UpdateReport:
+    """Represents outcome of a project update."""
+
+    root: str
+    updated: Tuple[str, ...] = ()
+    added: Tuple[str, ...] = ()
+    modified: Tuple[str, ...] = ()
+    unchanged: int = 0
+
+    def __bool__(self) -> bool:
+        """Checks if any file is written."""
+        return bool(self.updated or self.added)
+
+
+def is_current(manifest: Manifest, bundle: Bundle) -> bool:
+    """Checks if a manifest is produced by the same `pypan` and templates.
+
+    Projects built from a template pack are always re-rendered. Shared
+    files of monorepo packages belong to a monorepo root and are not checked.
+
+    Args:
+        manifest (Manifest): manifest of a generated project
+        bundle (Bundle): current template bundle
+    """
+    if manifest.version != __version__ or manifest.pack:
+        return False
+    shared: Tuple[str, ...] = (
+        tuple(template.value for template in SHARED)
+        if manifest.monorepo
+        else ()
+    )
+    for entry in bundle:
+        if entry.name in shared:
+            continue
+        record: Optional[FileRecord] = manifest.files.get(entry.name)
+        if record is None or record.template != entry.sha256:
+            return False
+    return True
+
+
+def _project(root: str, manifest: Manifest) -> Project:
+    """Returns a project as it was built with current templates.
+
+    Args:
+        root (str): project root directory
+        manifest (Manifest): manifest of a generated project
+    """
+    variables: Variables = manifest.placeholders()
+    return Project(
+        variables[Placeholder.PACKAGE],
+        User(variables[Placeholder.USERNAME], variables[Placeholder.EMAIL]),
+        root,
+        ProjectOptions(
+            pack=PackIndex().get(manifest.pack) if manifest.pack else None,
+            source=(
+                TemplateSource.parse(manifest.source)
+                if manifest.source
+                else None
+            ),
+            profile=Profile(manifest.profile),
+            service=Service(manifest.service),
+            monorepo=(
+                Monorepo(os.path.dirname(os.path.abspath(root)))
+                if manifest.monorepo
+                else None
+            ),
+            variables=variables,
+        ),
+    )
+
+
+def _status(
+    previous: Optional[FileRecord], current: Optional[str], output: str
+) -> _Status:
+    """Returns state of a file against its fresh render.
+
+    Args:
+        previous (Optional[FileRecord]): manifest record of a file
+        current (Optional[str]): `sha256` of a file on disk
+        output (str): `sha256` of a fresh render
+    """
+    if current == output:
+        return _Status.UNCHANGED
+    if previous is None and current is None:
+        return _Status.ADDED
+    if previous and current == previous.output:
+        return _Status.UPDATED
+    return _Status.MODIFIED
+
+
+def _stage_manifest(
+    root: str, fresh: Manifest, records: Dict[str, FileRecord], tree: StagedTree
+) -> None:
+    """Stages a manifest of written files unless it is the same on disk.
+
+    Args:
+        root (str): project root directory
+        fresh (Manifest): manifest of a fresh render
+        records (Dict[str, FileRecord]): records of files kept on disk
+        tree (StagedTree): staged changes
+    """
+    content: str = Manifest(
+        __version__,
+        fresh.variables,
+        records,
+        fresh.pack,
+        fresh.source,
+        fresh.profile,
+        fresh.service,
+        fresh.monorepo,
+    ).dumps()
+    if file_sha256(os.path.join(root, MANIFEST)) != sha256(
+        content.encode("utf-8")
+    ):
+        tree.add(MANIFEST, content)
+
+
+def update(root: str, dry_run: bool = False) -> UpdateReport:
+    """Re-renders a generated project writing only files that changed.
+
+    Nothing is rendered when templates and `pypan` version match a manifest.
+    Files modified by a user since generation are left untouched, and
+    unchanged files are not rewritten, so their mtimes stay valid.
+
+    Args:
+        root (str): project root directory
+        dry_run (bool): only report files that would be written
+    """
+    manifest: Manifest = Manifest.read(root)
+    if is_current(
+        manifest, load(manifest.source) if manifest.source else Bundle.load()
+    ):
+        return UpdateReport(root, unchanged=len(manifest.files))
+    project: Project = _project(root, manifest)
+    project.build()
+    fresh: Manifest = project.manifest()
+    records: Dict[str, FileRecord] = {}
+    changes: StagedTree = StagedTree()
+    paths: Dict[_Status, List[str]] = {status: [] for status in _Status}
+    for path, record in fresh.files.items():
+        previous: Optional[FileRecord] = manifest.files.get(path)
+        status: _Status = (
+            _Status.UNCHANGED
+            if previous and previous.output == record.output
+            else _status(
+                previous, file_sha256(os.path.join(root, path)), record.output
+            )
+        )
+        paths[status].append(path)
+        if status is not _Status.MODIFIED:
+            records[path] = record
+        elif previous:
+            records[path] = previous
+        if status in (_Status.ADDED, _Status.UPDATED):
+            changes.add(path, project.tree.read(path), project.tree.mode(path))
+    _stage_manifest(root, fresh, records, changes)
+    if not dry_run and changes:
+        changes.commit(root)
+    return UpdateReport(
+        root,
+        tuple(paths[_Status.UPDATED]),
+        tuple(paths[_Status.ADDED]),
+        tuple(paths[_Status.MODIFIED]),
+        len(paths[_Status.UNCHANGED]),
+    )
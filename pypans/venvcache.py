@@ -0,0 +1,253 @@
+"""Contains interfaces for reusing prebuilt python virtual environments."""
+import hashlib
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Dict, IO, List, Mapping, Optional
+from pypans.bundle import Bundle
+from pypans.cache import FileLock, cache_dir, evict
+from pypans.wheelhouse import REQUIREMENTS, Wheelhouse
+
+_LIMIT: int = 2 * 1024**3
+_ORIGIN: str = ".pypan-origin"
+_SIZE: str = ".pypan-size"
+_USED: str = ".pypan-used"
+_SITE: str = "site-packages"
+
+
+class VenvCache:
+    """Represents cache of virtual environments with installed requirements.
+
+    Environments are keyed by python version and contents of requirement
+    files, so a cache hit is cloned into a project instead of running `venv`
+    and `pip`. Bundled template requirements are used unless a project
+    passes its own. Least recently used environments are evicted once a
+    size cap is hit.
+    """
+
+    def __init__(
+        self, directory: Optional[str] = None, limit: int = _LIMIT
+    ) -> None:
+        self._directory: str = directory or cache_dir("venvs")
+        self._limit: int = limit
+
+    @staticmethod
+    def key(requirements: Mapping[str, bytes]) -> str:
+        """Returns hash of python version and requirement files.
+
+        Args:
+            requirements (Mapping[str, bytes]): requirement files by name
+        """
+        digest = hashlib.sha256(
+            platform.python_implementation().encode("utf-8")
+        )
+        digest.update(platform.python_version().encode("utf-8"))
+        for name in sorted(requirements):
+            digest.update(f"\0{name}\0".encode("utf-8"))
+            digest.update(hashlib.sha256(requirements[name]).digest())
+        return digest.hexdigest()[:32]
+
+    def ensure(
+        self,
+        wheelhouse: Optional[Wheelhouse] = None,
+        requirements: Optional[Mapping[str, bytes]] = None,
+    ) -> str:
+        """Returns location of cached environment, building it on a miss.
+
+        Returned environment may be evicted by other processes once this
+        call returns, so use `clone()` to copy it out.
+
+        Args:
+            wheelhouse (Wheelhouse): install only from a local wheelhouse
+            requirements (Mapping[str, bytes]): requirement files by name
+        """
+        files: Mapping[str, bytes] = requirements or _bundled()
+        key: str = self.key(files)
+        entry: str = os.path.join(self._directory, key)
+        with FileLock(f"{entry}.lock"):
+            created: bool = not os.path.isdir(entry)
+            if created:
+                self._create(entry, files, wheelhouse)
+        if created:
+            self._evict(keep=key)
+        return entry
+
+    def clone(
+        self,
+        target: str,
+        wheelhouse: Optional[Wheelhouse] = None,
+        requirements: Optional[Mapping[str, bytes]] = None,
+    ) -> None:
+        """Clones cached environment into target directory.
+
+        A shared lock is held from a lookup until a clone is complete, so an
+        environment can not be evicted in between. It is built on a miss.
+
+        Args:
+            target (str): location of a new environment
+            wheelhouse (Wheelhouse): install only from a local wheelhouse
+            requirements (Mapping[str, bytes]): requirement files by name
+        """
+        files: Mapping[str, bytes] = requirements or _bundled()
+        entry: str = os.path.join(self._directory, self.key(files))
+        with FileLock(f"{entry}.lock", shared=True):
+            cached: bool = os.path.isdir(entry)
+            if cached:
+                with open(os.path.join(entry, _USED), "w"):
+                    pass
+                with open(
+                    os.path.join(entry, _ORIGIN)
+                ) as origin:  # type: IO[str]
+                    _clone(entry, origin.read(), os.path.abspath(target))
+        if not cached:
+            self.ensure(wheelhouse, files)
+            self.clone(target, wheelhouse, files)
+
+    def _create(
+        self,
+        entry: str,
+        requirements: Mapping[str, bytes],
+        wheelhouse: Optional[Wheelhouse],
+    ) -> None:
+        """Builds an environment and publishes it with a single rename."""
+        staging: str = tempfile.mkdtemp(prefix=".venv-", dir=self._directory)
+        try:
+            subprocess.run(
+                (sys.executable, "-m", "venv", staging),
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+            with tempfile.TemporaryDirectory() as directory:
+                arguments: List[str] = []
+                for name in sorted(requirements):
+                    path: str = os.path.join(directory, name)
+                    with open(path, "wb") as file:  # type: IO[bytes]
+                        file.write(requirements[name])
+                    arguments.extend(("-r", path))
+                subprocess.run(
+                    (
+                        os.path.join(staging, "bin", "pip"),
+                        "install",
+                        *arguments,
+                        *(wheelhouse.options() if wheelhouse else ()),
+                    ),
+                    check=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                )
+            with open(os.path.join(staging, _ORIGIN), "w") as origin:
+                origin.write(staging)
+            with open(os.path.join(staging, _SIZE), "w") as size:
+                size.write(str(_size(staging)))
+            os.rename(staging, entry)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def _evict(self, keep: str) -> int:
+        """Removes least recently used environments above a size cap."""
+        entries: Dict[str, int] = {}
+        for key in sorted(
+            (
+                name
+                for name in os.listdir(self._directory)
+                if os.path.isfile(os.path.join(self._directory, name, _SIZE))
+            ),
+            key=lambda name: _used(os.path.join(self._directory, name)),
+        ):
+            with open(os.path.join(self._directory, key, _SIZE)) as size:
+                entries[key] = int(size.read() or 0)
+        return evict(
+            entries, self._limit, lambda key: key != keep and self._remove(key)
+        )
+
+    def _remove(self, key: str) -> bool:
+        """Removes an environment unless it is being cloned."""
+        entry: str = os.path.join(self._directory, key)
+        lock: FileLock = FileLock(f"{entry}.lock")
+        if not lock.acquire(blocking=False):
+            return False
+        try:
+            shutil.rmtree(entry, ignore_errors=True)
+        finally:
+            lock.release()
+        return True
+
+
+def _bundled() -> Dict[str, bytes]:
+    """Returns bundled template requirement files by name."""
+    bundle: Bundle = Bundle.load()
+    return {
+        template.value: bytes(bundle.read(template.value))
+        for template in REQUIREMENTS
+    }
+
+
+def _used(entry: str) -> float:
+    """Returns time an environment was last used."""
+    try:
+        return os.stat(os.path.join(entry, _USED)).st_mtime
+    except FileNotFoundError:
+        return os.stat(entry).st_mtime
+
+
+def _size(directory: str) -> int:
+    """Returns total size of files in a directory."""
+    return sum(
+        os.lstat(os.path.join(path, name)).st_size
+        for path, _, names in os.walk(directory)
+        for name in names
+    )
+
+
+def _clone(source: str, origin: str, target: str) -> None:
+    """Clones an environment fixing paths that point to its origin.
+
+    Bytecode caches are skipped as they embed paths of an origin.
+    """
+    for path, directories, names in os.walk(source):
+        destination: str = os.path.join(target, os.path.relpath(path, source))
+        os.makedirs(destination, exist_ok=True)
+        for name in list(directories):
+            if os.path.islink(os.path.join(path, name)):
+                names.append(name)
+                directories.remove(name)
+            elif name == "__pycache__":
+                directories.remove(name)
+        for name in names:
+            if name not in (_ORIGIN, _SIZE, _USED):
+                _copy(
+                    os.path.relpath(os.path.join(path, name), source),
+                    source,
+                    origin,
+                    target,
+                )
+
+
+def _copy(path: str, source: str, origin: str, target: str) -> None:
+    """Copies a file of an environment into its clone.
+
+    Files inside `site-packages` are hardlinked, except `.pth` files that
+    may refer to absolute paths. Scripts and configs are rewritten.
+    """
+    item: str = os.path.join(source, path)
+    copy: str = os.path.join(target, path)
+    if os.path.islink(item):
+        os.symlink(os.readlink(item), copy)
+    elif _SITE in path.split(os.sep) and not path.endswith(".pth"):
+        try:
+            os.link(item, copy)
+        except OSError:
+            shutil.copy2(item, copy)
+    else:
+        with open(item, "rb") as file:  # type: IO[bytes]
+            content: bytes = file.read()
+        with open(copy, "wb") as file:
+            file.write(
+                content.replace(origin.encode("utf-8"), target.encode("utf-8"))
+            )
+        shutil.copymode(item, copy)
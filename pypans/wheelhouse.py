@@ -0,0 +1,147 @@
+"""Contains interfaces for installing requirements from a local wheelhouse."""
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, IO, Iterable, List, Optional, Pattern, Tuple
+from pypans.bundle import Bundle
+from pypans.cache import cache_dir
+from pypans.file import Template
+
+_NAME: Pattern[str] = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+REQUIREMENTS: Tuple[Template, ...] = (
+    Template.REQUIREMENTS,
+    Template.DEV_REQUIREMENTS,
+)
+
+
+def normalize(name: str) -> str:
+    """Returns canonical distribution name.
+
+    Args:
+        name (str): distribution name
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def requirement_names(lines: Iterable[str]) -> List[str]:
+    """Returns canonical names of requirements.
+
+    Args:
+        lines (Iterable[str]): lines of requirements file
+    """
+    return [
+        normalize(match.group(1))
+        for match in map(_NAME.match, lines)
+        if match and not match.group(1).startswith("-")
+    ]
+
+
+def template_requirements() -> List[str]:
+    """Returns canonical names of template requirements."""
+    bundle: Bundle = Bundle.load()
+    return [
+        name
+        for template in REQUIREMENTS
+        for name in requirement_names(
+            str(bundle.read(template.value), "utf-8").splitlines()
+        )
+    ]
+
+
+def project_requirements(*roots: str) -> List[str]:
+    """Returns canonical names of requirements of scaffolded projects.
+
+    Missing requirements files are skipped, e.g in monorepo packages.
+
+    Args:
+        roots (str): project root directories
+    """
+    names: Dict[str, None] = {}
+    for root in roots:
+        for template in REQUIREMENTS:  # type: Template
+            path: str = os.path.join(root, template.value)
+            if os.path.isfile(path):
+                with open(path) as file:  # type: IO[str]
+                    lines: List[str] = file.read().splitlines()
+                names.update(dict.fromkeys(requirement_names(lines)))
+    return list(names)
+
+
+@dataclass(frozen=True)
+class WheelhouseReport:
+    """Represents requirements found and missing in a wheelhouse."""
+
+    hits: Tuple[str, ...]
+    misses: Tuple[str, ...]
+
+    def __str__(self) -> str:
+        """Returns human readable report."""
+        missing: str = f" {list(self.misses)}" if self.misses else ""
+        return f"{len(self.hits)} hits, {len(self.misses)} misses{missing}"
+
+
+class Wheelhouse:
+    """Represents local directory of prebuilt wheels."""
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self._directory: str = directory or cache_dir("wheelhouse")
+
+    @property
+    def directory(self) -> str:
+        """Returns wheelhouse location."""
+        return self._directory
+
+    def build(self) -> "subprocess.CompletedProcess[str]":
+        """Downloads and builds wheels for all template requirements."""
+        bundle: Bundle = Bundle.load()
+        with tempfile.TemporaryDirectory() as directory:
+            arguments: List[str] = []
+            for template in REQUIREMENTS:  # type: Template
+                path: str = os.path.join(directory, template.value)
+                with open(path, "wb") as file:  # type: IO[bytes]
+                    file.write(bundle.read(template.value))
+                arguments.extend(("-r", path))
+            return subprocess.run(
+                (
+                    sys.executable,
+                    "-m",
+                    "pip",
+                    "wheel",
+                    "--wheel-dir",
+                    self._directory,
+                    *arguments,
+                ),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                check=False,
+            )
+
+    def wheels(self) -> Dict[str, List[str]]:
+        """Returns wheel file names by canonical distribution name."""
+        wheels: Dict[str, List[str]] = {}
+        for name in os.listdir(self._directory):
+            if name.endswith(".whl"):
+                distribution: str = normalize(name.split("-")[0])
+                wheels.setdefault(distribution, []).append(name)
+        return wheels
+
+    def report(self, requirements: Iterable[str]) -> WheelhouseReport:
+        """Returns which requirements are available in a wheelhouse.
+
+        Args:
+            requirements (Iterable[str]): canonical requirement names
+        """
+        wheels: Dict[str, List[str]] = self.wheels()
+        hits: List[str] = []
+        misses: List[str] = []
+        for name in requirements:
+            (hits if name in wheels else misses).append(name)
+        return WheelhouseReport(tuple(hits), tuple(misses))
+
+    def options(self) -> Tuple[str, ...]:
+        """Returns `pip install` options restricting it to a wheelhouse."""
+        return ("--no-index", "--find-links", self._directory)
@@ -47,7 +47,14 @@ if __name__ == "__main__":
         long_description_content_type="text/markdown",
         url=f"https://github.com/vyahello/{__name}",
         packages=__find_packages(
-            exclude=("*.tests", "*.tests.*", "tests.*", "tests")
+            exclude=(
+                "*.tests",
+                "*.tests.*",
+                "tests.*",
+                "tests",
+                "benchmarks",
+                "benchmarks.*",
+            )
         ),
         include_package_data=True,
         install_requires=__requirements(),
@@ -59,5 +66,5 @@ if __name__ == "__main__":
             "Operating System :: OS Independent",
         ),
         python_requires=">=3.6",
-        entry_points={"console_scripts": ("pypan = pypans.__main__:_easypan",)},
+        entry_points={"console_scripts": ("pypan = pypans.__main__:main",)},
     )
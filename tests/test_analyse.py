@@ -0,0 +1,90 @@
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import List
+from _pytest.monkeypatch import MonkeyPatch
+import pytest
+from pypans.project import Project, User
+from tests.markers import unit
+
+pytestmark = unit
+
+_TOOL: str = """
+import sys
+with open("calls.log", "a") as log:
+    log.write(" ".join(sorted(sys.argv[1:])) + "\\n")
+failed = False
+for path in sys.argv[1:]:
+    with open(path) as source:
+        if "bad" in source.read():
+            print(f"{path}:1: bad code\\n    explained")
+            failed = True
+sys.exit(int(failed))
+"""
+
+
+@pytest.fixture()
+def runner(tmp_path: Path, monkeypatch: MonkeyPatch) -> ModuleType:
+    project: Project = Project("bomber", User("John", "j@u.com"), str(tmp_path))
+    project.build_package()
+    project.build_meta()
+    project.commit()
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "tool.py").write_text(_TOOL)
+    (tmp_path / "bomber" / "engine.py").write_text("import bomber.fuel\n")
+    (tmp_path / "bomber" / "fuel.py").write_text("")
+    spec = importlib.util.spec_from_file_location(
+        "runner", str(tmp_path / "analyse-source-code.py")
+    )
+    module: ModuleType = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)  # type: ignore
+    module.FILE_CHECKS = {  # type: ignore
+        "pylint": module.FileCheck(  # type: ignore
+            (sys.executable, "tool.py"), ("bomber",), (".pylintrc",), True
+        )
+    }
+    return module
+
+
+def _run(runner: ModuleType) -> List[str]:
+    if os.path.exists("calls.log"):
+        os.remove("calls.log")
+    for function in (runner.dependencies, runner._hash, runner._modules):
+        function.cache_clear()
+    runner.analyse("pylint")
+    if not os.path.exists("calls.log"):
+        return []
+    with open("calls.log") as log:
+        return log.read().split()
+
+
+def test_unchanged_files_are_replayed(
+    tmp_path: Path, runner: ModuleType
+) -> None:
+    (tmp_path / "bomber" / "fuel.py").write_text("bad = 1\n")
+    assert len(_run(runner)) == 4
+    assert _run(runner) == []
+    outcome = runner.analyse("pylint")
+    assert outcome.returncode == 1
+    assert outcome.output == "bomber/fuel.py:1: bad code\n    explained\n"
+
+
+def test_dependents_are_analysed_again(
+    tmp_path: Path, runner: ModuleType
+) -> None:
+    _run(runner)
+    (tmp_path / "bomber" / "fuel.py").write_text("FUEL = 1\n")
+    assert _run(runner) == ["bomber/engine.py", "bomber/fuel.py"]
+    (tmp_path / "bomber" / "engine.py").write_text("")
+    assert _run(runner) == ["bomber/engine.py"]
+
+
+def test_config_change_invalidates_cache(
+    tmp_path: Path, runner: ModuleType
+) -> None:
+    _run(runner)
+    with open(tmp_path / ".pylintrc", "a") as pylintrc:
+        pylintrc.write("\n# changed\n")
+    assert len(_run(runner)) == 4
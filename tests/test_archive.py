@@ -0,0 +1,88 @@
+import io
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import Any, IO
+from _pytest.monkeypatch import MonkeyPatch
+import pytest
+from pypans.archive import ArchiveFormat, ArchiveWriter
+from pypans.batch import ProjectSpec, archive_all
+from pypans.stage import StagedTree
+from pypans.stream import StreamedFile
+from tests.markers import unit
+
+pytestmark = unit
+
+_SPECS = (
+    ProjectSpec("bomber", "John Udot", "j@u.com", "bomber"),
+    ProjectSpec("tank", "John Udot", "j@u.com", "tank"),
+)
+
+
+class _Pipe(io.RawIOBase):
+    def __init__(self) -> None:
+        self.content: bytes = b""
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        raise OSError("pipe")
+
+    def write(self, content: Any) -> int:
+        self.content += bytes(content)
+        return len(content)
+
+
+def _archive(archive_format: ArchiveFormat) -> bytes:
+    pipe: _Pipe = _Pipe()
+    archive_all(_SPECS, pipe, archive_format)  # type: ignore
+    return pipe.content
+
+
+@pytest.mark.parametrize("archive_format", tuple(ArchiveFormat))
+def test_archives_are_deterministic(
+    tmp_path: Path, monkeypatch: MonkeyPatch, archive_format: ArchiveFormat
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    assert _archive(archive_format) == _archive(archive_format)
+    assert not os.listdir(tmp_path)
+
+
+def test_tar_keeps_modes() -> None:
+    with tarfile.open(
+        fileobj=io.BytesIO(_archive(ArchiveFormat.TAR_GZ)), mode="r:gz"
+    ) as archive:  # type: tarfile.TarFile
+        assert archive.getmember("bomber/analyse-source-code.sh").mode == 0o755
+        assert archive.getmember("tank/setup.py").mode == 0o644
+        assert archive.getmember("tank").isdir()
+        assert (
+            b"bomber"
+            in archive.extractfile("bomber/README.md").read()  # type: ignore
+        )
+
+
+def test_zip_keeps_modes() -> None:
+    with zipfile.ZipFile(io.BytesIO(_archive(ArchiveFormat.ZIP))) as archive:
+        info: zipfile.ZipInfo = archive.getinfo("bomber/analyse-source-code.sh")
+        assert (info.external_attr >> 16) & 0o777 == 0o755
+        assert archive.testzip() is None
+
+
+def test_streamed_files_are_archived(tmp_path: Path) -> None:
+    source = tmp_path / "large.txt"
+    source.write_bytes(b"<package>\n" * 1000)
+    tree: StagedTree = StagedTree()
+    tree.add("large.txt", StreamedFile(str(source), {b"<package>": b"x"}))
+    stream: IO[bytes] = io.BytesIO()
+    with ArchiveWriter(stream, ArchiveFormat.TAR) as writer:
+        writer.add_tree(tree, "bomber")
+    stream.seek(0)
+    with tarfile.open(fileobj=stream) as archive:  # type: tarfile.TarFile
+        assert archive.extractfile(  # type: ignore
+            "bomber/large.txt"
+        ).read() == (b"x\n" * 1000)
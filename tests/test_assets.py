@@ -0,0 +1,43 @@
+import os
+from pathlib import Path
+from pypans.assets import AssetStore, Materialization
+from pypans.stage import StagedTree
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def test_materialize_asset(tmp_path: Path) -> None:
+    store: AssetStore = AssetStore(str(tmp_path / "assets"))
+    digest: str = store.put(b"[flake8]")
+    assert store.put(b"[flake8]") == digest
+    assert store.materialize(digest, str(tmp_path / ".flake8")) in (
+        Materialization.REFLINK,
+        Materialization.HARDLINK,
+    )
+    assert (tmp_path / ".flake8").read_bytes() == b"[flake8]"
+
+
+def test_stage_linked_assets(tmp_path: Path) -> None:
+    store: AssetStore = AssetStore(str(tmp_path / "assets"))
+    for project in ("bomber", "tank"):
+        tree: StagedTree = StagedTree(store)
+        tree.add(".flake8", b"[flake8]", digest=store.put(b"[flake8]"))
+        tree.add("README.md", f"# {project}")
+        tree.commit(str(tmp_path / project))
+    bomber: os.stat_result = os.stat(tmp_path / "bomber" / ".flake8")
+    tank: os.stat_result = os.stat(tmp_path / "tank" / ".flake8")
+    assert (tmp_path / "tank" / "README.md").read_text() == "# tank"
+    assert bomber.st_ino == tank.st_ino or bomber.st_nlink == 1
+
+
+def test_stored_assets_are_read_only(tmp_path: Path) -> None:
+    store: AssetStore = AssetStore(str(tmp_path / "assets"))
+    digest: str = store.put(b"#!/usr/bin/env bash", mode=0o755)
+    assert os.stat(store.path(digest, 0o755)).st_mode & 0o777 == 0o555
+    target: str = str(tmp_path / "run.sh")
+    if store.materialize(digest, target, 0o755) == Materialization.HARDLINK:
+        assert not os.stat(target).st_mode & 0o222
+    else:
+        assert os.stat(target).st_mode & 0o777 == 0o755
+    assert os.access(target, os.X_OK)
@@ -0,0 +1,74 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+from pypans import trace
+from pypans.batch import (
+    BuildResult,
+    ProjectSpec,
+    build,
+    build_all,
+    read_manifest,
+)
+from pypans.stages import ScaffoldOptions
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def test_read_manifest(tmp_path: Path) -> None:
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "root": "services",
+                "projects": [
+                    {"name": "bomber", "user": "John", "email": "j@u.com"},
+                    {
+                        "name": "tank",
+                        "user": "John",
+                        "email": "j@u.com",
+                        "git": "git@github.com:john/tank.git",
+                    },
+                ],
+            }
+        )
+    )
+    assert read_manifest(str(manifest)) == (
+        ProjectSpec("bomber", "John", "j@u.com", "services/bomber"),
+        ProjectSpec(
+            "tank",
+            "John",
+            "j@u.com",
+            "services/tank",
+            git="git@github.com:john/tank.git",
+        ),
+    )
+
+
+def test_project_errors_are_reported(tmp_path: Path) -> None:
+    result: BuildResult = build(
+        ProjectSpec("bomber", "John", "j@u.com", str(tmp_path / "bomber")),
+        ScaffoldOptions(profile="unknown"),
+    )
+    assert not result.passed
+    assert "unknown" in result.error
+    assert not (tmp_path / "bomber").exists()
+
+
+def test_batch_trace_merges_worker_events(tmp_path: Path) -> None:
+    tracer: trace.Tracer = trace.enable()
+    try:
+        results: List[BuildResult] = list(
+            build_all(
+                [ProjectSpec("bomber", "John", "j@u.com", str(tmp_path))],
+                workers=1,
+            )
+        )
+    finally:
+        trace.disable()
+    assert results[0].passed
+    events: List[Dict[str, Any]] = tracer.events()
+    assert any(event["name"] == "project" for event in events)
+    assert all(event["pid"] != os.getpid() for event in events)
+    assert all(event["ts"] >= 0 for event in events if event["ph"] == "X")
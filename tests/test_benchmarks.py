@@ -0,0 +1,27 @@
+import os
+from pathlib import Path
+from benchmarks.scaffold import STAGES, compare
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def test_end_to_end_stage(tmp_path: Path) -> None:
+    STAGES["end_to_end"](str(tmp_path), 2)
+    assert sorted(os.listdir(tmp_path)) == ["0", "1"]
+    assert (tmp_path / "1" / "bomber1" / "__init__.py").exists()
+
+
+def test_compare_reports_regressions() -> None:
+    baseline = {"end_to_end/10": {"seconds": 1.0, "files": 300}}
+    assert compare(
+        {"end_to_end/10": {"seconds": 1.2, "files": 301}},
+        baseline,
+        {"seconds": 0.25, "files": 0.0},
+    ) == ["end_to_end/10 files: 301 > 300 (+0% allowed)"]
+    assert compare(
+        {"end_to_end/10": {"seconds": 1.3, "files": 300}},
+        baseline,
+        {"seconds": 0.25},
+    ) == ["end_to_end/10 seconds: 1.3 > 1 (+25% allowed)"]
+    assert not compare({"new/1": {"seconds": 9.0}}, baseline, {"seconds": 0})
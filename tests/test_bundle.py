@@ -0,0 +1,27 @@
+from pypans.bundle import BUNDLE, Bundle, Entry, pack
+from pypans.file import Template
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def test_bundle_is_up_to_date() -> None:
+    with open(f"pypans/{BUNDLE}", "rb") as bundle:
+        assert bundle.read() == pack(
+            "pypans/template"
+        ), "Template bundle is stale, please run `python -m pypans.bundle`"
+
+
+def test_read_bundled_file() -> None:
+    bundle: Bundle = Bundle.load()
+    with open("pypans/template/.pylintrc", "rb") as pylintrc:
+        assert bundle.read(".pylintrc") == pylintrc.read()
+    assert {entry.name for entry in bundle} == {str(item) for item in Template}
+
+
+def test_table_of_contents() -> None:
+    bundle: Bundle = Bundle.load()
+    runner: Entry = bundle.entry(str(Template.RUNNER))
+    assert runner.placeholders
+    assert runner.mode == 0o755
+    assert any(entry.name == Template.ICON.value for entry in bundle.static())
@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+from typing import Tuple
+import pytest
+from click.testing import CliRunner, Result
+from pypans.cli import _easypan
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def _batch(root: Path, *options: str) -> Result:
+    manifest: Path = root / "projects.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "root": str(root),
+                "projects": [
+                    {"name": "bomber", "user": "John", "email": "j@u.com"}
+                ],
+            }
+        )
+    )
+    return CliRunner().invoke(
+        _easypan, ["--batch", str(manifest), "--workers", "1", *options]
+    )
+
+
+def test_version() -> None:
+    result: Result = CliRunner().invoke(_easypan, ["--version"])
+    assert result.exit_code == 0, result.output
+    assert "Version" in result.output
+
+
+@pytest.mark.parametrize(
+    ("options", "service"), [((), False), (("--service", "wsgi"), True)]
+)
+def test_batch_with_and_without_service(
+    tmp_path: Path, options: Tuple[str, ...], service: bool
+) -> None:
+    result: Result = _batch(tmp_path, *options)
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "bomber" / "setup.py").is_file()
+    assert (tmp_path / "bomber" / "gunicorn.conf.py").is_file() is service
+
+
+def test_unknown_service_is_rejected(tmp_path: Path) -> None:
+    assert _batch(tmp_path, "--service", "cgi").exit_code == 2
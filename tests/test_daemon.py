@@ -0,0 +1,127 @@
+import io
+import socket
+import tarfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+import pytest
+from pypans.daemon import ScaffoldServer, ServerStats, request
+from tests.markers import unit
+
+pytestmark = unit
+
+
+@pytest.fixture()
+def daemon(tmp_path: Path) -> Iterator[str]:
+    path: str = str(tmp_path / "pypan.sock")
+    server: ScaffoldServer = ScaffoldServer(path, workers=2)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield path
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def _project(root: str, name: str = "bomber") -> Dict[str, Any]:
+    return {"name": name, "user": "John", "email": "j@u.com", "root": root}
+
+
+def test_daemon_scaffolds_concurrently(tmp_path: Path, daemon: str) -> None:
+    assert request(daemon, {"command": "health"})["ok"]
+    with ThreadPoolExecutor(4) as pool:
+        responses: List[Dict[str, Any]] = list(
+            pool.map(
+                lambda index: request(
+                    daemon,
+                    {
+                        "command": "scaffold",
+                        **_project(str(tmp_path / f"p{index}"), f"p{index}"),
+                    },
+                ),
+                range(6),
+            )
+        )
+    assert all(response["ok"] for response in responses), responses
+    assert (tmp_path / "p5" / "p5" / "__init__.py").is_file()
+    stats: Dict[str, Any] = request(daemon, {"command": "stats"})
+    assert (stats["served"], stats["failed"]) == (6, 0)
+    assert 0 < stats["latency"]["p50"] <= stats["latency"]["p99"]
+
+
+def test_daemon_streams_archive(tmp_path: Path, daemon: str) -> None:
+    output: io.BytesIO = io.BytesIO()
+    response: Dict[str, Any] = request(
+        daemon,
+        {"command": "archive", "format": "tar", **_project("unused")},
+        output,
+    )
+    assert response["ok"]
+    with tarfile.open(fileobj=io.BytesIO(output.getvalue())) as archive:
+        assert archive.getmember("bomber/setup.py").isfile()
+    assert not (tmp_path / "unused").exists()
+
+
+def test_daemon_reports_bad_requests(daemon: str) -> None:
+    assert "name" in request(daemon, {"command": "scaffold"})["error"]
+    assert not request(daemon, {"command": "deploy", **_project(".")})["ok"]
+    assert not request(daemon, {**_project("."), "options": {"unknown": True}})[
+        "ok"
+    ]
+    assert request(daemon, {"command": "stats"})["failed"] == 3
+
+
+def test_daemon_rejects_server_options(tmp_path: Path, daemon: str) -> None:
+    response: Dict[str, Any] = request(
+        daemon,
+        {
+            **_project(str(tmp_path / "bomber")),
+            "options": {"profile": "perf", "source": str(tmp_path)},
+        },
+    )
+    assert not response["ok"]
+    assert "['source'] can not be set by a client" in response["error"]
+    assert not (tmp_path / "bomber").exists()
+
+
+def test_stale_socket_is_replaced(tmp_path: Path) -> None:
+    path: str = str(tmp_path / "stale.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    server: ScaffoldServer = ScaffoldServer(path)
+    with pytest.raises(ValueError, match="already served"):
+        ScaffoldServer(path)
+    server.server_close()
+
+
+def test_latency_percentiles() -> None:
+    stats: ServerStats = ServerStats(window=100)
+    for millisecond in range(1, 201):
+        stats.record(millisecond / 1000, passed=True)
+    assert stats.snapshot()["latency"] == {
+        "p50": 150.0,
+        "p90": 190.0,
+        "p99": 199.0,
+    }
+
+
+def test_daemon_reports_failed_archives(tmp_path: Path, daemon: str) -> None:
+    output: io.BytesIO = io.BytesIO()
+    response: Dict[str, Any] = request(
+        daemon,
+        {
+            "command": "archive",
+            **_project("unused"),
+            "options": {"pack": "missing"},
+        },
+        output,
+    )
+    assert not response["ok"]
+    assert not output.getvalue()
+    (tmp_path / "file").write_text("")
+    assert not request(daemon, _project(str(tmp_path / "file" / "bomber")))[
+        "ok"
+    ]
+    assert request(daemon, {"command": "stats"})["failed"] == 2
@@ -0,0 +1,54 @@
+from pathlib import Path
+import pytest
+from pypans.lock import Locker, lock_requirements
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def _distribution(site: Path, name: str, version: str, *requires: str) -> None:
+    info = site / f"{name}-{version}.dist-info"
+    info.mkdir()
+    dependencies: str = "".join(
+        f"Requires-Dist: {requirement}\n" for requirement in requires
+    )
+    (info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+        f"{dependencies}"
+    )
+
+
+def test_lock_closure(tmp_path: Path) -> None:
+    _distribution(
+        tmp_path,
+        "Flask",
+        "1.1.2",
+        "Jinja2 (>=2.10.1)",
+        "python-dotenv ; extra == 'dotenv'",
+        "ancient ; python_version < '3'",
+    )
+    _distribution(tmp_path, "Jinja2", "2.11.2", "MarkupSafe (>=0.23)")
+    _distribution(tmp_path, "MarkupSafe", "1.1.1")
+    _distribution(tmp_path, "python_dotenv", "0.15.0")
+    _distribution(tmp_path, "unrelated", "1.0.0")
+    locker: Locker = Locker([str(tmp_path)])
+    assert locker.lock(["flask"]) == [
+        "Flask==1.1.2",
+        "Jinja2==2.11.2",
+        "MarkupSafe==1.1.1",
+    ]
+    assert "python_dotenv==0.15.0" in locker.lock(["Flask[dotenv]", "missing"])
+
+
+def test_lock_keeps_unresolved_requirements(tmp_path: Path) -> None:
+    site = tmp_path / "venv" / "lib" / "python3.8" / "site-packages"
+    site.mkdir(parents=True)
+    _distribution(site, "Jinja2", "2.11.2")
+    (tmp_path / "requirements.txt").write_text(
+        "jinja2>=2  # templates\nfastapi>=0.60\n-e ./service\n"
+    )
+    with pytest.warns(UserWarning, match="fastapi"):
+        lock_requirements(str(tmp_path), str(tmp_path / "venv"))
+    assert (tmp_path / "requirements.txt").read_text() == (
+        "Jinja2==2.11.2\nfastapi>=0.60\n-e ./service\n"
+    )
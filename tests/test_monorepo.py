@@ -0,0 +1,80 @@
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+from _pytest.monkeypatch import MonkeyPatch
+from pypans.batch import BuildResult, ProjectSpec, build
+from pypans.monorepo import MEMBERS, Monorepo, SHARED
+from pypans.stages import ScaffoldOptions
+from pypans.update import UpdateReport, update
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def _add(root: str, name: str, profile: str = "default") -> None:
+    result: BuildResult = build(
+        ProjectSpec(name, "John Udot", "j@u.com", "ignored"),
+        ScaffoldOptions(monorepo=root, profile=profile),
+    )
+    assert result.passed, result.error
+
+
+def test_packages_share_toolchain(tmp_path: Path) -> None:
+    _add(str(tmp_path), "bomber")
+    _add(str(tmp_path), "tank", profile="perf")
+    assert Monorepo(str(tmp_path)).packages() == ("bomber", "tank")
+    assert not (tmp_path / "ignored").exists()
+    for template in SHARED:
+        assert (tmp_path / template.value).is_file()
+        assert not (tmp_path / "bomber" / template.value).exists()
+    assert (tmp_path / "tank" / "tank" / "__init__.py").is_file()
+    assert (tmp_path / "tank" / "requirements.txt").is_file()
+    requirements = (tmp_path / "requirements-dev.txt").read_text().split()
+    assert {"pylint", "pytest-benchmark"} <= set(requirements)
+    assert len(requirements) == len(set(requirements))
+
+
+def test_root_runner_analyses_all_packages(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    _add(str(tmp_path), "bomber")
+    _add(str(tmp_path), "tank")
+    monkeypatch.chdir(tmp_path)
+    assert (tmp_path / MEMBERS).read_text() == "bomber\ntank\n"
+    spec = importlib.util.spec_from_file_location(
+        "runner", str(tmp_path / "analyse-source-code.py")
+    )
+    runner: ModuleType = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(runner)  # type: ignore
+    assert runner.CHECKS["mypy"] == (  # type: ignore
+        "mypy",
+        "--incremental",
+        "--package",
+        "bomber",
+        "--package",
+        "tank",
+    )
+    assert runner.DIRECTORIES["unittests"] == ("bomber", "tank")  # type: ignore
+    assert runner.ENV["MYPYPATH"] == "bomber:tank"  # type: ignore
+    assert runner.sources(*runner.PACKAGES) == [  # type: ignore
+        "bomber/bomber/__init__.py",
+        "bomber/bomber/__main__.py",
+        "tank/tank/__init__.py",
+        "tank/tank/__main__.py",
+    ]
+
+
+def test_update_keeps_shared_files_in_root(tmp_path: Path) -> None:
+    _add(str(tmp_path), "bomber")
+    report: UpdateReport = update(str(tmp_path / "bomber"))
+    assert not report
+    assert not (tmp_path / "bomber" / ".pylintrc").exists()
+
+
+def test_dev_requirements_are_merged_by_name(tmp_path: Path) -> None:
+    (tmp_path / "requirements-dev.txt").write_text("PyTest==5.4.1\n")
+    _add(str(tmp_path), "bomber")
+    requirements = (tmp_path / "requirements-dev.txt").read_text().split()
+    assert requirements[0] == "PyTest==5.4.1"
+    assert "pytest" not in requirements
+    assert "pylint" in requirements
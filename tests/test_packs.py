@@ -0,0 +1,91 @@
+import json
+import os
+from pathlib import Path
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from pypans.packs import Pack, PackIndex
+from pypans.project import Project, ProjectOptions, User
+from pypans.render import Placeholder
+from pypans.stage import StagedTree
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def _install(site: Path, name: str = "cli", package: str = "demo_pack") -> None:
+    (site / package).mkdir(parents=True)
+    (site / package / "__init__.py").write_text("")
+    (site / package / "cli.py").write_text('"""<package> cli."""\n')
+    (site / package / "pack.json").write_text(
+        json.dumps(
+            {
+                "placeholders": ["<package>"],
+                "files": {"<package>/cli.py": "cli.py"},
+            }
+        )
+    )
+    info = site / f"{package}-1.0.dist-info"
+    info.mkdir()
+    (info / "METADATA").write_text(f"Name: {package}\nVersion: 1.0\n")
+    (info / "entry_points.txt").write_text(
+        f"[pypans.packs]\n{name} = {package}\n"
+    )
+
+
+def test_index_is_cached_until_site_changes(tmp_path: Path) -> None:
+    site = tmp_path / "site"
+    _install(site)
+    index: PackIndex = PackIndex([str(site)], str(tmp_path))
+    assert index.packs() == {
+        "cli": Pack("cli", "demo_pack", "demo_pack", "1.0")
+    }
+    (location,) = [
+        name for name in os.listdir(tmp_path) if name.endswith(".json")
+    ]
+    cached = json.loads((tmp_path / location).read_text())
+    assert PackIndex([str(site)], str(tmp_path)).fingerprint() == (
+        cached["fingerprint"]
+    )
+    _install(site, name="web", package="web_pack")
+    assert sorted(PackIndex([str(site)], str(tmp_path)).packs()) == [
+        "cli",
+        "web",
+    ]
+
+
+def test_pack_files_are_staged(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    site = tmp_path / "site"
+    _install(site)
+    monkeypatch.syspath_prepend(str(site))
+    project: Project = Project(
+        "bomber",
+        User("John", "j@u.com"),
+        str(tmp_path / "bomber"),
+        ProjectOptions(pack=PackIndex([str(site)], str(tmp_path)).get("cli")),
+    )
+    project.build_package()
+    project.build_pack()
+    project.commit()
+    assert (tmp_path / "bomber" / "bomber" / "cli.py").read_text() == (
+        '"""bomber cli."""\n'
+    )
+    assert project.manifest().pack == "cli"
+    assert project.manifest().files[os.path.join("bomber", "cli.py")].template
+
+
+def test_pack_targets_outside_root_are_rejected(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    site = tmp_path / "site"
+    _install(site, name="escape", package="escape_pack")
+    monkeypatch.syspath_prepend(str(site))
+    manifest = site / "escape_pack" / "pack.json"
+    pack: Pack = PackIndex([str(site)], str(tmp_path)).get("escape")
+    for target in ("<package>/../../cli.py", "/tmp/cli.py"):
+        manifest.write_text(json.dumps({"files": {target: "cli.py"}}))
+        tree: StagedTree = StagedTree()
+        with pytest.raises(ValueError, match="outside of a project root"):
+            pack.stage(tree, {Placeholder.PACKAGE: "bomber"})
+        assert not len(tree)
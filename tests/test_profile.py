@@ -0,0 +1,65 @@
+import json
+import os
+import py_compile
+import subprocess
+import sys
+from pathlib import Path
+from pypans.manifest import MANIFEST
+from pypans.project import Profile, Project, ProjectOptions, User
+from pypans.update import update
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def _generate(root: str) -> None:
+    project: Project = Project(
+        "bomber",
+        User("John", "j@u.com"),
+        root,
+        ProjectOptions(profile=Profile.PERF),
+    )
+    project.build_package()
+    project.build_tests()
+    project.build_meta()
+    project.build_profile()
+    project.commit()
+
+
+def test_perf_profile_generates_benchmarks(tmp_path: Path) -> None:
+    _generate(str(tmp_path))
+    for name in ("__init__.py", "conftest.py", "test_sample.py"):
+        py_compile.compile(str(tmp_path / "benchmarks" / name), doraise=True)
+    assert "--numprocesses=auto" in (tmp_path / "pytest.ini").read_text()
+    assert "--no-cov" in (tmp_path / "benchmarks" / "pytest.ini").read_text()
+    requirements = (tmp_path / "requirements-dev.txt").read_text().split()
+    assert {"pytest-benchmark", "pytest-xdist", "pytest"} <= set(requirements)
+
+
+def test_profile_fixture_dumps_hot_spots(tmp_path: Path) -> None:
+    _generate(str(tmp_path))
+    (tmp_path / "benchmarks" / "test_sample.py").write_text(
+        "def test_sum() -> None:\n    assert sum(range(10)) == 45\n"
+    )
+    (tmp_path / "benchmarks" / "pytest.ini").write_text("[pytest]\n")
+    subprocess.run(
+        (sys.executable, "-m", "pytest", "-q", "benchmarks", "--profile"),
+        cwd=str(tmp_path),
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    report = (
+        tmp_path / ".benchmarks" / "profiles" / "test_sum.txt"
+    ).read_text()
+    assert "function calls" in report
+
+
+def test_update_keeps_profile(tmp_path: Path) -> None:
+    _generate(str(tmp_path))
+    path = tmp_path / MANIFEST
+    data = json.loads(path.read_text())
+    data["version"] = "0.0.0"
+    path.write_text(json.dumps(data))
+    assert not update(str(tmp_path)).updated
+    assert os.path.isfile(tmp_path / "benchmarks" / "conftest.py")
+    assert json.loads(path.read_text())["profile"] == "perf"
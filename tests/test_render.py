@@ -0,0 +1,47 @@
+import pytest
+from pypans.bundle import Bundle
+from pypans.file import Template
+from pypans.render import Placeholder, RenderPlan, TemplateRenderer
+from tests.markers import unit
+
+pytestmark = unit
+
+
+@pytest.fixture()
+def variables() -> dict:
+    return {
+        Placeholder.PACKAGE: "bomber",
+        Placeholder.USERNAME: "John Udot",
+        Placeholder.EMAIL: "john@udot.com",
+        Placeholder.YEAR: "2020",
+        Placeholder.DATE: "08.11.2020",
+        Placeholder.VERSION: "3.8.2",
+    }
+
+
+def test_render_plan(variables: dict) -> None:
+    plan: RenderPlan = RenderPlan.parse("# <package> by <username> <foo>")
+    assert plan.render(variables) == "# bomber by John Udot <foo>"
+    assert plan.placeholders == {Placeholder.PACKAGE, Placeholder.USERNAME}
+    assert plan.unknown == {"<foo>"}
+
+
+def test_render_plan_aliases(variables: dict) -> None:
+    plan: RenderPlan = RenderPlan.parse(
+        "from tooling import app", {"tooling": Placeholder.PACKAGE}
+    )
+    assert plan.render(variables) == "from bomber import app"
+
+
+def test_static_plan() -> None:
+    assert RenderPlan.parse("[flake8]").is_static
+
+
+def test_render_templates(variables: dict) -> None:
+    renderer: TemplateRenderer = TemplateRenderer(Bundle.load())
+    assert b"Copyright (c) 2020 John Udot" in renderer.render(
+        Template.LICENSE, variables
+    )
+    with open("pypans/template/icon.png", "rb") as icon:
+        assert bytes(renderer.render(Template.ICON, variables)) == icon.read()
+    assert not renderer.report(variables)
@@ -0,0 +1,51 @@
+import os
+from pathlib import Path
+from pypans.file import Template
+from pypans.project import Project, ProjectCaches, ProjectOptions, User
+from pypans.render import Placeholder
+from pypans.rendercache import RenderCache
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def _build(root: str, cache: RenderCache) -> Project:
+    project: Project = Project(
+        "bomber",
+        User("John", "j@u.com"),
+        root,
+        ProjectOptions(ProjectCaches(renders=cache)),
+    )
+    project.build_meta()
+    project.commit()
+    return project
+
+
+def test_repeat_scaffold_is_served_from_cache(tmp_path: Path) -> None:
+    cache: RenderCache = RenderCache(str(tmp_path / "cache"))
+    first: Project = _build(str(tmp_path / "first"), cache)
+    second: Project = _build(str(tmp_path / "second"), cache)
+    stats = cache.stats()
+    assert stats.misses == stats.hits == stats.entries > 0
+    assert bytes(second.tree.read(str(Template.SETUP))) == bytes(
+        first.tree.read(str(Template.SETUP))
+    )
+
+
+def test_key_includes_time_dependent_variables() -> None:
+    variables = {Placeholder.PACKAGE: "bomber", Placeholder.YEAR: "2020"}
+    assert RenderCache.key("sha", variables) == RenderCache.key(
+        "sha", dict(reversed(list(variables.items())))
+    )
+    assert RenderCache.key("sha", variables) != RenderCache.key(
+        "sha", {**variables, Placeholder.YEAR: "2021"}
+    )
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    cache: RenderCache = RenderCache(str(tmp_path), limit=10)
+    cache.put("aaold", b"x" * 6)
+    os.utime(tmp_path / "aa" / "old", (0, 0))
+    cache.put("bbnew", b"y" * 6)
+    assert cache.get("aaold") is None
+    assert cache.get("bbnew") == b"y" * 6
@@ -0,0 +1,78 @@
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict
+import pytest
+from pypans.project import Project, User
+from pypans.repository import Repository
+from pypans.stage import StagedTree
+from pypans.stages import ProjectSetup, StageResult, scaffold
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def _git(root: str, *arguments: str) -> str:
+    return subprocess.run(
+        ("git", "-C", root, *arguments),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        check=True,
+    ).stdout.decode()
+
+
+def test_repository_passes_fsck(tmp_path: Path) -> None:
+    root: str = str(tmp_path)
+    tree: StagedTree = StagedTree()
+    tree.add("README.md", "# bomber\n")
+    tree.add(os.path.join("bomber", "__init__.py"), "")
+    tree.add(os.path.join("bomber", "__main__.py"), "")
+    tree.add("bomber.py", "")
+    tree.add(os.path.join("run", "start.sh"), "#!/bin/sh\n", 0o755)
+    tree.commit(root)
+    commit: str = Repository(root).init(
+        tree, 'John "J" Udot', "j@u.com", "git@github.com:john/bomber.git"
+    )
+    _git(root, "fsck", "--strict", "--full", "--no-dangling")
+    assert _git(root, "rev-parse", "HEAD").strip() == commit
+    assert _git(root, "status", "--porcelain") == ""
+    assert _git(root, "config", "user.name").strip() == 'John "J" Udot'
+    assert _git(root, "remote", "get-url", "origin").strip() == (
+        "git@github.com:john/bomber.git"
+    )
+    assert _git(root, "ls-files", "-s", "run/start.sh").startswith("100755")
+
+
+def test_repository_is_not_reinitialized(tmp_path: Path) -> None:
+    (tmp_path / ".git").mkdir()
+    with pytest.raises(ValueError, match="already a `git` repository"):
+        Repository(str(tmp_path)).init(StagedTree(), "John", "j@u.com")
+
+
+def test_scaffold_commits_project(tmp_path: Path) -> None:
+    root: str = str(tmp_path / "bomber")
+    user: User = User("John Udot", "j@u.com")
+    results: Dict[str, StageResult] = scaffold(
+        Project("bomber", user, root),
+        root=root,
+        user=user,
+        setup=ProjectSetup(remote="git@github.com:john/bomber.git", git=True),
+    ).run()
+    assert all(result.passed for result in results.values()), results
+    _git(root, "fsck", "--strict", "--full")
+    assert _git(root, "status", "--porcelain") == ""
+    assert "Initial commit" in _git(root, "log", "--format=%s")
+
+
+def test_scaffold_initializes_git_without_remote(tmp_path: Path) -> None:
+    root: str = str(tmp_path / "bomber")
+    user: User = User("John Udot", "j@u.com")
+    results: Dict[str, StageResult] = scaffold(
+        Project("bomber", user, root),
+        root=root,
+        user=user,
+        setup=ProjectSetup(git=True),
+    ).run()
+    assert results["git"].passed, results
+    assert "Initial commit" in _git(root, "log", "--format=%s")
+    assert _git(root, "remote") == ""
@@ -0,0 +1,78 @@
+import asyncio
+import multiprocessing
+import py_compile
+import runpy
+from pathlib import Path
+from typing import Any, Dict, List
+from _pytest.monkeypatch import MonkeyPatch
+import pytest
+from pypans.project import Project, ProjectOptions, Service, User
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def _generate(root: str, service: Service) -> None:
+    project: Project = Project(
+        "bomber", User("John", "j@u.com"), root, ProjectOptions(service=service)
+    )
+    project.build_package()
+    project.build_meta()
+    project.build_service()
+    project.commit()
+
+
+@pytest.mark.parametrize("service", [Service.WSGI, Service.ASGI])
+def test_service_files_are_generated(tmp_path: Path, service: Service) -> None:
+    _generate(str(tmp_path), service)
+    py_compile.compile(str(tmp_path / "locustfile.py"), doraise=True)
+    assert (tmp_path / "Procfile").read_text() == (
+        "web: gunicorn --config gunicorn.conf.py bomber.app:app\n"
+    )
+    assert "gunicorn" in (tmp_path / "requirements.txt").read_text().split()
+    assert "locust" in ((tmp_path / "requirements-dev.txt").read_text().split())
+
+
+def test_gunicorn_config_scales_with_cores(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    _generate(str(tmp_path), Service.WSGI)
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    config: Dict[str, Any] = runpy.run_path(str(tmp_path / "gunicorn.conf.py"))
+    assert config["workers"] == multiprocessing.cpu_count() * 2 + 1
+    assert config["worker_class"] == "gthread"
+    monkeypatch.setenv("GUNICORN_WORKER_CLASS", "gevent")
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    config = runpy.run_path(str(tmp_path / "gunicorn.conf.py"))
+    assert (config["workers"], config["worker_class"]) == (3, "gevent")
+
+
+def test_wsgi_app_responds(tmp_path: Path) -> None:
+    _generate(str(tmp_path), Service.WSGI)
+    statuses: List[str] = []
+    app = runpy.run_path(str(tmp_path / "bomber" / "app.py"))["app"]
+    assert b"".join(app({}, lambda status, _: statuses.append(status))) == (
+        b"ok"
+    )
+    assert statuses == ["200 OK"]
+
+
+def test_asgi_app_responds(tmp_path: Path) -> None:
+    _generate(str(tmp_path), Service.ASGI)
+    app = runpy.run_path(str(tmp_path / "bomber" / "app.py"))["app"]
+    messages: List[Dict[str, Any]] = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "lifespan.shutdown"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        messages.append(message)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(app({"type": "lifespan"}, receive, send))
+        loop.run_until_complete(app({"type": "http"}, receive, send))
+    finally:
+        loop.close()
+    assert messages[0] == {"type": "lifespan.shutdown.complete"}
+    assert messages[-1] == {"type": "http.response.body", "body": b"ok"}
@@ -0,0 +1,111 @@
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, Tuple
+from _pytest.monkeypatch import MonkeyPatch
+import pytest
+from pypans.project import Project, ProjectOptions, User
+from pypans.source import GitCache, TemplateSource
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def _git(*arguments: str) -> str:
+    return subprocess.run(
+        (
+            "git",
+            "-c",
+            "user.name=John",
+            "-c",
+            "user.email=j@u.com",
+            *arguments,
+        ),
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout.decode()
+
+
+def _commit(work: str, files: Dict[str, str]) -> str:
+    for name, content in files.items():
+        with open(os.path.join(work, name), "w") as file:
+            file.write(content)
+    _git("-C", work, "add", "-A")
+    _git("-C", work, "commit", "--quiet", "-m", "templates")
+    _git("-C", work, "push", "--quiet", "origin", "HEAD:main")
+    return _git("-C", work, "rev-parse", "HEAD").strip()
+
+
+@pytest.fixture()
+def remote(tmp_path: Path) -> Tuple[str, str]:
+    bare: str = str(tmp_path / "templates.git")
+    work: str = str(tmp_path / "work")
+    _git("init", "--quiet", "--bare", bare)
+    _git("clone", "--quiet", bare, work)
+    return bare, work
+
+
+def test_snapshot_skips_fetch_of_known_commit(
+    tmp_path: Path, remote: Tuple[str, str]
+) -> None:
+    bare, work = remote
+    commit: str = _commit(work, {"README.md": "# <package>\n"})
+    cache: GitCache = GitCache(str(tmp_path / "cache"))
+    files = cache.snapshot(bare, "main")
+    assert cache.read(*files["README.md"]) == b"# <package>\n"
+    shutil.rmtree(tmp_path / "cache" / "mirrors")
+    shutil.rmtree(bare)
+    assert cache.snapshot(bare, commit) == files
+
+
+def test_revisions_share_unchanged_files(
+    tmp_path: Path, remote: Tuple[str, str]
+) -> None:
+    bare, work = remote
+    _commit(work, {"README.md": "# <package>\n", "LICENSE.md": "MIT\n"})
+    cache: GitCache = GitCache(str(tmp_path / "cache"))
+    first = cache.snapshot(bare, "main")
+    _commit(work, {"README.md": "# <package> v2\n"})
+    second = cache.snapshot(bare, "main")
+    assert first["LICENSE.md"] == second["LICENSE.md"]
+    assert first["README.md"] != second["README.md"]
+    assert len(os.listdir(tmp_path / "cache" / "blobs")) == 3
+
+
+def test_missing_blob_is_reported(tmp_path: Path) -> None:
+    mirror: str = str(tmp_path / "mirror.git")
+    _git("init", "--quiet", "--bare", mirror)
+    cache: GitCache = GitCache(str(tmp_path / "cache"))
+    with pytest.raises(ValueError, match=f"'{'0' * 40}' blob is missing"):
+        cache._store(mirror, {("0" * 40, 0o644)})
+
+
+def test_project_is_rendered_from_source(
+    tmp_path: Path, remote: Tuple[str, str], monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setenv("PYPAN_CACHE_DIR", str(tmp_path / "cache"))
+    bare, work = remote
+    _commit(work, {"README.md": "# <package> by <username>\n"})
+    project: Project = Project(
+        "bomber",
+        User("John", "j@u.com"),
+        str(tmp_path / "bomber"),
+        ProjectOptions(source=TemplateSource.parse(f"{bare}@main")),
+    )
+    project.build_meta()
+    project.commit()
+    assert (tmp_path / "bomber" / "README.md").read_text() == (
+        "# bomber by John\n"
+    )
+    assert (tmp_path / "bomber" / "LICENSE.md").exists()
+    assert project.manifest().source == f"{bare}@main"
+
+
+def test_parse_source(tmp_path: Path) -> None:
+    assert TemplateSource.parse(str(tmp_path)) == TemplateSource(str(tmp_path))
+    assert TemplateSource.parse("git@github.com:t/t.git@v1") == (
+        TemplateSource("git@github.com:t/t.git", "v1")
+    )
+    with pytest.raises(ValueError, match="neither a directory"):
+        TemplateSource.parse("git@github.com:t/t.git")
@@ -0,0 +1,76 @@
+import os
+from pathlib import Path
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from pypans import stage
+from pypans.stage import StagedTree
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def test_commit_new_root(tmp_path: Path) -> None:
+    tree: StagedTree = StagedTree()
+    tree.add("bomber/__init__.py", '"""Bomber."""')
+    tree.add("analyse-source-code.sh", b"#!/usr/bin/env bash", mode=0o755)
+    tree.commit(str(tmp_path / "bomber"))
+    assert (tmp_path / "bomber" / "bomber" / "__init__.py").read_text() == (
+        '"""Bomber."""'
+    )
+    assert os.access(tmp_path / "bomber" / "analyse-source-code.sh", os.X_OK)
+    assert os.listdir(tmp_path) == ["bomber"]
+
+
+def test_commit_is_idempotent(tmp_path: Path) -> None:
+    (tmp_path / "notes.txt").write_text("keep me")
+    tree: StagedTree = StagedTree()
+    tree.add("README.md", "# bomber")
+    tree.commit(str(tmp_path))
+    tree.commit(str(tmp_path))
+    assert (tmp_path / "README.md").read_text() == "# bomber"
+    assert sorted(os.listdir(tmp_path)) == ["README.md", "notes.txt"]
+
+
+def test_commit_stages_inside_root(tmp_path: Path) -> None:
+    root = tmp_path / "bomber"
+    root.mkdir()
+    tree: StagedTree = StagedTree()
+    tree.add("bomber/__init__.py", "")
+    tmp_path.chmod(0o555)
+    try:
+        tree.commit(str(root))
+    finally:
+        tmp_path.chmod(0o755)
+    assert os.listdir(tmp_path) == ["bomber"]
+    assert os.listdir(root) == ["bomber"]
+    assert (root / "bomber" / "__init__.py").is_file()
+
+
+def test_failed_commit_publishes_no_new_root(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    def fail(*_: object) -> None:
+        raise OSError("disk is full")
+
+    tree: StagedTree = StagedTree()
+    tree.add("README.md", "# bomber")
+    tree.add("setup.py", "")
+    monkeypatch.setattr(stage, "_publish", fail)
+    with pytest.raises(OSError, match="disk is full"):
+        tree.commit(str(tmp_path / "bomber"))
+    assert not os.listdir(tmp_path)
+
+
+def test_commit_retries_short_writes(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    write = os.write
+    monkeypatch.setattr(
+        os, "write", lambda descriptor, data: write(descriptor, data[:3])
+    )
+    tree: StagedTree = StagedTree()
+    tree.add("README.md", "# bomber is a project")
+    tree.commit(str(tmp_path / "bomber"))
+    assert (tmp_path / "bomber" / "README.md").read_text() == (
+        "# bomber is a project"
+    )
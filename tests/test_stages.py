@@ -0,0 +1,29 @@
+import sys
+from typing import Dict, List
+from pypans.stages import StageResult, StageScheduler
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def test_run_stages() -> None:
+    order: List[str] = []
+    scheduler: StageScheduler = StageScheduler()
+    scheduler.command("echo", (sys.executable, "-c", "print('done')"))
+    scheduler.action("render", lambda: order.append("render"))
+    scheduler.action(
+        "after", lambda: order.append("after"), depends=("echo", "render")
+    )
+    results: Dict[str, StageResult] = scheduler.run()
+    assert results["echo"].output.strip() == "done"
+    assert all(result.passed for result in results.values())
+    assert order == ["render", "after"]
+
+
+def test_skip_stages_after_failure() -> None:
+    scheduler: StageScheduler = StageScheduler()
+    scheduler.command("fail", (sys.executable, "-c", "exit(3)"))
+    scheduler.command("next", (sys.executable, "-V"), depends=("fail",))
+    results: Dict[str, StageResult] = scheduler.run()
+    assert results["fail"].returncode == 3
+    assert results["next"].returncode == -1
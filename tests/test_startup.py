@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+from typing import Dict, List
+import pypans
+from tests.markers import unit
+
+pytestmark = unit
+
+_BUDGET_US: int = 50000
+_ROOT: str = os.path.dirname(os.path.dirname(pypans.__file__))
+
+
+def _import_times(*arguments: str) -> Dict[str, int]:
+    process: subprocess.CompletedProcess = subprocess.run(
+        (sys.executable, "-X", "importtime", *arguments),
+        cwd=_ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times: Dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            own, _, name = line.split(":", 1)[1].split("|")
+            if own.strip().isdigit():
+                times[name.strip()] = int(own)
+    return times
+
+
+def test_version_startup_is_within_budget() -> None:
+    baseline: Dict[str, int] = _import_times("-c", "pass")
+    times: Dict[str, int] = _import_times(
+        "-c", "from pypans.__main__ import main; main()", "--version"
+    )
+    extra: List[str] = [name for name in times if name not in baseline]
+    assert not {"click", "termcolor", "typing", "pypans.cli"} & set(extra)
+    assert sum(times[name] for name in extra) < _BUDGET_US, extra
@@ -0,0 +1,42 @@
+import io
+from pathlib import Path
+from typing import Dict, List
+from pypans.stage import StagedTree
+from pypans.stream import StreamedFile, substitute
+from tests.markers import unit
+
+pytestmark = unit
+
+_REPLACEMENTS: Dict[bytes, bytes] = {
+    b"<package>": b"bomber",
+    b"<year>": b"2020",
+}
+
+
+def test_placeholders_split_across_chunks() -> None:
+    content: bytes = b"<package> (c) <year> <package><year><pack <year"
+    expected: bytes = b"bomber (c) 2020 bomber2020<pack <year"
+    for chunk in range(1, len(content) + 2):
+        parts: List[bytes] = list(
+            substitute(io.BytesIO(content), _REPLACEMENTS, chunk)
+        )
+        assert b"".join(parts) == expected
+
+
+def test_streamed_file_is_written(tmp_path: Path) -> None:
+    source = tmp_path / "seed.txt"
+    source.write_bytes(b"name=<package>\n" * 10000)
+    tree: StagedTree = StagedTree()
+    tree.add("seed.txt", StreamedFile(str(source), _REPLACEMENTS))
+    tree.commit(str(tmp_path / "out"))
+    assert (tmp_path / "out" / "seed.txt").read_bytes() == (
+        b"name=bomber\n" * 10000
+    )
+
+
+def test_binary_file_is_passed_through(tmp_path: Path) -> None:
+    source = tmp_path / "icon.png"
+    source.write_bytes(b"\x89PNG\0<package>")
+    assert b"".join(StreamedFile(str(source), _REPLACEMENTS).chunks()) == (
+        b"\x89PNG\0<package>"
+    )
@@ -0,0 +1,51 @@
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+import pytest
+from pypans import trace
+from pypans.project import Project, User
+from pypans.stages import StageScheduler
+from tests.markers import unit
+
+pytestmark = unit
+
+
+@pytest.fixture()
+def tracer() -> Iterator[trace.Tracer]:
+    yield trace.enable()
+    trace.disable()
+
+
+def test_disabled_span_records_nothing() -> None:
+    with trace.span("build_meta") as span:
+        span["files"] = 1
+    assert not trace.enabled()
+
+
+def test_project_spans(tracer: trace.Tracer, tmp_path: Path) -> None:
+    project: Project = Project("bomber", User("John", "j@u.com"), str(tmp_path))
+    project.build_package()
+    project.build_meta()
+    project.commit()
+    events: Dict[str, Any] = {event["name"]: event for event in tracer.events()}
+    assert events["build_package"]["args"] == {"files": 2}
+    assert events["commit"]["args"]["bytes"] > 0
+    assert events["setup.py"]["cat"] == "render"
+    assert events["commit"]["ph"] == "X"
+
+
+def test_scheduler_spans(tracer: trace.Tracer, tmp_path: Path) -> None:
+    scheduler: StageScheduler = StageScheduler(cwd=str(tmp_path))
+    scheduler.action("project", lambda: None)
+    scheduler.command("venv", (sys.executable, "-c", "print('done')"))
+    scheduler.run()
+    tracer.export(str(tmp_path / "trace.json"))
+    events: List[Dict[str, Any]] = json.loads(
+        (tmp_path / "trace.json").read_text()
+    )["traceEvents"]
+    assert {
+        (event["name"], event["cat"]) for event in events if "cat" in event
+    } == {("project", "action"), ("venv", "command")}
+    assert any(event["args"] == {"name": "venv"} for event in events)
+    assert "command:venv" in "\n".join(tracer.summary())
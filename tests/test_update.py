@@ -0,0 +1,57 @@
+import json
+import os
+from pathlib import Path
+from pypans.manifest import MANIFEST, Manifest, sha256
+from pypans.project import Project, User
+from pypans.update import update
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def _generate(root: str) -> None:
+    project: Project = Project("bomber", User("John Udot", "j@u.com"), root)
+    project.build_package()
+    project.build_tests()
+    project.build_meta()
+    project.commit()
+
+
+def test_manifest_records_generated_files(tmp_path: Path) -> None:
+    _generate(str(tmp_path))
+    manifest: Manifest = Manifest.read(str(tmp_path))
+    assert manifest.variables["<package>"] == "bomber"
+    assert manifest.files["setup.py"].template
+    assert not manifest.files[os.path.join("bomber", "__init__.py")].template
+    assert MANIFEST not in manifest.files
+
+
+def test_update_current_project_writes_nothing(tmp_path: Path) -> None:
+    _generate(str(tmp_path))
+    mtime: int = os.stat(tmp_path / "setup.py").st_mtime_ns
+    assert not update(str(tmp_path))
+    assert os.stat(tmp_path / "setup.py").st_mtime_ns == mtime
+
+
+def test_update_rewrites_only_stale_files(tmp_path: Path) -> None:
+    _generate(str(tmp_path))
+    path = tmp_path / MANIFEST
+    data = json.loads(path.read_text())
+    data["version"] = "0.0.0"
+    for name in ("setup.py", "README.md", ".pylintrc"):
+        data["files"][name] = {"template": "old", "output": "old"}
+    data["files"]["setup.py"]["output"] = sha256(b"old")
+    (tmp_path / "setup.py").write_text("old")
+    (tmp_path / "README.md").write_text("# my own readme")
+    del data["files"]["Procfile"]
+    os.remove(tmp_path / "Procfile")
+    path.write_text(json.dumps(data))
+    mtime: int = os.stat(tmp_path / "pytest.ini").st_mtime_ns
+    report = update(str(tmp_path))
+    assert report.updated == ("setup.py",)
+    assert report.added == ("Procfile",)
+    assert report.modified == ("README.md",)
+    assert "<package>" not in (tmp_path / "setup.py").read_text()
+    assert (tmp_path / "README.md").read_text() == "# my own readme"
+    assert os.stat(tmp_path / "pytest.ini").st_mtime_ns == mtime
+    assert (tmp_path / "Procfile").exists()
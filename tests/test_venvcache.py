@@ -0,0 +1,98 @@
+import os
+import shutil
+from pathlib import Path
+from typing import List, Mapping, Optional
+from _pytest.monkeypatch import MonkeyPatch
+from pypans.cache import evict
+from pypans.venvcache import VenvCache, _clone
+from pypans.wheelhouse import Wheelhouse
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def test_clone_venv(tmp_path: Path) -> None:
+    origin = tmp_path / "origin"
+    site = origin / "lib" / "python3.8" / "site-packages"
+    site.mkdir(parents=True)
+    (origin / "bin").mkdir()
+    (origin / "bin" / "pip").write_text(f"#!{origin}/bin/python\n")
+    (origin / "pyvenv.cfg").write_text(f"command = python -m venv {origin}\n")
+    (site / "module.py").write_text("value = 1\n")
+    (site / "__pycache__").mkdir()
+    (site / "__pycache__" / "module.cpython-38.pyc").write_bytes(b"")
+    os.symlink("lib", origin / "lib64")
+    _clone(str(origin), str(origin), str(tmp_path / "venv"))
+    venv = tmp_path / "venv"
+    assert (venv / "bin" / "pip").read_text() == f"#!{venv}/bin/python\n"
+    assert str(venv) in (venv / "pyvenv.cfg").read_text()
+    assert os.path.samefile(
+        site / "module.py",
+        venv / "lib" / "python3.8" / "site-packages" / "module.py",
+    )
+    assert not (
+        venv / "lib" / "python3.8" / "site-packages" / "__pycache__"
+    ).exists()
+    assert os.readlink(venv / "lib64") == "lib"
+
+
+def test_evict_least_recently_used() -> None:
+    removed: List[str] = []
+    evicted: int = evict(
+        {"old": 5, "busy": 5, "new": 5},
+        limit=6,
+        remove=lambda key: key != "busy" and not removed.append(key),
+    )
+    assert evicted == 2
+    assert removed == ["old", "new"]
+
+
+def test_evicted_venv_is_rebuilt_on_clone(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    built: List[str] = []
+
+    monkeypatch.setattr(VenvCache, "_create", _fake_create(built))
+    (tmp_path / "venvs").mkdir()
+    cache: VenvCache = VenvCache(str(tmp_path / "venvs"))
+    cache.clone(str(tmp_path / "bomber"))
+    shutil.rmtree(built[0])
+    cache.clone(str(tmp_path / "tank"))
+    assert len(built) == 2
+    assert (tmp_path / "tank" / "bin").is_dir()
+
+
+def test_venv_is_keyed_on_requirement_files(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    built: List[str] = []
+    monkeypatch.setattr(VenvCache, "_create", _fake_create(built))
+    (tmp_path / "venvs").mkdir()
+    cache: VenvCache = VenvCache(str(tmp_path / "venvs"))
+    plain = {"requirements.txt": b"requests\n"}
+    service = {"requirements.txt": b"requests\nfastapi\n"}
+    cache.clone(str(tmp_path / "plain"), requirements=plain)
+    cache.clone(str(tmp_path / "service"), requirements=service)
+    cache.clone(str(tmp_path / "again"), requirements=service)
+    assert VenvCache.key(plain) != VenvCache.key(service)
+    assert [os.path.basename(entry) for entry in built] == [
+        VenvCache.key(plain),
+        VenvCache.key(service),
+    ]
+
+
+def _fake_create(built: List[str]) -> object:
+    """Returns `VenvCache._create` stub making an empty environment."""
+
+    def create(
+        _: VenvCache,
+        entry: str,
+        __: Mapping[str, bytes],
+        ___: Optional[Wheelhouse],
+    ) -> None:
+        os.makedirs(os.path.join(entry, "bin"))
+        with open(os.path.join(entry, ".pypan-origin"), "w") as origin:
+            origin.write(entry)
+        built.append(entry)
+
+    return create
@@ -0,0 +1,49 @@
+from pathlib import Path
+from pypans.wheelhouse import (
+    Wheelhouse,
+    WheelhouseReport,
+    project_requirements,
+    requirement_names,
+    template_requirements,
+)
+from tests.markers import unit
+
+pytestmark = unit
+
+
+def test_requirement_names() -> None:
+    assert requirement_names(
+        ["pytest==5.3.5", "# comment", "-r base.txt", "Flake8_Builtins>=1.5"]
+    ) == ["pytest", "flake8-builtins"]
+
+
+def test_template_requirements() -> None:
+    requirements = template_requirements()
+    assert "termcolor" not in requirements
+    assert {"pytest", "setuptools"} <= set(requirements)
+
+
+def test_project_requirements(tmp_path: Path) -> None:
+    (tmp_path / "bomber").mkdir()
+    (tmp_path / "bomber" / "requirements.txt").write_text("fastapi==0.61\n")
+    (tmp_path / "bomber" / "requirements-dev.txt").write_text("pytest\n")
+    (tmp_path / "tank").mkdir()
+    (tmp_path / "tank" / "requirements.txt").write_text("FastAPI\nlocust\n")
+    assert project_requirements(
+        str(tmp_path / "bomber"), str(tmp_path / "tank"), str(tmp_path)
+    ) == ["fastapi", "pytest", "locust"]
+
+
+def test_wheelhouse_report(tmp_path: Path) -> None:
+    (tmp_path / "pytest-5.3.5-py3-none-any.whl").write_bytes(b"")
+    (tmp_path / "flake8_builtins-1.5.2-py2.py3-none-any.whl").write_bytes(b"")
+    report: WheelhouseReport = Wheelhouse(str(tmp_path)).report(
+        ["pytest", "flake8-builtins", "mypy"]
+    )
+    assert report.hits == ("pytest", "flake8-builtins")
+    assert report.misses == ("mypy",)
+    assert Wheelhouse(str(tmp_path)).options() == (
+        "--no-index",
+        "--find-links",
+        str(tmp_path),
+    )